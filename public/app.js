@@ -6,6 +6,7 @@ const state = {
   visibleUnits: [],
   auto: true,
   timer: null,
+  stream: null,
   ui: {
     filter: "",
     show: "all",
@@ -767,6 +768,30 @@ function makeActionBtn(label, klass, onClick) {
   return b;
 }
 
+function resultError(result) {
+  const code = result.exitCode;
+  const stderr = String(result.stderr || "").trim();
+  const stdout = String(result.stdout || "").trim();
+  const msg = stderr || stdout || `exit ${code}`;
+  return new Error(`exit ${code}: ${msg}`);
+}
+
+// Unit actions run as background jobs (202 + jobId); wait for the job so callers see its outcome.
+async function waitForJob(jobId) {
+  for (;;) {
+    await new Promise((resolve) => setTimeout(resolve, 500));
+    const r = await fetch(`/api/jobs/${encodeURIComponent(jobId)}`, { cache: "no-store" });
+    const job = await r.json().catch(() => null);
+    if (!r.ok || !job) throw new Error((job && job.error) || `HTTP ${r.status}`);
+    if (job.state === "succeeded") return job;
+    if (job.state === "failed") {
+      if (job.error) throw new Error(job.error);
+      if (job.result) throw resultError(job.result);
+      throw new Error("action failed");
+    }
+  }
+}
+
 async function apiPost(path) {
   const r = await fetch(path, { method: "POST" });
   const text = await r.text();
@@ -774,15 +799,10 @@ async function apiPost(path) {
   try { payload = JSON.parse(text); } catch { /* ignore */ }
   if (!r.ok) {
     if (payload && payload.error) throw new Error(payload.error);
-    if (payload && payload.result) {
-      const code = payload.result.exitCode;
-      const stderr = String(payload.result.stderr || "").trim();
-      const stdout = String(payload.result.stdout || "").trim();
-      const msg = stderr || stdout || `exit ${code}`;
-      throw new Error(`exit ${code}: ${msg}`);
-    }
+    if (payload && payload.result) throw resultError(payload.result);
     throw new Error(text || `HTTP ${r.status}`);
   }
+  if (r.status === 202 && payload && payload.jobId) return waitForJob(payload.jobId);
   return payload || {};
 }
 
@@ -1310,7 +1330,7 @@ async function loadUnitDetails(unit) {
   renderUnitDetailsActions();
 
   try {
-    const r = await fetch(`/api/units/${encodeURIComponent(u)}/details`, { cache: "no-store" });
+    const r = await fetch(`/api/units/${encodeURIComponent(u)}/details`, { cache: "no-cache" });
     const payload = await r.json();
     if (!r.ok) throw new Error(payload.error || `HTTP ${r.status}`);
     if (state.details.unitDetailsUnit !== u) return;
@@ -1887,30 +1907,71 @@ function renderHeader(data) {
   $("tzLabel").textContent = `${t("timezone_prefix")}${data.timezone || "-"}`;
 }
 
+function applyData(data) {
+  state.data = data;
+
+  renderHeader(data);
+
+  renderSummary(data);
+  renderBotsTable(data);
+
+  if (state.selectedUnit) {
+    const still = (data.bots || []).find(b => b.unit === state.selectedUnit);
+    if (still) renderDetails(still);
+    else closeDetails({ updateUrl: true });
+  }
+  syncDetailsFromUrl();
+}
+
 async function refresh() {
   setError("");
   try {
-    const r = await fetch("/api/bots", { cache: "no-store" });
+    const gen = state.data && state.data.generation;
+    const r = await fetch(gen ? `/api/bots?since=${gen}` : "/api/bots", { cache: "no-cache" });
     if (!r.ok) throw new Error(`HTTP ${r.status}`);
-    const data = await r.json();
-    state.data = data;
-
-    renderHeader(data);
-
-    renderSummary(data);
-    renderBotsTable(data);
-
-    if (state.selectedUnit) {
-      const still = (data.bots || []).find(b => b.unit === state.selectedUnit);
-      if (still) renderDetails(still);
-      else closeDetails({ updateUrl: true });
+    const data = mergeBotsResponse(state.data, await r.json());
+    if (data) applyData(data);
+    else if (gen) {
+      state.data = null;
+      return refresh();
     }
-    syncDetailsFromUrl();
   } catch (e) {
     setError(t("load_api_failed", { error: String(e && (e.message || e) || "") }));
   }
 }
 
+// Live updates: the server pushes a snapshot on connect, then a patch after every background rebuild.
+// Falls back to polling when EventSource isn't available.
+function stopStream() {
+  if (state.stream) state.stream.close();
+  state.stream = null;
+}
+
+function startStream() {
+  stopStream();
+  if (typeof EventSource === "undefined") return false;
+  const es = new EventSource("/api/stream");
+  es.addEventListener("bots", (ev) => {
+    try {
+      setError("");
+      applyData(JSON.parse(ev.data));
+    } catch (e) {
+      setError(t("load_api_failed", { error: String(e && (e.message || e) || "") }));
+    }
+  });
+  es.addEventListener("patch", (ev) => {
+    try {
+      const data = mergeBotsResponse(state.data, JSON.parse(ev.data));
+      if (data) applyData(data);
+      else refresh();
+    } catch (e) {
+      setError(t("load_api_failed", { error: String(e && (e.message || e) || "") }));
+    }
+  });
+  state.stream = es;
+  return true;
+}
+
 function setAuto(on) {
   state.auto = on;
   $("autoBtn").textContent = on ? t("auto_on") : t("auto_off");
@@ -1918,7 +1979,8 @@ function setAuto(on) {
   lsSet("auto", on ? "1" : "0");
   if (state.timer) clearInterval(state.timer);
   state.timer = null;
-  if (on) state.timer = setInterval(refresh, 30000);
+  stopStream();
+  if (on && !startStream()) state.timer = setInterval(refresh, 30000);
 }
 
 window.addEventListener("DOMContentLoaded", () => {
@@ -0,0 +1,40 @@
+// Shared by app.js, vision.js and vision2.js: merging /api/bots?since= (or SSE "patch")
+// deltas into the payload a page already has.
+
+// Bots missing from patch.bots are unchanged, and sections missing from a bot's change are
+// unchanged too. The server doesn't count uptime drift as a change, so every bot whose systemd
+// section wasn't resent gets its uptime carried forward to patch.generatedAt.
+function applyBotsPatch(base, patch) {
+  const prev = new Map(((base && base.bots) || []).map(b => [b.unit, b]));
+  const changes = patch.bots || {};
+  const elapsed = (Date.parse(patch.generatedAt) - Date.parse(base.generatedAt)) / 1000;
+  const bots = [];
+  for (const unit of patch.order || []) {
+    const change = changes[unit];
+    const old = prev.get(unit);
+    if (change === null || (change === undefined && !old)) continue;
+    const bot = Object.assign({}, old || {}, change || {});
+    const sd = bot.systemd;
+    if (old && !(change && "systemd" in change) && sd && sd.activeState === "active" && sd.uptimeSeconds > 0 && elapsed > 0) {
+      bot.systemd = Object.assign({}, sd, { uptimeSeconds: sd.uptimeSeconds + elapsed });
+    }
+    bots.push(bot);
+  }
+  return Object.assign({}, base, {
+    title: patch.title,
+    timezone: patch.timezone,
+    generatedAt: patch.generatedAt,
+    generation: patch.generation,
+    totals: patch.totals,
+    bots,
+  });
+}
+
+// Returns the payload to render given the current one, or null when the response is stale or
+// can't be applied (the caller should then fetch the full payload).
+function mergeBotsResponse(cur, data) {
+  if (!data || !data.patch) return data;
+  if (!cur || !cur.generation || data.since > cur.generation) return null;
+  if (data.generation <= cur.generation) return cur;
+  return applyBotsPatch(cur, data);
+}
@@ -9,6 +9,7 @@ const state = {
   visibleUnits: [],
   auto: true,
   timer: null,
+  stream: null,
   ui: {
     filter: "",
     show: "all",
@@ -731,6 +732,21 @@ function renderBots(data) {
 }
 
 // API helpers
+// Unit actions run as background jobs (202 + jobId); wait for the job so callers see its outcome.
+async function waitForJob(jobId) {
+  for (;;) {
+    await new Promise((resolve) => setTimeout(resolve, 500));
+    const r = await fetch(`/api/jobs/${encodeURIComponent(jobId)}`, { cache: "no-store" });
+    const job = await r.json().catch(() => null);
+    if (!r.ok || !job) throw new Error((job && job.error) || `HTTP ${r.status}`);
+    if (job.state === "succeeded") return job;
+    if (job.state === "failed") {
+      const res = job.result || {};
+      throw new Error(job.error || String(res.stderr || res.stdout || "").trim() || `exit ${res.exitCode}`);
+    }
+  }
+}
+
 async function apiPost(path) {
   const r = await fetch(path, { method: "POST" });
   const text = await r.text();
@@ -740,6 +756,7 @@ async function apiPost(path) {
     if (payload && payload.error) throw new Error(payload.error);
     throw new Error(text || `HTTP ${r.status}`);
   }
+  if (r.status === 202 && payload && payload.jobId) return waitForJob(payload.jobId);
   return payload || {};
 }
 
@@ -1242,7 +1259,7 @@ async function loadUnitDetails(unit) {
   renderUnitDetailsBox();
   
   try {
-    const r = await fetch(`/api/units/${encodeURIComponent(unit)}/details`, { cache: "no-store" });
+    const r = await fetch(`/api/units/${encodeURIComponent(unit)}/details`, { cache: "no-cache" });
     const payload = await r.json();
     if (!r.ok) throw new Error(payload.error || `HTTP ${r.status}`);
     if (state.details.unitDetailsUnit === unit) {
@@ -1385,26 +1402,36 @@ function escapeRegExp(s) {
 }
 
 // Main
+function applyData(data) {
+  state.data = data;
+  
+  renderHeader(state.data);
+  renderSummary(state.data);
+  renderBots(state.data);
+  
+  if (state.selectedUnit) {
+    const bot = state.data.bots.find(b => b.unit === state.selectedUnit);
+    if (bot) renderDetails(bot);
+    else closeDetails({ updateUrl: true });
+  }
+  syncDetailsFromUrl();
+}
+
 async function refresh() {
   const statusEl = $("connectionStatus");
   statusEl.classList.add("connecting");
   statusEl.querySelector(".status-text").textContent = "Connecting...";
   
   try {
-    const r = await fetch("/api/bots", { cache: "no-store" });
+    const gen = state.data && state.data.generation;
+    const r = await fetch(gen ? `/api/bots?since=${gen}` : "/api/bots", { cache: "no-cache" });
     if (!r.ok) throw new Error(`HTTP ${r.status}`);
-    state.data = await r.json();
-    
-    renderHeader(state.data);
-    renderSummary(state.data);
-    renderBots(state.data);
-    
-    if (state.selectedUnit) {
-      const bot = state.data.bots.find(b => b.unit === state.selectedUnit);
-      if (bot) renderDetails(bot);
-      else closeDetails({ updateUrl: true });
+    const data = mergeBotsResponse(state.data, await r.json());
+    if (!data) {
+      state.data = null;
+      return refresh();
     }
-    syncDetailsFromUrl();
+    applyData(data);
     
     statusEl.classList.remove("connecting");
     statusEl.querySelector(".status-text").textContent = "Live";
@@ -1423,7 +1450,47 @@ function setAuto(on) {
   btn.classList.toggle("btn-toggle", on);
   lsSet("auto", on ? "1" : "0");
   if (state.timer) clearInterval(state.timer);
-  state.timer = on ? setInterval(refresh, 30000) : null;
+  state.timer = null;
+  stopStream();
+  if (on && !startStream()) state.timer = setInterval(refresh, 30000);
+}
+
+// Live updates via Server-Sent Events (polling fallback in setAuto)
+function stopStream() {
+  if (state.stream) state.stream.close();
+  state.stream = null;
+}
+
+function startStream() {
+  stopStream();
+  if (typeof EventSource === "undefined") return false;
+  const statusEl = $("connectionStatus");
+  const es = new EventSource("/api/stream");
+  es.addEventListener("bots", (ev) => {
+    try {
+      applyData(JSON.parse(ev.data));
+      statusEl.classList.remove("connecting");
+      statusEl.querySelector(".status-text").textContent = "Live";
+    } catch (e) {
+      showToast(t("load_api_failed", { error: String(e.message || e) }), "error");
+    }
+  });
+  es.addEventListener("patch", (ev) => {
+    try {
+      const data = mergeBotsResponse(state.data, JSON.parse(ev.data));
+      if (data) applyData(data);
+      else refresh();
+    } catch (e) {
+      showToast(t("load_api_failed", { error: String(e.message || e) }), "error");
+    }
+  });
+  es.onerror = () => {
+    // EventSource reconnects on its own; just reflect the state.
+    statusEl.classList.add("connecting");
+    statusEl.querySelector(".status-text").textContent = "Connecting...";
+  };
+  state.stream = es;
+  return true;
 }
 
 // Init
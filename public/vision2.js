@@ -27,6 +27,7 @@ const state = {
   visibleUnits: [],
   auto: true,
   autoTimer: null,
+  stream: null,
   refreshController: null,
   refreshing: false,
   renderScheduled: false,
@@ -869,6 +870,21 @@ function renderBots(data) {
 }
 
 // API helpers
+// Unit actions run as background jobs (202 + jobId); wait for the job so callers see its outcome.
+async function waitForJob(jobId) {
+  for (;;) {
+    await new Promise((resolve) => setTimeout(resolve, 500));
+    const r = await fetch(`/api/jobs/${encodeURIComponent(jobId)}`, { cache: "no-store" });
+    const job = await r.json().catch(() => null);
+    if (!r.ok || !job) throw new Error((job && job.error) || `HTTP ${r.status}`);
+    if (job.state === "succeeded") return job;
+    if (job.state === "failed") {
+      const res = job.result || {};
+      throw new Error(job.error || String(res.stderr || res.stdout || "").trim() || `exit ${res.exitCode}`);
+    }
+  }
+}
+
 async function apiPost(path) {
   const r = await fetch(path, { method: "POST" });
   const text = await r.text();
@@ -878,6 +894,7 @@ async function apiPost(path) {
     if (payload && payload.error) throw new Error(payload.error);
     throw new Error(text || `HTTP ${r.status}`);
   }
+  if (r.status === 202 && payload && payload.jobId) return waitForJob(payload.jobId);
   return payload || {};
 }
 
@@ -1561,7 +1578,7 @@ async function loadUnitDetails(unit) {
   renderUnitDetailsBox();
 
   try {
-    const r = await fetch(`/api/units/${encodeURIComponent(unit)}/details`, { cache: "no-store" });
+    const r = await fetch(`/api/units/${encodeURIComponent(unit)}/details`, { cache: "no-cache" });
     const payload = await r.json();
     if (!r.ok) throw new Error(payload.error || `HTTP ${r.status}`);
     if (state.details.unitDetails.unit === unit) {
@@ -1703,6 +1720,21 @@ async function loadLogsForSelected() {
 }
 
 // Main
+function applyData(data) {
+  state.data = data;
+
+  renderHeader(state.data);
+  renderSummary(state.data);
+  renderBots(state.data);
+
+  if (state.selectedUnit) {
+    const bot = findBot(state.selectedUnit);
+    if (bot) renderDetails(bot, { unitChanged: false });
+    else closeDetails({ updateUrl: true });
+  }
+  syncDetailsFromUrl();
+}
+
 async function refresh() {
   if (state.refreshController) {
     try { state.refreshController.abort(); } catch { /* ignore */ }
@@ -1714,20 +1746,15 @@ async function refresh() {
   state.refreshing = true;
 
   try {
-    const r = await fetch("/api/bots", { cache: "no-store", signal: controller.signal });
+    const gen = state.data && state.data.generation;
+    const r = await fetch(gen ? `/api/bots?since=${gen}` : "/api/bots", { cache: "no-cache", signal: controller.signal });
     if (!r.ok) throw new Error(`HTTP ${r.status}`);
-    state.data = await r.json();
-
-    renderHeader(state.data);
-    renderSummary(state.data);
-    renderBots(state.data);
-
-    if (state.selectedUnit) {
-      const bot = findBot(state.selectedUnit);
-      if (bot) renderDetails(bot, { unitChanged: false });
-      else closeDetails({ updateUrl: true });
+    const data = mergeBotsResponse(state.data, await r.json());
+    if (!data) {
+      state.data = null;
+      return refresh();
     }
-    syncDetailsFromUrl();
+    applyData(data);
 
     setConnectionStatus("live");
   } catch (e) {
@@ -1768,7 +1795,48 @@ function setAuto(on) {
   }
   lsSet("auto", state.auto ? "1" : "0");
   stopAuto();
-  if (state.auto) state.autoTimer = setTimeout(autoTick, 30000);
+  stopStream();
+  if (state.auto && !startStream()) state.autoTimer = setTimeout(autoTick, 30000);
+}
+
+// Live updates via Server-Sent Events; autoTick polling is the fallback.
+function stopStream() {
+  if (state.stream) state.stream.close();
+  state.stream = null;
+}
+
+function startStream() {
+  stopStream();
+  if (typeof EventSource === "undefined") return false;
+  const es = new EventSource("/api/stream");
+  es.addEventListener("bots", (ev) => {
+    if (state.refreshController) {
+      try { state.refreshController.abort(); } catch { /* ignore */ }
+    }
+    try {
+      applyData(JSON.parse(ev.data));
+      setConnectionStatus("live");
+    } catch (e) {
+      setConnectionStatus("error");
+      showToast(t("load_api_failed", { error: String(e.message || e) }), "error");
+    }
+  });
+  es.addEventListener("patch", (ev) => {
+    try {
+      const data = mergeBotsResponse(state.data, JSON.parse(ev.data));
+      if (data) applyData(data);
+      else refresh();
+    } catch (e) {
+      setConnectionStatus("error");
+      showToast(t("load_api_failed", { error: String(e.message || e) }), "error");
+    }
+  });
+  es.onerror = () => {
+    // EventSource reconnects on its own.
+    setConnectionStatus("connecting");
+  };
+  state.stream = es;
+  return true;
 }
 
 // Init
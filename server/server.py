@@ -2,22 +2,57 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import ctypes
+import ctypes.util
 import datetime as _dt
+import email.utils
+import gzip
+import hashlib
+import http.client
+import io
 import json
+import mmap
+import multiprocessing
 import os
 import pwd
 import re
+import select
 import shlex
+import signal
+import socket
+import sqlite3
+import struct
 import subprocess
+import sys
+import tempfile
 import threading
 import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
+from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 from urllib.parse import parse_qs, unquote, urlparse
 from zoneinfo import ZoneInfo
 
+try:  # optional: faster JSON decoding for the transcript scanner
+    import orjson  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - depends on host packages
+    orjson = None
+
+try:  # optional: brotli is preferred over gzip when the client accepts it
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - depends on host packages
+    try:
+        import brotlicffi as brotli  # type: ignore[import-not-found,no-redef]
+    except ImportError:
+        brotli = None
+
 
 ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_CONFIG_PATH = ROOT / "config.json"
@@ -95,6 +130,31 @@ def _run(cmd: list[str], timeout_s: int = 30) -> subprocess.CompletedProcess[str
         return subprocess.CompletedProcess(cmd, 124, stdout=stdout, stderr=stderr)
 
 
+async def _run_async(cmd: list[str], timeout_s: int = 30) -> subprocess.CompletedProcess[str]:
+    # asyncio counterpart of `_run` (same result shape and timeout handling) that parks no thread on
+    # the child process.
+    proc = await asyncio.create_subprocess_exec(*cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(), timeout_s)
+    except asyncio.TimeoutError:
+        proc.kill()
+        out, err = await proc.communicate()
+        stderr = err.decode("utf-8", errors="replace").strip()
+        stderr = f"{stderr}\nTimeout after {timeout_s}s" if stderr else f"Timeout after {timeout_s}s"
+        return subprocess.CompletedProcess(
+            cmd, 124, stdout=out.decode("utf-8", errors="replace").strip(), stderr=stderr
+        )
+    finally:
+        if proc.returncode is None:  # cancelled: the client went away
+            proc.kill()
+    return subprocess.CompletedProcess(
+        cmd,
+        int(proc.returncode or 0),
+        stdout=out.decode("utf-8", errors="replace"),
+        stderr=err.decode("utf-8", errors="replace"),
+    )
+
+
 _JOURNAL_TS_FORMATS = ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z")
 
 
@@ -126,6 +186,11 @@ class UnitSpec:
     uid: int | None = None
 
 
+def _spec_key(spec: UnitSpec) -> tuple[str, str, str]:
+    # Identity of a unit across scopes: a system unit and a user unit may share a name.
+    return (spec.scope, spec.user or str(spec.uid or ""), spec.unit)
+
+
 def _resolve_user_uid(spec: UnitSpec) -> tuple[str, int]:
     if spec.user:
         uid = int(spec.uid) if spec.uid is not None else int(pwd.getpwnam(spec.user).pw_uid)
@@ -171,23 +236,503 @@ def _journalctl_cmd(spec: UnitSpec, args: list[str]) -> list[str]:
     return ["journalctl", *args]
 
 
+def _journal_unit_args(spec: UnitSpec) -> list[str]:
+    # Match selector for one unit's messages (user units via the user manager's journal fields).
+    if spec.scope == "user":
+        return [f"--user-unit={spec.unit}"]
+    return ["-u", spec.unit]
+
+
+# --- Native systemd status over D-Bus ------------------------------------------------------------
+#
+# Minimal stdlib D-Bus client (EXTERNAL auth over a unix socket, method calls only) so status reads
+# don't have to fork systemctl. Actions still go through systemctl, which waits for job completion.
+
+_DBUS_ALIGN = {
+    "y": 1, "b": 4, "n": 2, "q": 2, "i": 4, "u": 4, "x": 8, "t": 8, "d": 8, "h": 4,
+    "s": 4, "o": 4, "g": 1, "v": 1, "a": 4, "(": 8, "{": 8,
+}
+_DBUS_FIXED = {"y": "B", "n": "h", "q": "H", "i": "i", "u": "I", "x": "q", "t": "Q", "d": "d", "h": "I"}
+
+_DBUS_METHOD_CALL = 1
+_DBUS_METHOD_RETURN = 2
+_DBUS_ERROR = 3
+
+_DBUS_FIELD_PATH = 1
+_DBUS_FIELD_INTERFACE = 2
+_DBUS_FIELD_MEMBER = 3
+_DBUS_FIELD_ERROR_NAME = 4
+_DBUS_FIELD_REPLY_SERIAL = 5
+_DBUS_FIELD_DESTINATION = 6
+_DBUS_FIELD_SIGNATURE = 8
+
+
+class _DBusError(Exception):
+    def __init__(self, name: str, message: str = "") -> None:
+        super().__init__(f"{name}: {message}" if message else name)
+        self.name = name
+
+
+def _dbus_type_end(sig: str, i: int) -> int:
+    c = sig[i]
+    if c == "a":
+        return _dbus_type_end(sig, i + 1)
+    if c in "({":
+        close = ")" if c == "(" else "}"
+        j = i + 1
+        while sig[j] != close:
+            j = _dbus_type_end(sig, j)
+        return j + 1
+    return i + 1
+
+
+def _dbus_split_sig(sig: str) -> list[str]:
+    out: list[str] = []
+    i = 0
+    while i < len(sig):
+        j = _dbus_type_end(sig, i)
+        out.append(sig[i:j])
+        i = j
+    return out
+
+
+def _dbus_pad(buf: bytearray, n: int) -> None:
+    buf.extend(b"\0" * (-len(buf) % n))
+
+
+def _dbus_marshal(buf: bytearray, sig: str, value: Any) -> None:
+    c = sig[0]
+    _dbus_pad(buf, _DBUS_ALIGN[c])
+    if c in _DBUS_FIXED:
+        buf.extend(struct.pack("<" + _DBUS_FIXED[c], value))
+    elif c == "b":
+        buf.extend(struct.pack("<I", 1 if value else 0))
+    elif c in "so":
+        raw = str(value).encode("utf-8")
+        buf.extend(struct.pack("<I", len(raw)) + raw + b"\0")
+    elif c == "g":
+        raw = str(value).encode("ascii")
+        buf.extend(bytes([len(raw)]) + raw + b"\0")
+    elif c == "v":
+        inner_sig, inner = value
+        _dbus_marshal(buf, "g", inner_sig)
+        _dbus_marshal(buf, inner_sig, inner)
+    elif c == "a":
+        elem = sig[1:]
+        len_at = len(buf)
+        buf.extend(b"\0\0\0\0")
+        _dbus_pad(buf, _DBUS_ALIGN[elem[0]])
+        start = len(buf)
+        items = value.items() if elem[0] == "{" else value
+        for item in items:
+            _dbus_marshal(buf, elem, item)
+        struct.pack_into("<I", buf, len_at, len(buf) - start)
+    elif c in "({":
+        for sub, v in zip(_dbus_split_sig(sig[1:-1]), value):
+            _dbus_marshal(buf, sub, v)
+    else:
+        raise ValueError(f"unsupported D-Bus type: {sig}")
+
+
+class _DBusReader:
+    def __init__(self, data: bytes, pos: int, little: bool) -> None:
+        self.data = data
+        self.pos = pos
+        self.e = "<" if little else ">"
+
+    def _align(self, n: int) -> None:
+        self.pos += -self.pos % n
+
+    def read(self, sig: str) -> Any:
+        c = sig[0]
+        self._align(_DBUS_ALIGN[c])
+        if c in _DBUS_FIXED:
+            fmt = self.e + _DBUS_FIXED[c]
+            (v,) = struct.unpack_from(fmt, self.data, self.pos)
+            self.pos += struct.calcsize(fmt)
+            return v
+        if c == "b":
+            (v,) = struct.unpack_from(self.e + "I", self.data, self.pos)
+            self.pos += 4
+            return bool(v)
+        if c in "so":
+            (n,) = struct.unpack_from(self.e + "I", self.data, self.pos)
+            s = self.data[self.pos + 4 : self.pos + 4 + n].decode("utf-8", errors="replace")
+            self.pos += 4 + n + 1
+            return s
+        if c == "g":
+            n = self.data[self.pos]
+            s = self.data[self.pos + 1 : self.pos + 1 + n].decode("ascii", errors="replace")
+            self.pos += 1 + n + 1
+            return s
+        if c == "v":
+            inner_sig = self.read("g")
+            return (inner_sig, self.read(inner_sig))
+        if c == "a":
+            elem = sig[1:]
+            (n,) = struct.unpack_from(self.e + "I", self.data, self.pos)
+            self.pos += 4
+            self._align(_DBUS_ALIGN[elem[0]])
+            end = self.pos + n
+            items = []
+            while self.pos < end:
+                items.append(self.read(elem))
+            if elem[0] == "{":
+                return dict(items)
+            return items
+        if c in "({":
+            return tuple(self.read(sub) for sub in _dbus_split_sig(sig[1:-1]))
+        raise ValueError(f"unsupported D-Bus type: {sig}")
+
+
+def _dbus_socket_path(address: str) -> str:
+    # Only unix transports are supported (that's all systemd/dbus-daemon expose locally).
+    for part in address.split(";"):
+        transport, _, params = part.partition(":")
+        if transport != "unix":
+            continue
+        kv = dict(p.split("=", 1) for p in params.split(",") if "=" in p)
+        if kv.get("path"):
+            return unquote(kv["path"])
+        if kv.get("abstract"):
+            return "\0" + unquote(kv["abstract"])
+    raise ValueError(f"unsupported D-Bus address: {address}")
+
+
+class _DBusConnection:
+    def __init__(self, address: str, *, bus: bool, timeout_s: float = 5.0) -> None:
+        self.address = address
+        self.bus = bus
+        self.lock = threading.Lock()
+        self.unit_paths: dict[str, str] = {}
+        self._serial = 0
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout_s)
+        try:
+            self._sock.connect(_dbus_socket_path(address))
+            self._auth()
+            if bus:
+                self.call("org.freedesktop.DBus", "/org/freedesktop/DBus", "org.freedesktop.DBus", "Hello")
+        except Exception:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        try:
+            self._sock.close()
+        except Exception:  # noqa: BLE001
+            pass
+
+    def _readline(self) -> bytes:
+        buf = b""
+        while not buf.endswith(b"\r\n"):
+            chunk = self._sock.recv(1)
+            if not chunk:
+                raise ConnectionError("D-Bus connection closed during auth")
+            buf += chunk
+        return buf
+
+    def _auth(self) -> None:
+        uid_hex = str(os.geteuid()).encode("ascii").hex().encode("ascii")
+        self._sock.sendall(b"\0AUTH EXTERNAL " + uid_hex + b"\r\n")
+        reply = self._readline()
+        if not reply.startswith(b"OK "):
+            raise ConnectionError(f"D-Bus auth rejected: {reply.strip().decode('ascii', errors='replace')}")
+        self._sock.sendall(b"BEGIN\r\n")
+
+    def _recv_exact(self, n: int) -> bytes:
+        chunks: list[bytes] = []
+        while n > 0:
+            chunk = self._sock.recv(n)
+            if not chunk:
+                raise ConnectionError("D-Bus connection closed")
+            chunks.append(chunk)
+            n -= len(chunk)
+        return b"".join(chunks)
+
+    def _recv_message(self) -> tuple[int, dict[int, Any], list[Any]]:
+        head = self._recv_exact(16)
+        little = head[0:1] == b"l"
+        e = "<" if little else ">"
+        msg_type = head[1]
+        (body_len,) = struct.unpack_from(e + "I", head, 4)
+        (fields_len,) = struct.unpack_from(e + "I", head, 12)
+        header_len = 16 + fields_len
+        header_len += -header_len % 8
+        data = head + self._recv_exact(header_len - 16 + body_len)
+        reader = _DBusReader(data, 12, little)
+        fields = {code: val for code, (_, val) in reader.read("a(yv)")}
+        body: list[Any] = []
+        sig = str(fields.get(_DBUS_FIELD_SIGNATURE) or "")
+        if sig:
+            reader.pos = header_len
+            body = [reader.read(t) for t in _dbus_split_sig(sig)]
+        return msg_type, fields, body
+
+    def call(
+        self,
+        destination: str,
+        path: str,
+        interface: str,
+        member: str,
+        signature: str = "",
+        args: tuple[Any, ...] = (),
+    ) -> list[Any]:
+        with self.lock:
+            self._serial += 1
+            serial = self._serial
+            body = bytearray()
+            for t, v in zip(_dbus_split_sig(signature), args):
+                _dbus_marshal(body, t, v)
+            fields: list[tuple[int, tuple[str, Any]]] = [
+                (_DBUS_FIELD_PATH, ("o", path)),
+                (_DBUS_FIELD_INTERFACE, ("s", interface)),
+                (_DBUS_FIELD_MEMBER, ("s", member)),
+            ]
+            if self.bus:
+                fields.append((_DBUS_FIELD_DESTINATION, ("s", destination)))
+            if signature:
+                fields.append((_DBUS_FIELD_SIGNATURE, ("g", signature)))
+            msg = bytearray(b"l")
+            msg.extend(struct.pack("<BBBII", _DBUS_METHOD_CALL, 0, 1, len(body), serial))
+            _dbus_marshal(msg, "a(yv)", fields)
+            _dbus_pad(msg, 8)
+            msg.extend(body)
+            self._sock.sendall(bytes(msg))
+
+            while True:
+                msg_type, reply_fields, reply_body = self._recv_message()
+                if reply_fields.get(_DBUS_FIELD_REPLY_SERIAL) != serial:
+                    continue  # signals / unrelated traffic
+                if msg_type == _DBUS_METHOD_RETURN:
+                    return reply_body
+                if msg_type == _DBUS_ERROR:
+                    name = str(reply_fields.get(_DBUS_FIELD_ERROR_NAME) or "org.freedesktop.DBus.Error.Failed")
+                    text = str(reply_body[0]) if reply_body and isinstance(reply_body[0], str) else ""
+                    raise _DBusError(name, text)
+
+
+_SYSTEMD_DEST = "org.freedesktop.systemd1"
+_SYSTEMD_PATH = "/org/freedesktop/systemd1"
+_SYSTEMD_MANAGER_IFACE = "org.freedesktop.systemd1.Manager"
+_SYSTEMD_UNIT_IFACE = "org.freedesktop.systemd1.Unit"
+_SYSTEMD_SERVICE_IFACE = "org.freedesktop.systemd1.Service"
+_DBUS_PROPS_IFACE = "org.freedesktop.DBus.Properties"
+
+# Properties that live on the Service interface; everything else is read from Unit.
+_SYSTEMD_SERVICE_PROPS = {"MainPID", "NRestarts", "MemoryCurrent", "CPUUsageNSec", "User", "Group"}
+
+
+def _format_usec_timestamp(usec: int) -> str:
+    if usec <= 0 or usec >= 2**64 - 1:
+        return ""
+    return time.strftime("%a %Y-%m-%d %H:%M:%S %Z", time.localtime(usec / 1_000_000))
+
+
+def _format_show_value(prop: str, sig: str, value: Any) -> str:
+    # Mirror what `systemctl show` prints for the property types we request.
+    if sig == "b":
+        return "yes" if value else "no"
+    if sig in _DBUS_FIXED and sig not in ("d", "h"):
+        n = int(value)
+        if prop.endswith("Timestamp"):
+            return _format_usec_timestamp(n)
+        if sig == "t" and n == 2**64 - 1:
+            return "[not set]"
+        return str(n)
+    if sig in ("as", "ao"):
+        return " ".join(str(v) for v in value)
+    return str(value)
+
+
+@dataclass
+class _SystemdDBusBackend:
+    mode: str = "auto"  # "auto" (D-Bus, falling back to systemctl) | "subprocess"
+    system_address: str | None = None
+    retry_after_s: float = 30.0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    conns: dict[tuple[object, ...], _DBusConnection] = field(default_factory=dict)
+    failed_until: dict[tuple[object, ...], float] = field(default_factory=dict)
+
+    def _address(self, key: tuple[object, ...]) -> tuple[str, bool] | None:
+        euid = os.geteuid()
+        if key[0] == "system":
+            if self.system_address:
+                return (self.system_address, not self.system_address.endswith("/systemd/private"))
+            if euid == 0:
+                # Same private socket systemctl uses as root: peer-to-peer, no dbus-daemon hop.
+                return ("unix:path=/run/systemd/private", False)
+            return ("unix:path=/run/dbus/system_bus_socket", True)
+        uid = int(key[2])  # type: ignore[arg-type]
+        if euid not in (0, uid):
+            return None
+        return (f"unix:path=/run/user/{uid}/systemd/private", False)
+
+    def _connection(self, key: tuple[object, ...]) -> _DBusConnection | None:
+        with self.lock:
+            conn = self.conns.get(key)
+            if conn is not None:
+                return conn
+            if time.monotonic() < self.failed_until.get(key, 0.0):
+                return None
+            addr = self._address(key)
+            if addr is None:
+                return None
+            try:
+                conn = _DBusConnection(addr[0], bus=addr[1])
+            except Exception:  # noqa: BLE001
+                self.failed_until[key] = time.monotonic() + self.retry_after_s
+                return None
+            self.conns[key] = conn
+            return conn
+
+    def _drop(self, key: tuple[object, ...], conn: _DBusConnection) -> None:
+        with self.lock:
+            if self.conns.get(key) is conn:
+                del self.conns[key]
+            self.failed_until[key] = time.monotonic() + self.retry_after_s
+        conn.close()
+
+    def _unit_path(self, conn: _DBusConnection, unit: str) -> str:
+        path = conn.unit_paths.get(unit)
+        if path is None:
+            reply = conn.call(_SYSTEMD_DEST, _SYSTEMD_PATH, _SYSTEMD_MANAGER_IFACE, "LoadUnit", "s", (unit,))
+            path = str(reply[0])
+            conn.unit_paths[unit] = path
+        return path
+
+    def show(self, spec: UnitSpec, props: list[str]) -> dict[str, str] | None:
+        # None means "not available here"; callers fall back to forking systemctl.
+        if self.mode == "subprocess":
+            return None
+        try:
+            key = _bus_key(spec)
+        except Exception:  # noqa: BLE001
+            return None
+        conn = self._connection(key)
+        if conn is None:
+            return None
+        try:
+            path = self._unit_path(conn, spec.unit)
+            wanted = {_SYSTEMD_SERVICE_IFACE if p in _SYSTEMD_SERVICE_PROPS else _SYSTEMD_UNIT_IFACE for p in props}
+            values: dict[str, dict[str, tuple[str, Any]]] = {}
+            for iface in wanted:
+                try:
+                    reply = conn.call(_SYSTEMD_DEST, path, _DBUS_PROPS_IFACE, "GetAll", "s", (iface,))
+                except _DBusError:
+                    continue  # e.g. Service on a timer; systemctl omits those properties too
+                values[iface] = reply[0]
+            out: dict[str, str] = {}
+            for prop in props:
+                iface = _SYSTEMD_SERVICE_IFACE if prop in _SYSTEMD_SERVICE_PROPS else _SYSTEMD_UNIT_IFACE
+                found = values.get(iface, {}).get(prop)
+                if found is not None:
+                    out[prop] = _format_show_value(prop, *found)
+            return out
+        except _DBusError:
+            return None
+        except Exception:  # noqa: BLE001
+            self._drop(key, conn)
+            return None
+
+
+_SYSTEMD_DBUS = _SystemdDBusBackend(mode="subprocess")
+
+
+def _configure_systemd_backend(cfg: dict[str, object]) -> None:
+    raw = cfg.get("systemdBackend")
+    if raw is None:
+        raw = {}
+    if not isinstance(raw, dict):
+        raise ValueError("config.systemdBackend must be an object")
+    mode = str(raw.get("mode") or "auto").strip().lower()
+    if mode not in {"auto", "subprocess"}:
+        raise ValueError("config.systemdBackend.mode must be 'auto' or 'subprocess'")
+    system_address = str(raw.get("systemAddress") or "").strip() or None
+    global _SYSTEMD_DBUS
+    _SYSTEMD_DBUS = _SystemdDBusBackend(mode=mode, system_address=system_address)
+
+
+def _parse_show_block(lines: list[str]) -> dict[str, str]:
+    out: dict[str, str] = {}
+    for line in lines:
+        if "=" not in line:
+            continue
+        k, v = line.split("=", 1)
+        out[k.strip()] = v.strip()
+    return out
+
+
 def _systemctl_show(spec: UnitSpec, props: list[str]) -> dict[str, str]:
+    native = _SYSTEMD_DBUS.show(spec, props)
+    if native is not None:
+        return native
     cmd = _systemctl_cmd(spec, ["show", spec.unit, "--no-pager"])
     for p in props:
         cmd += ["-p", p]
     proc = _run(cmd, timeout_s=10)
-    out: dict[str, str] = {}
-    for line in (proc.stdout or "").splitlines():
-        if "=" not in line:
+    return _parse_show_block((proc.stdout or "").splitlines())
+
+
+def _split_show_blocks(stdout: str) -> list[dict[str, str]]:
+    # `systemctl show u1 u2 ...` prints one property block per unit, separated by a blank line.
+    blocks: list[dict[str, str]] = []
+    cur: list[str] = []
+    for line in stdout.splitlines():
+        if line.strip():
+            cur.append(line)
             continue
-        k, v = line.split("=", 1)
-        out[k.strip()] = v.strip()
+        if cur:
+            blocks.append(_parse_show_block(cur))
+            cur = []
+    if cur:
+        blocks.append(_parse_show_block(cur))
+    return blocks
+
+
+def _bus_key(spec: UnitSpec) -> tuple[object, ...]:
+    if spec.scope == "user":
+        return ("user", *_resolve_user_uid(spec))
+    return ("system",)
+
+
+def _systemctl_show_many(specs: list[UnitSpec], props: list[str]) -> dict[tuple[str, str, str], dict[str, str]]:
+    # One `systemctl show` per bus (system + each user manager) instead of one fork per unit.
+    # Keyed by `_spec_key`; units that can't be attributed are left out so callers fall back to
+    # `_systemctl_show` (and see its errors) for them.
+    groups: dict[tuple[object, ...], list[UnitSpec]] = {}
+    out: dict[tuple[str, str, str], dict[str, str]] = {}
+    for spec in specs:
+        native = _SYSTEMD_DBUS.show(spec, props)
+        if native is not None:
+            out[_spec_key(spec)] = native
+            continue
+        try:
+            key = _bus_key(spec)
+        except Exception:  # noqa: BLE001
+            continue
+        groups.setdefault(key, []).append(spec)
+
+    for group in groups.values():
+        cmd = _systemctl_cmd(group[0], ["show", *[s.unit for s in group], "--no-pager"])
+        for p in props:
+            cmd += ["-p", p]
+        proc = _run(cmd, timeout_s=10 + len(group))
+        blocks = _split_show_blocks(proc.stdout or "")
+        if len(blocks) != len(group):
+            continue  # can't be attributed reliably (e.g. one bad unit name aborted the batch)
+        for spec, block in zip(group, blocks):
+            out[_spec_key(spec)] = block
     return out
 
 
+_UNIT_ACTIONS = {"start", "stop", "restart", "enable", "disable"}
+_UNIT_ACTION_TIMEOUT_S = 180  # stopping some bots can take a while (Playwright / browser trees, etc.)
+_UNIT_STATUS_PROPS = ["LoadState", "ActiveState", "SubState", "UnitFileState", "MainPID"]
+
+
 def _systemctl_action(spec: UnitSpec, action: str) -> dict[str, object]:
-    # Stopping some bots can take a while (Playwright / browser trees, etc.).
-    proc = _run(_systemctl_cmd(spec, [action, spec.unit]), timeout_s=180)
+    proc = _run(_systemctl_cmd(spec, [action, spec.unit]), timeout_s=_UNIT_ACTION_TIMEOUT_S)
     return {
         "exitCode": int(proc.returncode),
         "stdout": (proc.stdout or "").strip(),
@@ -203,20 +748,265 @@ def _proc_uptime_seconds() -> float:
         return 0.0
 
 
-def _collect_journal(spec: UnitSpec, lines: int, *, since: _dt.datetime | None = None) -> str:
-    args: list[str]
-    if spec.scope == "user":
-        args = [f"--user-unit={spec.unit}", "-n", str(lines), "--no-pager", "-o", "short-iso"]
-    else:
-        args = ["-u", spec.unit, "-n", str(lines), "--no-pager", "-o", "short-iso"]
+def _journal_text_cmd(spec: UnitSpec, lines: int, *, since: _dt.datetime | None = None) -> list[str]:
+    args = [*_journal_unit_args(spec), "-n", str(lines), "--no-pager", "-o", "short-iso"]
     if since is not None:
         args += [f"--since=@{int(since.timestamp())}"]
-    proc = _run(_journalctl_cmd(spec, args), timeout_s=30)
+    return _journalctl_cmd(spec, args)
+
+
+def _journal_text(proc: subprocess.CompletedProcess[str]) -> str:
     if proc.returncode != 0 and (proc.stderr or "").strip():
         return (proc.stderr or "").strip()
     return (proc.stdout or "").strip()
 
 
+_LOG_FOLLOW_BUFFER = 2000  # recent entries per followed unit, replayed to new subscribers
+_LOG_FOLLOW_MAX_SUBSCRIBERS = 64
+_LOG_FOLLOW_PRIME_S = 0.25  # initial backlog is complete once journalctl goes quiet this long
+
+
+def _journal_entry(raw: bytes | str) -> dict[str, object] | None:
+    # Trim one `journalctl -o json` record to the fields the UI shows.
+    try:
+        rec = json.loads(raw)
+    except Exception:  # noqa: BLE001
+        return None
+    if not isinstance(rec, dict):
+        return None
+    msg = rec.get("MESSAGE")
+    if isinstance(msg, list):  # non-UTF-8 messages come as byte arrays
+        msg = bytes(b for b in msg if isinstance(b, int) and 0 <= b < 256).decode("utf-8", errors="replace")
+    ts = None
+    usec = _safe_int(rec.get("__REALTIME_TIMESTAMP"), 0)
+    if usec > 0:
+        ts = _dt.datetime.fromtimestamp(usec / 1_000_000, tz=_dt.timezone.utc).isoformat().replace("+00:00", "Z")
+    return {
+        "cursor": rec.get("__CURSOR"),
+        "timestamp": ts,
+        "priority": _safe_int(rec.get("PRIORITY"), 6),
+        "identifier": rec.get("SYSLOG_IDENTIFIER") or rec.get("_COMM"),
+        "pid": _safe_int(rec.get("_PID"), 0) or None,
+        "message": msg if isinstance(msg, str) else "",
+    }
+
+
+def _journal_entry_json(raw: bytes) -> bytes | None:
+    # Serialized once per follower, then sent to every subscriber as-is.
+    entry = _journal_entry(raw)
+    return _json_dumps(entry).encode("utf-8") if entry is not None else None
+
+
+_JOURNAL_CURSOR_RE = re.compile(r"^[A-Za-z0-9=;_-]{1,512}$")
+_JOURNAL_PRIORITY_RE = re.compile(
+    r"^(?:[0-7]|emerg|alert|crit|err|warning|notice|info|debug)"
+    r"(?:\.\.(?:[0-7]|emerg|alert|crit|err|warning|notice|info|debug))?$"
+)
+_JOURNAL_FIELDS = "__CURSOR,__REALTIME_TIMESTAMP,PRIORITY,SYSLOG_IDENTIFIER,_COMM,_PID,MESSAGE"
+
+
+def _journal_page_cmd(
+    spec: UnitSpec,
+    limit: int,
+    *,
+    before: str | None = None,
+    after: str | None = None,
+    since: _dt.datetime | None = None,
+    grep: str | None = None,
+    priority: str | None = None,
+) -> list[str]:
+    """journalctl command for one page of structured entries (see `_journal_page`).
+
+    Without a cursor this is the newest `limit` entries; `before`/`after` page relative to an entry's
+    `cursor` (exclusive), so clients never re-read what they already have.
+    """
+    args = [*_journal_unit_args(spec), "--no-pager", "-o", "json", f"--output-fields={_JOURNAL_FIELDS}"]
+    # One extra row tells whether another page exists; `--cursor` is inclusive, so `before` needs two.
+    if before:
+        args += ["--reverse", f"--cursor={before}", "-n", str(limit + 2)]
+    elif after:
+        args += [f"--after-cursor={after}", "-n", str(limit + 1)]
+    else:
+        args += ["--reverse", "-n", str(limit + 1)]
+    if since is not None:
+        args += [f"--since=@{int(since.timestamp())}"]
+    if priority:
+        args += [f"--priority={priority}"]
+    if grep:
+        args += [f"--grep={grep}"]
+    return _journalctl_cmd(spec, args)
+
+
+def _journal_page(
+    proc: subprocess.CompletedProcess[str], limit: int, *, before: str | None, after: str | None
+) -> tuple[list[dict[str, object]], bool]:
+    # Entries oldest first, plus whether more exist in the paging direction.
+    if proc.returncode != 0 and not (proc.stdout or "").strip():
+        # journalctl exits 1 with no output when --grep matches nothing.
+        err = (proc.stderr or "").strip()
+        if err:
+            raise RuntimeError(err)
+    entries = [e for e in (_journal_entry(ln) for ln in (proc.stdout or "").splitlines() if ln.strip()) if e]
+    if before:
+        entries = [e for e in entries if e.get("cursor") != before]
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if before or not after:
+        entries.reverse()
+    return entries, has_more
+
+
+class _JournalFollower:
+    # One long-lived `journalctl -f -o json` per unit, shared by every /logs/stream subscriber through a
+    # bounded ring of pre-serialized entries. The process is stopped when the last subscriber leaves.
+    def __init__(self, spec: UnitSpec) -> None:
+        self.spec = spec
+        self.epoch = f"{int(time.time() * 1000):x}"  # makes event ids from an earlier follower stale
+        self.cond = threading.Condition()
+        self.entries: deque[tuple[int, bytes]] = deque(maxlen=_LOG_FOLLOW_BUFFER)
+        self.seq = 0
+        self.primed = False
+        self.closed = False
+        self.subscribers = 0
+        self.proc: subprocess.Popen[bytes] | None = None
+        self.reader: threading.Thread | None = None
+        # Called (under `cond`) on every change, for waiters that can't block on the condition.
+        self.listeners: set[Callable[[], None]] = set()
+
+    def start(self) -> None:
+        args = [*_journal_unit_args(self.spec), "-f", "-o", "json", "-n", str(_LOG_FOLLOW_BUFFER), "--no-pager"]
+        try:
+            self.proc = subprocess.Popen(
+                _journalctl_cmd(self.spec, args), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+        except (OSError, KeyError):
+            self._close()
+            return
+        self.reader = threading.Thread(target=self._read, name=f"journal-follow:{self.spec.unit}", daemon=True)
+        self.reader.start()
+
+    def _read(self) -> None:
+        proc = self.proc
+        assert proc is not None and proc.stdout is not None
+        fd = proc.stdout.fileno()
+        pending = b""
+        try:
+            while True:
+                ready, _, _ = select.select([fd], [], [], _LOG_FOLLOW_PRIME_S)
+                if not ready:
+                    if not self.primed:
+                        with self.cond:
+                            self.primed = True
+                            self._notify_locked()
+                    continue
+                chunk = os.read(fd, 64 * 1024)
+                if not chunk:
+                    break
+                *lines, pending = (pending + chunk).split(b"\n")
+                batch = [e for e in (_journal_entry_json(ln) for ln in lines if ln.strip()) if e is not None]
+                if batch:
+                    with self.cond:
+                        for e in batch:
+                            self.seq += 1
+                            self.entries.append((self.seq, e))
+                        if len(self.entries) >= _LOG_FOLLOW_BUFFER:
+                            self.primed = True
+                        self._notify_locked()
+        except (OSError, ValueError):
+            pass
+        finally:
+            proc.stdout.close()
+        self._close()
+
+    def _close(self) -> None:
+        with self.cond:
+            self.closed = True
+            self.primed = True
+            self._notify_locked()
+
+    def _notify_locked(self) -> None:
+        self.cond.notify_all()
+        for cb in list(self.listeners):
+            cb()
+
+    def start_seq_locked(self, lines: int, last_event_id: str) -> int:
+        # Seq a new subscriber has "already seen": the last `lines` entries get replayed, unless an
+        # EventSource reconnect names an entry that is still buffered.
+        first = self.entries[0][0] if self.entries else self.seq + 1
+        sent = max(first - 1, self.seq - lines)
+        epoch, _, last_id = last_event_id.partition(":")
+        if epoch == self.epoch and last_id.isdigit() and int(last_id) >= first - 1:
+            sent = min(int(last_id), self.seq)
+        return sent
+
+    def sse_since_locked(self, sent: int) -> tuple[bytes, int]:
+        # SSE frames for entries after `sent`. A subscriber that fell further behind than the buffer
+        # skips the overwritten part.
+        first = self.entries[0][0] if self.entries else self.seq + 1
+        start = max(sent, first - 1)
+        out = b"".join(
+            f"id: {self.epoch}:{seq}\nevent: entry\ndata: ".encode("utf-8") + body + b"\n\n"
+            for seq, body in self.entries
+            if seq > start
+        )
+        return out, self.seq
+
+    def stop(self) -> None:
+        proc = self.proc
+        if proc is None:
+            return
+        if proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+        # The reader sees EOF once journalctl is gone and closes the pipe itself; only close it here
+        # when the reader is done, so its fd number can't be reused under a still-running read.
+        if self.reader is not None:
+            self.reader.join(timeout=2)
+        if proc.stdout is not None and (self.reader is None or not self.reader.is_alive()):
+            proc.stdout.close()
+
+
+_JOURNAL_FOLLOWERS_LOCK = threading.Lock()
+_JOURNAL_FOLLOWERS: dict[tuple[str, str, str], _JournalFollower] = {}
+
+
+def _subscribe_journal(spec: UnitSpec) -> _JournalFollower | None:
+    key = _spec_key(spec)
+    with _JOURNAL_FOLLOWERS_LOCK:
+        if sum(f.subscribers for f in _JOURNAL_FOLLOWERS.values()) >= _LOG_FOLLOW_MAX_SUBSCRIBERS:
+            return None
+        follower = _JOURNAL_FOLLOWERS.get(key)
+        if follower is None or follower.closed:
+            follower = _JournalFollower(spec)
+            _JOURNAL_FOLLOWERS[key] = follower
+            follower.start()
+        follower.subscribers += 1
+    return follower
+
+
+def _unsubscribe_journal(follower: _JournalFollower) -> None:
+    key = _spec_key(follower.spec)
+    with _JOURNAL_FOLLOWERS_LOCK:
+        follower.subscribers -= 1
+        if follower.subscribers > 0:
+            return
+        if _JOURNAL_FOLLOWERS.get(key) is follower:
+            del _JOURNAL_FOLLOWERS[key]
+    follower.stop()
+
+
+def _stop_journal_followers() -> None:
+    with _JOURNAL_FOLLOWERS_LOCK:
+        followers = list(_JOURNAL_FOLLOWERS.values())
+        _JOURNAL_FOLLOWERS.clear()
+    for follower in followers:
+        follower.stop()
+
+
 _SINCE_RE = re.compile(r"^(\d+)([smhd])$", re.IGNORECASE)
 
 
@@ -289,34 +1079,195 @@ _LOG_ISSUE_RULES: list[dict[str, object]] = [
 ]
 
 
-def _scan_recent_log_issues(logs: str) -> list[dict[str, object]]:
-    if not logs:
-        return []
-    lines = [ln for ln in logs.splitlines() if ln.strip()]
-    if not lines:
-        return []
-    issues: list[dict[str, object]] = []
-    for rule in _LOG_ISSUE_RULES:
-        pat = rule.get("pattern")
-        if not isinstance(pat, re.Pattern):
-            continue
-        last_line = None
-        for ln in reversed(lines):
-            if pat.search(ln):
-                last_line = ln
-                break
-        if not last_line:
+_REGEX_BACKREF_RE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+def _spliced_pattern(p: re.Pattern[str]) -> str:
+    return f"(?i:{p.pattern})" if p.flags & re.IGNORECASE else f"(?:{p.pattern})"
+
+
+def _standalone_pattern(p: re.Pattern[str]) -> bool:
+    if p.groupindex or _REGEX_BACKREF_RE.search(p.pattern):
+        return True
+    try:
+        re.compile(_spliced_pattern(p))
+    except re.error:
+        return True
+    return False
+
+
+class _LogIssueMatcher:
+    # All rules folded into one alternation, so a line that matches nothing (nearly all of them) costs a
+    # single regex pass however many rules there are. Only lines that hit the combined pattern are
+    # tested against the individual rules, since one line can match several.
+    def __init__(self, rules: list[dict[str, object]]) -> None:
+        self.rules: list[dict[str, object]] = []
+        self._patterns: list[re.Pattern[str]] = []
+        for r in rules:
+            pat = r.get("pattern")
+            if isinstance(pat, re.Pattern):
+                self.rules.append(r)
+                self._patterns.append(pat)
+        # Group names, backreferences and global inline flags like "(?i)" don't survive being spliced
+        # into one alternation; rules that use them are simply tried on every line.
+        self._standalone = [_standalone_pattern(p) for p in self._patterns]
+        parts = [_spliced_pattern(p) for p, alone in zip(self._patterns, self._standalone) if not alone]
+        try:
+            self.combined = re.compile("|".join(parts)) if parts else None
+        except re.error:
+            self.combined = None
+            self._standalone = [True] * len(self._patterns)
+        self._any_standalone = any(self._standalone)
+        self.sig = _json_dumps([[r.get("key"), p.pattern, p.flags] for r, p in zip(self.rules, self._patterns)])
+
+    def classify(self, line: str) -> list[dict[str, object]]:
+        hit = self.combined is not None and self.combined.search(line) is not None
+        if not hit and not self._any_standalone:
+            return []
+        return [
+            r
+            for r, p, alone in zip(self.rules, self._patterns, self._standalone)
+            if (hit or alone) and p.search(line)
+        ]
+
+
+_LOG_ISSUE_MATCHERS: dict[str, _LogIssueMatcher] = {}
+
+
+def _log_issue_matcher(cfg: dict[str, object]) -> _LogIssueMatcher:
+    # Built-in rules plus config.logIssueRules: a config rule with a built-in's key replaces it and
+    # `"enabled": false` drops it. Compiled matchers are cached per rule set.
+    raw = cfg.get("logIssueRules")
+    if raw is None:
+        raw = []
+    if not isinstance(raw, list):
+        raise ValueError("config.logIssueRules must be a list")
+    cache_key = _json_dumps(raw)
+    cached = _LOG_ISSUE_MATCHERS.get(cache_key)
+    if cached is not None:
+        return cached
+
+    rules: dict[str, dict[str, object]] = {str(r["key"]): r for r in _LOG_ISSUE_RULES}
+    for i, item in enumerate(raw):
+        if not isinstance(item, dict):
+            raise ValueError(f"config.logIssueRules[{i}] must be an object")
+        key = str(item.get("key") or "").strip()
+        if not key:
+            raise ValueError(f"config.logIssueRules[{i}].key is required")
+        if item.get("enabled") is False:
+            rules.pop(key, None)
             continue
-        issues.append(
-            {
-                "source": "journal",
-                "key": str(rule.get("key") or "unknown"),
-                "severity": str(rule.get("severity") or "warn"),
-                "message": str(rule.get("message") or "issue"),
-                "hint": str(rule.get("hint") or ""),
-                "timestamp": _extract_journal_ts_iso(last_line),
-            }
-        )
+        try:
+            flags = re.IGNORECASE if item.get("ignoreCase", True) else 0
+            pattern = re.compile(str(item.get("pattern") or ""), flags)
+        except re.error as e:
+            raise ValueError(f"config.logIssueRules[{i}].pattern: {e}") from e
+        if not pattern.pattern:
+            raise ValueError(f"config.logIssueRules[{i}].pattern is required")
+        rules[key] = {
+            "key": key,
+            "severity": str(item.get("severity") or "warn"),
+            "pattern": pattern,
+            "message": str(item.get("message") or key),
+            "hint": str(item.get("hint") or ""),
+        }
+
+    matcher = _LogIssueMatcher(list(rules.values()))
+    if len(_LOG_ISSUE_MATCHERS) > 8:
+        _LOG_ISSUE_MATCHERS.clear()
+    _LOG_ISSUE_MATCHERS[cache_key] = matcher
+    return matcher
+
+
+_LOG_ISSUE_WINDOW_LINES = 200  # a match stays reported until this many newer lines have been logged
+
+
+@dataclass
+class _JournalTail:
+    # Where the health scan left off in one unit's journal, for the current service invocation.
+    invocation: str
+    rules_sig: str
+    cursor: str | None = None
+    lines_seen: int = 0
+    matches: dict[str, tuple[int, str]] = field(default_factory=dict)  # rule key -> (line number, line)
+    # Held for a whole read-and-update: a collector abandoned by the unit timeout may still be
+    # scanning when the next build gets to the same unit.
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+
+_JOURNAL_TAILS_LOCK = threading.Lock()
+_JOURNAL_TAILS: dict[tuple[str, str, str], _JournalTail] = {}
+
+
+def _read_journal_tail(spec: UnitSpec, tail: _JournalTail, since: _dt.datetime | None) -> list[str] | None:
+    # New lines after tail.cursor (or the last window since `since` on the first read); advances the
+    # cursor. None means journalctl failed, e.g. the cursor points into a vacuumed journal file.
+    args = [*_journal_unit_args(spec), "--no-pager", "-o", "short-iso", "--show-cursor"]
+    if tail.cursor:
+        args.append(f"--after-cursor={tail.cursor}")
+    else:
+        args += ["-n", str(_LOG_ISSUE_WINDOW_LINES)]
+        if since is not None:
+            args.append(f"--since=@{int(since.timestamp())}")
+    proc = _run(_journalctl_cmd(spec, args), timeout_s=30)
+    if proc.returncode != 0:
+        return None
+    lines: list[str] = []
+    for ln in (proc.stdout or "").splitlines():
+        if ln.startswith("-- cursor: "):
+            tail.cursor = ln[len("-- cursor: ") :].strip() or tail.cursor
+        elif ln.startswith("-- ") or not ln.strip():
+            continue  # "-- No entries --", boot markers
+        else:
+            lines.append(ln)
+    return lines
+
+
+def _scan_recent_log_issues(
+    spec: UnitSpec, *, since: _dt.datetime | None, invocation: str, matcher: _LogIssueMatcher
+) -> list[dict[str, object]]:
+    # Only journal entries newer than the last scan are read; the latest match per rule is remembered
+    # per unit and dropped once it falls out of the last _LOG_ISSUE_WINDOW_LINES lines. A new service
+    # invocation (restart) or a changed rule set starts over from the invocation's start time.
+    key = _spec_key(spec)
+    with _JOURNAL_TAILS_LOCK:
+        tail = _JOURNAL_TAILS.get(key)
+        if tail is None or tail.invocation != invocation or tail.rules_sig != matcher.sig:
+            tail = _JournalTail(invocation=invocation, rules_sig=matcher.sig)
+            _JOURNAL_TAILS[key] = tail
+
+    with tail.lock:
+        new_lines = _read_journal_tail(spec, tail, since)
+        if new_lines is None and tail.cursor:
+            tail.cursor = None
+            tail.lines_seen = 0
+            tail.matches = {}
+            new_lines = _read_journal_tail(spec, tail, since)
+
+        for ln in new_lines or []:
+            tail.lines_seen += 1
+            for rule in matcher.classify(ln):
+                tail.matches[str(rule.get("key") or "unknown")] = (tail.lines_seen, ln)
+
+        issues: list[dict[str, object]] = []
+        for rule in matcher.rules:
+            rule_key = str(rule.get("key") or "unknown")
+            hit = tail.matches.get(rule_key)
+            if hit is None:
+                continue
+            if tail.lines_seen - hit[0] >= _LOG_ISSUE_WINDOW_LINES:
+                del tail.matches[rule_key]
+                continue
+            issues.append(
+                {
+                    "source": "journal",
+                    "key": rule_key,
+                    "severity": str(rule.get("severity") or "warn"),
+                    "message": str(rule.get("message") or "issue"),
+                    "hint": str(rule.get("hint") or ""),
+                    "timestamp": _extract_journal_ts_iso(hit[1]),
+                }
+            )
     return issues
 
 
@@ -557,15 +1508,17 @@ def _dates_last_n(tz: ZoneInfo, days: int) -> list[str]:
     return out
 
 
-def _scan_clawdbot_usage(state_dir: Path, tz: ZoneInfo) -> dict[str, object]:
-    # NOTE: kept for compatibility; actual scanning is now cached + incremental.
-    cache_key = f"{state_dir.resolve()}::{tz.key}"
+def _scan_clawdbot_usage(state_dir: Path, tz: ZoneInfo) -> dict[str, object] | None:
+    # NOTE: kept for compatibility; actual scanning is now cached + incremental, and one entry per
+    # state dir serves every timezone. Called from status collection, so it never waits on a scan
+    # (see `_UsageCacheEntry.get_usage_nowait`); None until the first one has finished.
+    cache_key = str(state_dir.resolve())
     with _USAGE_CACHE_LOCK:
         entry = _USAGE_CACHE.get(cache_key)
         if not entry:
-            entry = _UsageCacheEntry(state_dir=state_dir.resolve(), tz_key=tz.key)
+            entry = _UsageCacheEntry(state_dir=state_dir.resolve())
             _USAGE_CACHE[cache_key] = entry
-    return entry.get_usage(tz)
+    return entry.get_usage_nowait(tz)
 
 
 @dataclass
@@ -582,32 +1535,334 @@ class _UsageBucket:
         if is_error:
             self.errors += 1.0
 
+    def merge(self, other: _UsageBucket, sign: float = 1.0) -> None:
+        self.tokens += sign * other.tokens
+        self.costUSD += sign * other.costUSD
+        self.requests += sign * other.requests
+        self.errors += sign * other.errors
+
+    def to_list(self) -> list[float]:
+        return [self.tokens, self.costUSD, self.requests, self.errors]
+
+    @classmethod
+    def from_list(cls, raw: object) -> _UsageBucket:
+        vals = list(raw) if isinstance(raw, (list, tuple)) else []
+        vals += [0.0] * (4 - len(vals))
+        return cls(*(_safe_float(v, 0.0) for v in vals[:4]))
+
+
+_MINUTE_SLOTS = 25 * 60  # per-minute bins kept for ~25h
+_QUARTER_SLOTS = 62 * 24 * 4  # per-15-minute bins kept for ~62d (7d/30d windows and daily views)
+
+
+class _UsageBins:
+    # Usage per period (minute or quarter-hour), sorted by period in parallel columns: ~40 bytes a bin
+    # rather than a dict entry plus a _UsageBucket. Events mostly arrive in time order, so adds land
+    # on the last bin or append; older periods are inserted in place.
+    __slots__ = ("keys", "tokens", "cost", "requests", "errors")
+
+    def __init__(self) -> None:
+        self.keys = array("q")
+        self.tokens = array("d")
+        self.cost = array("d")
+        self.requests = array("d")
+        self.errors = array("d")
+
+    def add(self, key: int, tokens: float, cost_usd: float, requests: float, errors: float) -> None:
+        n = len(self.keys)
+        if n and self.keys[n - 1] == key:
+            i = n - 1
+        else:
+            i = n if not n or self.keys[n - 1] < key else bisect_left(self.keys, key)
+            if i == n or self.keys[i] != key:
+                self.keys.insert(i, key)
+                for col in (self.tokens, self.cost, self.requests, self.errors):
+                    col.insert(i, 0.0)
+        self.tokens[i] += tokens
+        self.cost[i] += cost_usd
+        self.requests[i] += requests
+        self.errors[i] += errors
+
+    def get(self, key: int) -> tuple[float, float, float, float] | None:
+        i = bisect_left(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            return None
+        return self.tokens[i], self.cost[i], self.requests[i], self.errors[i]
+
+    def merge(self, other: _UsageBins) -> None:
+        for row in other.rows():
+            self.add(*row)
+
+    def rows(self) -> zip[tuple[int, float, float, float, float]]:
+        return zip(self.keys, self.tokens, self.cost, self.requests, self.errors)
+
+    def prune(self, cut: int) -> None:
+        # Drop bins for periods before `cut`.
+        i = bisect_left(self.keys, cut)
+        if i:
+            for col in (self.keys, self.tokens, self.cost, self.requests, self.errors):
+                del col[:i]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def to_state(self) -> dict[str, list[float]]:
+        return {str(k): [t, c, r, e] for k, t, c, r, e in self.rows()}
+
+    @classmethod
+    def from_state(cls, raw: object) -> _UsageBins:
+        bins = cls()
+        if isinstance(raw, dict):
+            for k, b in sorted(((int(k), _UsageBucket.from_list(b)) for k, b in raw.items()), key=lambda it: it[0]):
+                bins.add(k, b.tokens, b.costUSD, b.requests, b.errors)
+        return bins
+
+
+class _UsageRing:
+    # Usage columns for the last `size` epoch periods (minute or quarter-hour). Most rings hold far
+    # fewer periods than that, so they start sparse, as _UsageBins, dropping anything older than the
+    # newest period minus `size`. Once half the periods are live the bins move into a fixed ring
+    # indexed by period: a slot belongs to the period stored in `keys`, so stale periods are
+    # recognised (and recycled) without pruning. The fixed dashboard windows are running sums (see
+    # rolling()) updated as events land and periods slide out.
+    __slots__ = ("size", "sparse", "keys", "tokens", "cost", "requests", "errors", "_rolling")
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.sparse: _UsageBins | None = _UsageBins()
+        self.keys: array | None = None
+        self.tokens: array | None = None
+        self.cost: array | None = None
+        self.requests: array | None = None
+        self.errors: array | None = None
+        self._rolling: dict[int, tuple[int, _UsageBucket]] = {}  # span -> (end_key, running totals)
+
+    def add(self, key: int, tokens: float, cost_usd: float, requests: float, errors: float) -> None:
+        bins = self.sparse
+        if bins is not None:
+            newest = bins.keys[-1] if len(bins) else key
+            if key <= newest - self.size:
+                return  # past retention
+            if key > newest:
+                self._expire_sparse(key - self.size + 1)
+            if len(bins) < self.size // 2 or bins.get(key) is not None:
+                bins.add(key, tokens, cost_usd, requests, errors)
+                self._roll(key, tokens, cost_usd, requests, errors)
+                return
+            self._densify()
+        i = key % self.size
+        cur = self.keys[i]
+        if cur != key:
+            if cur > key:
+                return  # slot already holds a newer period: this one is past retention
+            if cur >= 0:
+                self._expire(cur)
+            self.keys[i] = key
+            self.tokens[i] = self.cost[i] = self.requests[i] = self.errors[i] = 0.0
+        self.tokens[i] += tokens
+        self.cost[i] += cost_usd
+        self.requests[i] += requests
+        self.errors[i] += errors
+        self._roll(key, tokens, cost_usd, requests, errors)
+
+    def _roll(self, key: int, tokens: float, cost_usd: float, requests: float, errors: float) -> None:
+        for span, (end_key, acc) in self._rolling.items():
+            if end_key - span < key <= end_key:
+                acc.tokens += tokens
+                acc.costUSD += cost_usd
+                acc.requests += requests
+                acc.errors += errors
+
+    def _expire(self, key: int) -> None:
+        # A period about to be dropped can't be subtracted from the running windows later.
+        for span, (end_key, acc) in self._rolling.items():
+            if end_key - span < key <= end_key:
+                self._slot_bucket(key, acc, -1.0)
+
+    def _expire_sparse(self, cut: int) -> None:
+        assert self.sparse is not None
+        for key in self.sparse.keys:
+            if key >= cut:
+                break
+            self._expire(key)
+        self.sparse.prune(cut)
+
+    def _densify(self) -> None:
+        # Live periods span less than `size`, so each gets its own slot.
+        assert self.sparse is not None
+        self.keys = array("q", [-1]) * self.size
+        self.tokens = array("d", [0.0]) * self.size
+        self.cost = array("d", [0.0]) * self.size
+        self.requests = array("d", [0.0]) * self.size
+        self.errors = array("d", [0.0]) * self.size
+        for k, t, c, r, e in self.sparse.rows():
+            i = k % self.size
+            self.keys[i] = k
+            self.tokens[i], self.cost[i], self.requests[i], self.errors[i] = t, c, r, e
+        self.sparse = None
+
+    def _lookup(self, key: int) -> tuple[float, float, float, float] | None:
+        if self.sparse is not None:
+            return self.sparse.get(key)
+        i = key % self.size
+        if self.keys[i] != key:
+            return None
+        return self.tokens[i], self.cost[i], self.requests[i], self.errors[i]
+
+    def items(self) -> list[tuple[int, _UsageBucket]]:
+        if self.sparse is not None:
+            return [(k, _UsageBucket(t, c, r, e)) for k, t, c, r, e in self.sparse.rows()]
+        out = []
+        for i, k in enumerate(self.keys or ()):
+            if k >= 0:
+                out.append((k, _UsageBucket(self.tokens[i], self.cost[i], self.requests[i], self.errors[i])))
+        out.sort(key=lambda it: it[0])
+        return out
+
+    def get(self, key: int) -> _UsageBucket | None:
+        vals = self._lookup(key)
+        return _UsageBucket(*vals) if vals is not None else None
+
+    def __len__(self) -> int:
+        if self.sparse is not None:
+            return len(self.sparse)
+        return sum(1 for k in self.keys or () if k >= 0)
+
+    def _slot_bucket(self, key: int, acc: _UsageBucket, sign: float) -> None:
+        vals = self._lookup(key)
+        if vals is not None:
+            acc.tokens += sign * vals[0]
+            acc.costUSD += sign * vals[1]
+            acc.requests += sign * vals[2]
+            acc.errors += sign * vals[3]
+
+    def rolling(self, span: int, end_key: int) -> _UsageBucket:
+        # Totals for the `span` periods ending at end_key. The first call for a span sums it once;
+        # afterwards add() keeps it current and sliding forward only touches periods entering/leaving.
+        span = min(span, self.size)
+        state = self._rolling.get(span)
+        if state is None or end_key < state[0] or end_key - state[0] >= span:
+            acc = _UsageBucket()
+            for k in range(end_key - span + 1, end_key + 1):
+                self._slot_bucket(k, acc, 1.0)
+        else:
+            prev_end, acc = state
+            for k in range(prev_end + 1, end_key + 1):
+                self._slot_bucket(k - span, acc, -1.0)
+                self._slot_bucket(k, acc, 1.0)
+        if acc.requests < 0.5:
+            acc = _UsageBucket()  # drop float residue once the window empties
+        self._rolling[span] = (end_key, acc)
+        return _UsageBucket(acc.tokens, acc.costUSD, acc.requests, acc.errors)
+
+    def sums(self, ranges: list[tuple[int, int]]) -> list[_UsageBucket]:
+        # Totals for several inclusive ranges, clamped to the periods the ring retains (the latest
+        # end and `size` periods back). Each slot in a range is read once; ranges are disjoint days.
+        out: list[_UsageBucket] = []
+        if not ranges:
+            return out
+        base = max(end for _, end in ranges) - self.size + 1
+        for start_key, end_key in ranges:
+            acc = _UsageBucket()
+            for k in range(max(start_key, base), end_key + 1):
+                self._slot_bucket(k, acc, 1.0)
+            out.append(acc if acc.requests >= 0.5 else _UsageBucket())  # no residue from retractions
+        return out
+
 
 @dataclass
 class _UsageAgg:
     allTime: _UsageBucket = field(default_factory=_UsageBucket)
     byProvider: dict[str, dict[str, object]] = field(default_factory=dict)
-    daily: dict[str, _UsageBucket] = field(default_factory=dict)  # tz date -> bucket
-    perMinuteUTC: dict[int, _UsageBucket] = field(default_factory=dict)  # epoch minute -> bucket
-    perHourUTC: dict[int, _UsageBucket] = field(default_factory=dict)  # epoch hour -> bucket
+    perMinuteUTC: _UsageRing = field(default_factory=lambda: _UsageRing(_MINUTE_SLOTS))  # epoch minute
+    # Epoch quarter-hour. Nothing here depends on a timezone: every UTC offset in use is a multiple of
+    # 15 minutes, so local days for any ZoneInfo are exact unions of these bins (see _build_output).
+    perQuarterUTC: _UsageRing = field(default_factory=lambda: _UsageRing(_QUARTER_SLOTS))
     lastActivityAt: _dt.datetime | None = None
     lastErrorAt: _dt.datetime | None = None
     lastErrorMsg: str = ""
+    version: int = 0  # bumped on every change; keys memoized output
 
     def reset(self) -> None:
         self.allTime = _UsageBucket()
         self.byProvider = {}
-        self.daily = {}
-        self.perMinuteUTC = {}
-        self.perHourUTC = {}
+        self.perMinuteUTC = _UsageRing(_MINUTE_SLOTS)
+        self.perQuarterUTC = _UsageRing(_QUARTER_SLOTS)
         self.lastActivityAt = None
         self.lastErrorAt = None
         self.lastErrorMsg = ""
+        self.version += 1
+
+    def add_file(self, fu: _FileUsage, sign: float = 1.0) -> None:
+        # Apply (sign=1) or retract (sign=-1) one transcript's contribution. Buckets that drop back
+        # to zero requests are removed so a retraction leaves no float residue behind.
+        self.allTime.merge(fu.allTime, sign)
+        if self.allTime.requests < 0.5:
+            self.allTime = _UsageBucket()
+
+        for provider, models in fu.byProvider.items():
+            prov = self.byProvider.get(provider)
+            if not prov:
+                prov = {
+                    "tokens": 0.0,
+                    "costUSD": 0.0,
+                    "requests": 0.0,
+                    "errors": 0.0,
+                    "models": {},
+                }
+                self.byProvider[provider] = prov
+            pmodels = prov.get("models")
+            if not isinstance(pmodels, dict):
+                pmodels = {}
+                prov["models"] = pmodels
+            for model, b in models.items():
+                m = pmodels.get(model)
+                if not m:
+                    m = {"tokens": 0.0, "costUSD": 0.0, "requests": 0.0, "errors": 0.0}
+                    pmodels[model] = m
+                for k, v in zip(("tokens", "costUSD", "requests", "errors"), b.to_list()):
+                    prov[k] = float(prov.get(k, 0.0)) + sign * v
+                    m[k] = float(m.get(k, 0.0)) + sign * v
+                if m["requests"] < 0.5:
+                    del pmodels[model]
+            if float(prov.get("requests", 0.0)) < 0.5:
+                del self.byProvider[provider]
+
+        for k, t, c, r, e in fu.minutes.rows():
+            self.perMinuteUTC.add(k, sign * t, sign * c, sign * r, sign * e)
+        for k, t, c, r, e in fu.quarters.rows():
+            self.perQuarterUTC.add(k, sign * t, sign * c, sign * r, sign * e)
+
+        if sign > 0:
+            self.note_last(fu)
+        self.version += 1
+
+    def note_last(self, fu: _FileUsage) -> None:
+        if fu.lastActivityAt and (not self.lastActivityAt or fu.lastActivityAt > self.lastActivityAt):
+            self.lastActivityAt = fu.lastActivityAt
+        if fu.lastErrorAt and (not self.lastErrorAt or fu.lastErrorAt >= self.lastErrorAt):
+            self.lastErrorAt = fu.lastErrorAt
+            self.lastErrorMsg = fu.lastErrorMsg
+
+
+@dataclass
+class _FileUsage:
+    # One transcript's share of a _UsageAgg. Kept per file so that a deleted, rotated or truncated
+    # session can be retracted from the aggregate without rescanning every other transcript.
+    allTime: _UsageBucket = field(default_factory=_UsageBucket)
+    byProvider: dict[str, dict[str, _UsageBucket]] = field(default_factory=dict)  # provider -> model
+    minutes: _UsageBins = field(default_factory=_UsageBins)  # by epoch minute
+    quarters: _UsageBins = field(default_factory=_UsageBins)  # by epoch quarter-hour
+    # (epoch hour, provider, model) rollups of freshly read events, drained into the history store;
+    # not merged into the running contribution or checkpointed.
+    hourlyByModel: dict[tuple[int, str, str], _UsageBucket] = field(default_factory=dict)
+    lastActivityAt: _dt.datetime | None = None
+    lastErrorAt: _dt.datetime | None = None
+    lastErrorMsg: str = ""
 
     def add_event(
         self,
         ts: _dt.datetime,
-        tz: ZoneInfo,
         *,
         tokens: float,
         cost_usd: float,
@@ -625,71 +1880,352 @@ class _UsageAgg:
             self.lastErrorAt = ts
             self.lastErrorMsg = error_text or "error"
 
-        prov = self.byProvider.get(provider)
-        if not prov:
-            prov = {
-                "tokens": 0.0,
-                "costUSD": 0.0,
-                "requests": 0.0,
-                "errors": 0.0,
-                "models": {},
-            }
-            self.byProvider[provider] = prov
+        self.byProvider.setdefault(provider, {}).setdefault(model, _UsageBucket()).add(tokens, cost_usd, is_error)
 
-        prov["tokens"] = float(prov.get("tokens", 0.0)) + float(tokens)
-        prov["costUSD"] = float(prov.get("costUSD", 0.0)) + float(cost_usd)
-        prov["requests"] = float(prov.get("requests", 0.0)) + 1.0
-        if is_error:
-            prov["errors"] = float(prov.get("errors", 0.0)) + 1.0
+        errors = 1.0 if is_error else 0.0
+        self.minutes.add(int(ts.timestamp() // 60), tokens, cost_usd, 1.0, errors)
+        self.quarters.add(int(ts.timestamp() // 900), tokens, cost_usd, 1.0, errors)
+
+        hour = int(ts.timestamp() // 3600)
+        self.hourlyByModel.setdefault((hour, provider, model), _UsageBucket()).add(tokens, cost_usd, is_error)
+
+    def merge(self, other: _FileUsage) -> None:
+        # Fold a freshly read tail of the same file into its running contribution.
+        self.allTime.merge(other.allTime)
+        for provider, models in other.byProvider.items():
+            mine = self.byProvider.setdefault(provider, {})
+            for model, b in models.items():
+                mine.setdefault(model, _UsageBucket()).merge(b)
+        self.minutes.merge(other.minutes)
+        self.quarters.merge(other.quarters)
+        if other.lastActivityAt and (not self.lastActivityAt or other.lastActivityAt > self.lastActivityAt):
+            self.lastActivityAt = other.lastActivityAt
+        if other.lastErrorAt and (not self.lastErrorAt or other.lastErrorAt >= self.lastErrorAt):
+            self.lastErrorAt = other.lastErrorAt
+            self.lastErrorMsg = other.lastErrorMsg
+
+    def prune(self, now: _dt.datetime) -> None:
+        # Same horizons as the _UsageAgg rings (~25h of minutes, ~62d of quarter-hours): the rings
+        # never read periods that old, so retracting them later has nothing to undo.
+        self.minutes.prune(int(now.timestamp() // 60) - _MINUTE_SLOTS)
+        self.quarters.prune(int(now.timestamp() // 900) - _QUARTER_SLOTS)
+
+    def to_state(self) -> dict[str, object]:
+        return {
+            "allTime": self.allTime.to_list(),
+            "byProvider": {
+                p: {m: b.to_list() for m, b in models.items()} for p, models in self.byProvider.items()
+            },
+            "minutes": self.minutes.to_state(),
+            "quarters": self.quarters.to_state(),
+            "lastActivityAt": self.lastActivityAt.isoformat() if self.lastActivityAt else None,
+            "lastErrorAt": self.lastErrorAt.isoformat() if self.lastErrorAt else None,
+            "lastErrorMsg": self.lastErrorMsg,
+        }
 
-        models = prov.get("models")
-        if not isinstance(models, dict):
-            models = {}
-            prov["models"] = models
+    @classmethod
+    def from_state(cls, raw: dict[str, object]) -> _FileUsage:
+        def _buckets(v: object) -> dict[str, _UsageBucket]:
+            return {str(k): _UsageBucket.from_list(b) for k, b in v.items()} if isinstance(v, dict) else {}
+
+        by_provider = raw.get("byProvider")
+        return cls(
+            allTime=_UsageBucket.from_list(raw.get("allTime")),
+            byProvider={str(p): _buckets(m) for p, m in by_provider.items()} if isinstance(by_provider, dict) else {},
+            minutes=_UsageBins.from_state(raw.get("minutes")),
+            quarters=_UsageBins.from_state(raw.get("quarters")),
+            lastActivityAt=_parse_iso(str(raw.get("lastActivityAt") or "")),
+            lastErrorAt=_parse_iso(str(raw.get("lastErrorAt") or "")),
+            lastErrorMsg=str(raw.get("lastErrorMsg") or ""),
+        )
 
-        m = models.get(model)
-        if not m:
-            m = {"tokens": 0.0, "costUSD": 0.0, "requests": 0.0, "errors": 0.0}
-            models[model] = m
-        m["tokens"] = float(m.get("tokens", 0.0)) + float(tokens)
-        m["costUSD"] = float(m.get("costUSD", 0.0)) + float(cost_usd)
-        m["requests"] = float(m.get("requests", 0.0)) + 1.0
-        if is_error:
-            m["errors"] = float(m.get("errors", 0.0)) + 1.0
 
-        day = ts.astimezone(tz).date().isoformat()
-        self.daily.setdefault(day, _UsageBucket()).add(tokens, cost_usd, is_error)
+def _json_loads_line(raw: bytes) -> object:
+    # Fast path straight from bytes (orjson when installed). Anything it rejects (invalid UTF-8,
+    # NaN literals, huge ints, odd whitespace) goes through the original decode+strip+json.loads path,
+    # so results match the stdlib-only parser exactly.
+    try:
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except Exception:  # noqa: BLE001
+        return json.loads(raw.decode("utf-8", errors="replace").strip())
+
+
+_MMAP_MIN_BYTES = 1024 * 1024  # appended regions at least this large are mapped rather than read
+
+
+def _ingest_session_file(fp: Path, start_pos: int, out: _FileUsage, end_pos: int | None = None) -> int:
+    # Feed assistant usage records from fp (starting at start_pos, up to end_pos) into out; returns
+    # the new cursor, which always sits just after a newline: a trailing line still being written is
+    # left for the next pass instead of being parsed half-done and skipped forever.
+    with fp.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if end_pos is not None:
+            size = min(size, end_pos)
+        if size <= start_pos:
+            return start_pos
+        if size - start_pos < _MMAP_MIN_BYTES:
+            f.seek(start_pos)
+            buf = f.read(size - start_pos)
+            return start_pos + _ingest_session_lines(buf, 0, len(buf), out)
+        # Transcripts are append-only, so mapping up to the size seen at open is safe; the mapping
+        # offset has to be aligned to the allocation granularity.
+        base = start_pos - (start_pos % mmap.ALLOCATIONGRANULARITY)
+        with mmap.mmap(f.fileno(), size - base, access=mmap.ACCESS_READ, offset=base) as mm:
+            return base + _ingest_session_lines(mm, start_pos - base, size - base, out)
+
+
+def _ingest_session_lines(buf: bytes | mmap.mmap, pos: int, end: int, out: _FileUsage) -> int:
+    # Walk newline offsets in buf[pos:end]; returns the offset just past the last complete line.
+    while pos < end:
+        nl = buf.find(b"\n", pos, end)
+        if nl < 0:
+            break
+        start, pos = pos, nl + 1
+        # Pre-filter on raw bytes: only assistant messages with usage can contribute, and tool
+        # results / user turns (most of the bytes) are never copied out of the buffer.
+        if buf.find(b'"usage"', start, nl) < 0 or buf.find(b'"assistant"', start, nl) < 0:
+            continue
+        raw_line = buf[start:nl]
+        try:
+            rec = _json_loads_line(raw_line)
+        except Exception:  # noqa: BLE001
+            continue
+        if not isinstance(rec, dict) or rec.get("type") != "message":
+            continue
+        msg = rec.get("message") or {}
+        if msg.get("role") != "assistant":
+            continue
+        usage = msg.get("usage") or rec.get("usage") or {}
+        if not isinstance(usage, dict) or not usage:
+            continue
+
+        ts = _parse_iso(rec.get("timestamp"))
+        if not ts:
+            continue
 
-        minute = int(ts.timestamp() // 60)
-        self.perMinuteUTC.setdefault(minute, _UsageBucket()).add(tokens, cost_usd, is_error)
+        tokens = _safe_float(usage.get("totalTokens"), 0.0)
+        if tokens <= 0:
+            tokens = (
+                _safe_float(usage.get("input"), 0.0)
+                + _safe_float(usage.get("output"), 0.0)
+                + _safe_float(usage.get("cacheRead"), 0.0)
+                + _safe_float(usage.get("cacheWrite"), 0.0)
+            )
 
-        hour = int(ts.timestamp() // 3600)
-        self.perHourUTC.setdefault(hour, _UsageBucket()).add(tokens, cost_usd, is_error)
+        cost_obj = usage.get("cost") or {}
+        cost_total = _safe_float(cost_obj.get("total"), 0.0) if isinstance(cost_obj, dict) else 0.0
+
+        stop_reason = str(msg.get("stopReason") or rec.get("stopReason") or "").strip().lower()
+        error_message = str(msg.get("errorMessage") or rec.get("errorMessage") or "").strip()
+        is_error = stop_reason == "error" or bool(error_message)
+
+        provider = str(msg.get("provider") or rec.get("provider") or "unknown").strip() or "unknown"
+        model = str(
+            msg.get("model")
+            or msg.get("modelId")
+            or rec.get("model")
+            or rec.get("modelId")
+            or "unknown"
+        ).strip() or "unknown"
+
+        error_text = error_message or stop_reason or "error"
+        out.add_event(
+            ts,
+            tokens=tokens,
+            cost_usd=cost_total,
+            is_error=is_error,
+            provider=provider,
+            model=model,
+            error_text=error_text,
+        )
+    return pos
 
-    def prune(self, now: _dt.datetime, tz: ZoneInfo) -> None:
-        # Keep per-minute bins for ~25h, per-hour bins for ~31d.
-        now_min = int(now.timestamp() // 60)
-        min_cut = now_min - (25 * 60)
-        if self.perMinuteUTC:
-            for k in [k for k in self.perMinuteUTC.keys() if k < min_cut]:
-                del self.perMinuteUTC[k]
 
-        now_hr = int(now.timestamp() // 3600)
-        hr_cut = now_hr - (31 * 24)
-        if self.perHourUTC:
-            for k in [k for k in self.perHourUTC.keys() if k < hr_cut]:
-                del self.perHourUTC[k]
-
-        # Keep daily buckets for ~60d to bound memory.
-        today = now.astimezone(tz).date()
-        day_cut = today - _dt.timedelta(days=60)
-        if self.daily:
-            for k in list(self.daily.keys()):
-                try:
-                    if _dt.date.fromisoformat(k) < day_cut:
-                        del self.daily[k]
-                except Exception:  # noqa: BLE001
+def _scan_session_shard(paths: list[str]) -> dict[str, tuple[int, int, int, _FileUsage]]:
+    # Process-pool worker for cold scans: parse whole files into per-file contributions.
+    now = _utcnow()
+    out: dict[str, tuple[int, int, int, _FileUsage]] = {}
+    for path in paths:
+        fp = Path(path)
+        usage = _FileUsage()
+        try:
+            st = fp.stat()
+            end_pos = _ingest_session_file(fp, 0, usage)
+        except FileNotFoundError:
+            continue
+        usage.prune(now)
+        out[path] = (int(st.st_dev), int(st.st_ino), end_pos, usage)
+    return out
+
+
+@dataclass
+class _UsageScanSettings:
+    workers: int = 0  # 0 = CPUs available to this process
+    parallel_min_bytes: int = 64 * 1024 * 1024
+    inotify: bool = True  # watch sessions dirs instead of globbing on every refresh (Linux only)
+
+
+_USAGE_SCAN = _UsageScanSettings()
+
+
+def _configure_usage_scan(cfg: dict[str, object]) -> None:
+    raw = cfg.get("usageScan")
+    if raw is None:
+        raw = {}
+    if not isinstance(raw, dict):
+        raise ValueError("config.usageScan must be an object")
+    global _USAGE_SCAN
+    _USAGE_SCAN = _UsageScanSettings(
+        workers=max(0, _safe_int(raw.get("workers"), 0)),
+        parallel_min_bytes=max(0, _safe_int(raw.get("parallelMinBytes"), 64 * 1024 * 1024)),
+        inotify=bool(raw.get("inotify", True)),
+    )
+
+
+def _usable_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+def _parallel_cold_scan(files: list[tuple[str, int]]) -> dict[str, tuple[int, int, int, _FileUsage]] | None:
+    # Shard files (balanced by size) across a process pool so cold-start json.loads work scales with
+    # cores instead of being serialized behind the GIL. None means "not worth it / failed": scan serially.
+    workers = _USAGE_SCAN.workers or _usable_cpus()
+    workers = min(workers, len(files))
+    total = sum(size for _, size in files)
+    if workers < 2 or total < _USAGE_SCAN.parallel_min_bytes:
+        return None
+
+    shards: list[list[str]] = [[] for _ in range(workers)]
+    loads = [0] * workers
+    for path, size in sorted(files, key=lambda it: it[1], reverse=True):
+        i = loads.index(min(loads))
+        shards[i].append(path)
+        loads[i] += size
+
+    out: dict[str, tuple[int, int, int, _FileUsage]] = {}
+    try:
+        # spawn, not fork: the server is multi-threaded and forking with held locks isn't safe.
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            for part in pool.map(_scan_session_shard, shards):
+                out.update(part)
+    except Exception:  # noqa: BLE001
+        return None
+    return out
+
+
+_IN_MODIFY = 0x2
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_FROM = 0x40
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = os.O_CLOEXEC
+_INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (+ NUL-padded name)
+
+
+class _InotifyWatcher:
+    # Watches <state_dir>/agents, each agent dir and each sessions dir, and reports which session
+    # transcripts changed so a refresh can stat/read just those. drain() returns None whenever the
+    # tree itself changed (new agent/sessions dir, queue overflow, a watched dir went away) and the
+    # caller has to fall back to a full glob; watches are re-armed before that scan so nothing is missed.
+    _DIR_MASK = _IN_CREATE | _IN_MOVED_TO | _IN_MOVED_FROM | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR
+    _SESSIONS_MASK = _DIR_MASK | _IN_MODIFY | _IN_CLOSE_WRITE
+
+    def __init__(self, state_dir: Path) -> None:
+        self.state_dir = state_dir
+        self.wds: dict[int, Path] = {}
+        self.sessions_wds: set[int] = set()
+        self.need_rescan = True
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.fd = fd
+
+    @classmethod
+    def create(cls, state_dir: Path) -> _InotifyWatcher | None:
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            return cls(state_dir)
+        except (OSError, AttributeError):
+            return None
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def _watch(self, path: Path, mask: int) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(path)), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (2, 20):  # ENOENT/ENOTDIR: raced with removal, the next rescan picks it up
+                return -1
+            raise OSError(err, f"inotify_add_watch failed for {path}")
+        self.wds[wd] = path
+        return wd
+
+    def _arm(self) -> None:
+        agents = self.state_dir / "agents"
+        self._watch(self.state_dir, _IN_CREATE | _IN_MOVED_TO | _IN_ONLYDIR)
+        if not agents.is_dir():
+            return
+        self._watch(agents, self._DIR_MASK)
+        for agent in agents.iterdir():
+            if not agent.is_dir():
+                continue
+            self._watch(agent, self._DIR_MASK)
+            sessions = agent / "sessions"
+            if sessions.is_dir():
+                self.sessions_wds.add(self._watch(sessions, self._SESSIONS_MASK))
+
+    def drain(self) -> set[str] | None:
+        """Return changed session file paths since the last call, or None if a full scan is needed."""
+        dirty: set[str] = set()
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not buf:
+                break
+            off = 0
+            while off + _INOTIFY_EVENT.size <= len(buf):
+                wd, mask, _cookie, name_len = _INOTIFY_EVENT.unpack_from(buf, off)
+                off += _INOTIFY_EVENT.size
+                name = buf[off : off + name_len].rstrip(b"\0")
+                off += name_len
+                if mask & (_IN_Q_OVERFLOW | _IN_IGNORED | _IN_DELETE_SELF | _IN_MOVE_SELF):
+                    self.need_rescan = True
                     continue
+                base = self.wds.get(wd)
+                if base is None:
+                    continue
+                if wd in self.sessions_wds:
+                    if not mask & _IN_ISDIR and name.endswith(b".jsonl"):
+                        dirty.add(str(base / os.fsdecode(name)))
+                elif mask & _IN_ISDIR and (base == self.state_dir / "agents" or name in (b"agents", b"sessions")):
+                    self.need_rescan = True  # an agent or sessions dir appeared/vanished
+        if self.need_rescan:
+            self.wds.clear()
+            self.sessions_wds.clear()
+            self._arm()
+            self.need_rescan = False
+            return None
+        return dirty
 
 
 @dataclass
@@ -702,169 +2238,360 @@ class _SessionCursor:
 @dataclass
 class _UsageCacheEntry:
     state_dir: Path
-    tz_key: str
     lock: threading.Lock = field(default_factory=threading.Lock)
     cursors: dict[str, _SessionCursor] = field(default_factory=dict)  # path -> cursor
+    files: dict[str, _FileUsage] = field(default_factory=dict)  # path -> its share of agg
     agg: _UsageAgg = field(default_factory=_UsageAgg)
     last_refresh_mono: float = 0.0
     sessions_files: int = 0
     sessions_bytes: int = 0
+    checkpoint_checked: bool = False
+    dirty: bool = False  # cursors/agg changed since the last checkpoint
+    last_checkpoint_mono: float = 0.0
+    file_sizes: dict[str, int] = field(default_factory=dict)  # path -> size at last stat
+    watcher: _InotifyWatcher | None = None
+    watch_failed: bool = False
+    outputs: dict[str, tuple[tuple[object, ...], dict[str, object]]] = field(default_factory=dict)  # tz -> memo
+    history_pending: dict[tuple[str, int, str, str], _UsageBucket] = field(default_factory=dict)
+    history_resets: set[str] = field(default_factory=set)  # paths re-read from 0 since the last flush
+    history_cursors: dict[str, _SessionCursor] = field(default_factory=dict)  # stored rows end here
+    scanning: bool = False  # a background refresh has been started and hasn't finished
+    pruned_min: int = 0  # epoch minute quiet files' bins were last aged out
+
+    def _retract(self, path: str) -> None:
+        # Drop one transcript (deleted, replaced or truncated) and subtract what it contributed.
+        self.cursors.pop(path, None)
+        usage = self.files.pop(path, None)
+        if usage is None:
+            return
+        self.agg.add_file(usage, -1.0)
+        # Latest activity/error can't be subtracted; take them from the files that remain.
+        self.agg.lastActivityAt = None
+        self.agg.lastErrorAt = None
+        self.agg.lastErrorMsg = ""
+        for other in self.files.values():
+            self.agg.note_last(other)
+        self.dirty = True
+
+    def _cold_scan(self, sessions: list[Path]) -> None:
+        files: list[tuple[str, int]] = []
+        for fp in sessions:
+            try:
+                files.append((str(fp), int(fp.stat().st_size)))
+            except FileNotFoundError:
+                continue
+        result = _parallel_cold_scan(files)
+        if result is None:
+            return
+        for path, (dev, ino, pos, usage) in result.items():
+            self._note_history(path, usage, from_start=True)
+            self.agg.add_file(usage)
+            self.files[path] = usage
+            self.cursors[path] = _SessionCursor(dev=dev, ino=ino, pos=pos)
+        self.dirty = True
+
+    def _incremental_refresh(self) -> None:
+        dirty = self._watched_changes()
+        if dirty is None:
+            return self._scan_all()
 
-    def _full_rebuild(self, tz: ZoneInfo) -> None:
-        self.cursors = {}
-        self.agg.reset()
-        self._incremental_refresh(tz, allow_rebuild=False)
+        now = _utcnow()
+        for path in sorted(dirty, key=lambda p: Path(p).name):
+            self._refresh_session(Path(path), now)
+        self.sessions_files = len(self.file_sizes)
+        self.sessions_bytes = int(sum(self.file_sizes.values()))
+
+    def _watched_changes(self) -> set[str] | None:
+        # Paths touched since the last refresh per inotify, or None when a full glob is required
+        # (watching disabled/unavailable, first scan, or the directory tree changed).
+        if not _USAGE_SCAN.inotify or self.watch_failed:
+            return None
+        if self.watcher is None:
+            self.watcher = _InotifyWatcher.create(self.state_dir)
+            if self.watcher is None:
+                self.watch_failed = True
+                return None
+        try:
+            return self.watcher.drain()
+        except OSError:
+            # e.g. fs.inotify.max_user_watches exhausted: stay on the glob path from now on.
+            self.watcher.close()
+            self.watcher = None
+            self.watch_failed = True
+            return None
 
-    def _incremental_refresh(self, tz: ZoneInfo, *, allow_rebuild: bool) -> None:
+    def _scan_all(self) -> None:
         sessions = list(self.state_dir.glob("agents/*/sessions/*.jsonl"))
         sessions.sort(key=lambda p: p.name)
 
         session_paths = {str(p) for p in sessions}
-        if allow_rebuild and self.cursors and any(p not in session_paths for p in self.cursors.keys()):
-            return self._full_rebuild(tz)
+        for path in [p for p in self.cursors if p not in session_paths]:
+            self._retract(path)
 
-        total_bytes = 0
         now = _utcnow()
 
+        if not self.cursors and len(sessions) > 1:
+            self._cold_scan(sessions)
+
+        self.file_sizes = {}
         for fp in sessions:
-            path = str(fp)
-            try:
-                st = fp.stat()
-            except FileNotFoundError:
-                if allow_rebuild:
-                    return self._full_rebuild(tz)
-                continue
+            self._refresh_session(fp, now)
 
-            total_bytes += int(st.st_size)
-
-            dev = int(getattr(st, "st_dev", 0))
-            ino = int(getattr(st, "st_ino", 0))
-            size = int(st.st_size)
-
-            cur = self.cursors.get(path)
-            if cur and (cur.dev != dev or cur.ino != ino or size < cur.pos):
-                if allow_rebuild:
-                    return self._full_rebuild(tz)
-                cur = None
-
-            start_pos = cur.pos if cur else 0
-            if size == start_pos:
-                if not cur:
-                    self.cursors[path] = _SessionCursor(dev=dev, ino=ino, pos=start_pos)
-                continue
+        self.sessions_files = len(self.file_sizes)
+        self.sessions_bytes = int(sum(self.file_sizes.values()))
 
+    def _refresh_session(self, fp: Path, now: _dt.datetime) -> None:
+        # Read whatever was appended to one transcript. If its history changed underneath us
+        # (deleted, replaced or truncated) only that file's contribution is retracted and re-read.
+        path = str(fp)
+        try:
+            st = fp.stat()
+        except FileNotFoundError:
+            self.file_sizes.pop(path, None)
+            self._retract(path)
+            return
+
+        dev = int(getattr(st, "st_dev", 0))
+        ino = int(getattr(st, "st_ino", 0))
+        size = int(st.st_size)
+        self.file_sizes[path] = size
+
+        cur = self.cursors.get(path)
+        if cur and (cur.dev != dev or cur.ino != ino or size < cur.pos):
+            self._retract(path)
+            cur = None
+
+        start_pos = cur.pos if cur else 0
+        if size == start_pos:
+            if not cur:
+                self.cursors[path] = _SessionCursor(dev=dev, ino=ino, pos=start_pos)
+                self.files.setdefault(path, _FileUsage())
+                self.dirty = True
+            return
+
+        seen = self.history_cursors.pop(path, None)
+        delta = _FileUsage()
+        try:
+            if seen and start_pos and (seen.dev, seen.ino) == (dev, ino) and start_pos < seen.pos <= size:
+                # The history store committed past the checkpoint we resumed from (we stopped between
+                # the two writes): that region is already in its rollups, so only the aggregate gets it.
+                start_pos = _ingest_session_file(fp, start_pos, delta, seen.pos)
+                delta.hourlyByModel = {}
+            end_pos = _ingest_session_file(fp, start_pos, delta)
+        except FileNotFoundError:
+            self.file_sizes.pop(path, None)
+            self._retract(path)
+            return
+
+        self._note_history(path, delta, from_start=cur is None)
+        delta.prune(now)
+        self.agg.add_file(delta)
+        usage = self.files.get(path)
+        if usage is None:
+            self.files[path] = delta
+        else:
+            usage.merge(delta)
+            usage.prune(now)
+        self.cursors[path] = _SessionCursor(dev=dev, ino=ino, pos=end_pos)
+        self.dirty = True
+
+    def _note_history(self, path: str, usage: _FileUsage, *, from_start: bool) -> None:
+        # Queue a freshly read region's hourly rollups for the history store. A file read from the
+        # start replaces whatever the store holds for it (cold start without a checkpoint, truncation,
+        # replacement); rows of files that were deleted are kept, which is the point of the store.
+        rollups, usage.hourlyByModel = usage.hourlyByModel, {}
+        if _USAGE_HISTORY.dir is None:
+            return
+        if from_start:
+            self.history_resets.add(path)
+            for k in [k for k in self.history_pending if k[0] == path]:
+                del self.history_pending[k]
+        for (hour, provider, model), b in rollups.items():
+            self.history_pending.setdefault((path, hour, provider, model), _UsageBucket()).merge(b)
+
+    def _flush_history(self) -> bool:
+        # Rows go in with the cursor each file has been read up to, in one transaction, so a restart
+        # from an older checkpoint can tell which re-read bytes the store already counted.
+        if not self.history_pending and not self.history_resets:
+            return True
+        store = _usage_history_store(self.state_dir)
+        if store is not None:
+            paths = {k[0] for k in self.history_pending} | self.history_resets
+            cursors = {p: self.cursors[p] for p in paths if p in self.cursors}
             try:
-                with fp.open("rb") as f:
-                    if start_pos > 0:
-                        f.seek(start_pos)
-                    for raw_line in f:
-                        line = raw_line.decode("utf-8", errors="replace").strip()
-                        if not line:
-                            continue
-                        try:
-                            rec = json.loads(line)
-                        except Exception:  # noqa: BLE001
-                            continue
-                        if rec.get("type") != "message":
-                            continue
-                        msg = rec.get("message") or {}
-                        if msg.get("role") != "assistant":
-                            continue
-                        usage = msg.get("usage") or rec.get("usage") or {}
-                        if not isinstance(usage, dict) or not usage:
-                            continue
-
-                        ts = _parse_iso(rec.get("timestamp"))
-                        if not ts:
-                            continue
-
-                        tokens = _safe_float(usage.get("totalTokens"), 0.0)
-                        if tokens <= 0:
-                            tokens = (
-                                _safe_float(usage.get("input"), 0.0)
-                                + _safe_float(usage.get("output"), 0.0)
-                                + _safe_float(usage.get("cacheRead"), 0.0)
-                                + _safe_float(usage.get("cacheWrite"), 0.0)
-                            )
-
-                        cost_obj = usage.get("cost") or {}
-                        cost_total = _safe_float(cost_obj.get("total"), 0.0) if isinstance(cost_obj, dict) else 0.0
-
-                        stop_reason = str(msg.get("stopReason") or rec.get("stopReason") or "").strip().lower()
-                        error_message = str(msg.get("errorMessage") or rec.get("errorMessage") or "").strip()
-                        is_error = stop_reason == "error" or bool(error_message)
-
-                        provider = str(msg.get("provider") or rec.get("provider") or "unknown").strip() or "unknown"
-                        model = str(
-                            msg.get("model")
-                            or msg.get("modelId")
-                            or rec.get("model")
-                            or rec.get("modelId")
-                            or "unknown"
-                        ).strip() or "unknown"
-
-                        error_text = error_message or stop_reason or "error"
-                        self.agg.add_event(
-                            ts,
-                            tz,
-                            tokens=tokens,
-                            cost_usd=cost_total,
-                            is_error=is_error,
-                            provider=provider,
-                            model=model,
-                            error_text=error_text,
-                        )
-                    end_pos = int(f.tell())
-            except FileNotFoundError:
-                if allow_rebuild:
-                    return self._full_rebuild(tz)
-                continue
-
-            self.cursors[path] = _SessionCursor(dev=dev, ino=ino, pos=end_pos)
-
-        self.sessions_files = len(sessions)
-        self.sessions_bytes = int(total_bytes)
-        self.agg.prune(now, tz)
+                store.write(self.history_resets, self.history_pending, cursors)
+            except sqlite3.Error:
+                return False  # keep the backlog and retry on the next flush
+        self.history_pending = {}
+        self.history_resets = set()
+        return True
+
+    def persist(self) -> None:
+        # The checkpoint never runs ahead of the history store: if the rows can't be written, the
+        # cursors stay where they were and the backlog is retried next time.
+        if self._flush_history():
+            self._save_checkpoint()
 
     def get_usage(self, tz: ZoneInfo) -> dict[str, object]:
-        # Avoid multiple expensive refreshes in bursts (e.g., several clients opening at once).
         with self.lock:
-            now_mono = time.monotonic()
-            if self.last_refresh_mono and (now_mono - self.last_refresh_mono) < 1.0:
-                return self._build_output(tz)
+            return self._refresh_locked(tz)
+
+    def get_usage_nowait(self, tz: ZoneInfo) -> dict[str, object] | None:
+        # Status collection runs under collector.unitTimeoutSeconds, which a cold scan (or catching up
+        # from a checkpoint) can easily exceed. That first refresh runs on its own thread instead, and
+        # while any refresh holds the lock the last output is returned rather than waiting for it.
+        if not self.lock.acquire(blocking=False):
+            return self._last_output(tz)
+        try:
+            if self.last_refresh_mono:
+                return self._refresh_locked(tz)  # warm: only what changed since the last refresh
+            if not self.scanning:
+                self.scanning = True
+                threading.Thread(target=self._background_refresh, args=(tz,), name="usage-scan", daemon=True).start()
+            return None
+        finally:
+            self.lock.release()
+
+    def _background_refresh(self, tz: ZoneInfo) -> None:
+        try:
+            self.get_usage(tz)
+        finally:
+            self.scanning = False  # on failure, the next collection starts another
+
+    def _last_output(self, tz: ZoneInfo) -> dict[str, object] | None:
+        memo = self.outputs.get(tz.key)
+        return memo[1] if memo is not None else None
 
-            self.last_refresh_mono = now_mono
-            self._incremental_refresh(tz, allow_rebuild=True)
+    def _refresh_locked(self, tz: ZoneInfo) -> dict[str, object]:
+        # Avoid multiple expensive refreshes in bursts (e.g., several clients opening at once).
+        now_mono = time.monotonic()
+        if self.last_refresh_mono and (now_mono - self.last_refresh_mono) < 1.0:
             return self._build_output(tz)
 
+        if not self.checkpoint_checked:
+            self.checkpoint_checked = True
+            self._load_checkpoint()
+
+        self.last_refresh_mono = now_mono
+        self._incremental_refresh()
+        now = _utcnow()
+        if int(now.timestamp() // 60) != self.pruned_min:
+            # Files that went quiet still age out of the minute/quarter horizons.
+            self.pruned_min = int(now.timestamp() // 60)
+            for usage in self.files.values():
+                usage.prune(now)
+        if self.dirty and (now_mono - self.last_checkpoint_mono) >= _USAGE_CHECKPOINT.interval_s:
+            self.persist()
+        return self._build_output(tz)
+
+    def _checkpoint_path(self) -> Path | None:
+        base = _USAGE_CHECKPOINT.dir
+        if base is None:
+            return None
+        digest = hashlib.blake2b(str(self.state_dir).encode("utf-8"), digest_size=8).hexdigest()
+        return base / f"usage-{digest}.json.gz"
+
+    def _load_checkpoint(self) -> None:
+        # Restore cursors + per-file contributions so a restart only parses bytes appended since the
+        # checkpoint. A file that vanished, changed identity or shrank is simply left out (and re-read
+        # from scratch if it still exists); the aggregate is the sum of the files that remain valid.
+        path = self._checkpoint_path()
+        if path is None:
+            return
+        try:
+            raw = json.loads(gzip.decompress(path.read_bytes()).decode("utf-8"))
+        except FileNotFoundError:
+            return
+        except Exception:  # noqa: BLE001
+            return
+        if not isinstance(raw, dict) or raw.get("v") != _USAGE_CHECKPOINT_VERSION:
+            return
+        if raw.get("stateDir") != str(self.state_dir):
+            return
+        files_raw = raw.get("files")
+        if not isinstance(files_raw, dict):
+            return
+        cursors: dict[str, _SessionCursor] = {}
+        files: dict[str, _FileUsage] = {}
+        for fp, cur in (raw.get("cursors") or {}).items():
+            usage_raw = files_raw.get(fp)
+            if not isinstance(cur, list) or len(cur) != 3 or not isinstance(usage_raw, dict):
+                continue
+            dev, ino, pos = (_safe_int(v, -1) for v in cur)
+            try:
+                st = os.stat(fp)
+            except OSError:
+                continue
+            if int(st.st_dev) != dev or int(st.st_ino) != ino or int(st.st_size) < pos:
+                continue
+            try:
+                usage = _FileUsage.from_state(usage_raw)
+            except Exception:  # noqa: BLE001
+                continue
+            cursors[str(fp)] = _SessionCursor(dev=dev, ino=ino, pos=pos)
+            files[str(fp)] = usage
+        agg = _UsageAgg()
+        for usage in files.values():
+            agg.add_file(usage)
+        self.cursors = cursors
+        self.files = files
+        self.agg = agg
+        self.last_checkpoint_mono = time.monotonic()
+        store = _usage_history_store(self.state_dir)
+        if store is not None:
+            try:
+                self.history_cursors = store.cursors()
+            except sqlite3.Error:
+                pass
+
+    def _save_checkpoint(self) -> None:
+        path = self._checkpoint_path()
+        if path is None:
+            return
+        now = _utcnow()
+        for usage in self.files.values():
+            usage.prune(now)  # files that went quiet still age out of the minute/hour horizons
+        data = {
+            "v": _USAGE_CHECKPOINT_VERSION,
+            "stateDir": str(self.state_dir),
+            "savedAt": now.isoformat().replace("+00:00", "Z"),
+            "cursors": {fp: [c.dev, c.ino, c.pos] for fp, c in self.cursors.items()},
+            "files": {fp: u.to_state() for fp, u in self.files.items()},
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=path.name + ".", dir=str(path.parent))
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(gzip.compress(_json_dumps(data).encode("utf-8"), compresslevel=1, mtime=0))
+                os.replace(tmp, path)
+            finally:
+                try:
+                    os.unlink(tmp)
+                except FileNotFoundError:
+                    pass
+        except OSError:
+            return  # checkpoints are best-effort; the transcripts remain the source of truth
+        self.dirty = False
+        self.last_checkpoint_mono = time.monotonic()
+
     def _build_output(self, tz: ZoneInfo) -> dict[str, object]:
+        # Everything below only changes when events land or the minute rolls over (windows, and the
+        # daily30d dates at midnight), so reuse the previous dict until one of those happens.
         now = _utcnow()
         now_min = int(now.timestamp() // 60)
         now_hr = int(now.timestamp() // 3600)
+        key = (id(self.agg), self.agg.version, now_min, self.sessions_files, self.sessions_bytes)
+        memo = self.outputs.get(tz.key)
+        if memo is not None and memo[0] == key:
+            return memo[1]
 
         def _sum_min(minutes: int) -> _UsageBucket:
-            start = int((now - _dt.timedelta(minutes=minutes)).timestamp() // 60)
-            out = _UsageBucket()
-            for k in range(start, now_min + 1):
-                b = self.agg.perMinuteUTC.get(k)
-                if b:
-                    out.tokens += b.tokens
-                    out.costUSD += b.costUSD
-                    out.requests += b.requests
-                    out.errors += b.errors
-            return out
+            return self.agg.perMinuteUTC.rolling(minutes + 1, now_min)
 
         def _sum_hr(hours: int) -> _UsageBucket:
-            start = int((now - _dt.timedelta(hours=hours)).timestamp() // 3600)
-            out = _UsageBucket()
-            for k in range(start, now_hr + 1):
-                b = self.agg.perHourUTC.get(k)
-                if b:
-                    out.tokens += b.tokens
-                    out.costUSD += b.costUSD
-                    out.requests += b.requests
-                    out.errors += b.errors
-            return out
+            # Whole UTC hours, as quarter-hour bins: the current hour plus the previous `hours`.
+            return self.agg.perQuarterUTC.rolling((hours + 1) * 4, now_hr * 4 + 3)
 
         windows = {
             "1h": _sum_min(60),
@@ -883,10 +2610,16 @@ class _UsageCacheEntry:
                 "errors": int(round(b.errors)),
             }
 
+        # Local days for this tz, derived from the UTC quarter-hour bins at read time.
         daily_keys = _dates_last_n(tz, 30)
-        daily30d: list[dict[str, object]] = []
+        day_ranges: list[tuple[int, int]] = []
         for d in daily_keys:
-            b = self.agg.daily.get(d) or _UsageBucket()
+            day = _dt.date.fromisoformat(d)
+            start = _dt.datetime.combine(day, _dt.time(), tzinfo=tz)
+            end = _dt.datetime.combine(day + _dt.timedelta(days=1), _dt.time(), tzinfo=tz)
+            day_ranges.append((int(start.timestamp() // 900), int(end.timestamp() // 900) - 1))
+        daily30d: list[dict[str, object]] = []
+        for d, b in zip(daily_keys, self.agg.perQuarterUTC.sums(day_ranges)):
             daily30d.append(
                 {
                     "date": d,
@@ -929,7 +2662,7 @@ class _UsageCacheEntry:
             else None
         )
 
-        return {
+        output: dict[str, object] = {
             "sessionsFiles": int(self.sessions_files),
             "sessionsBytes": int(self.sessions_bytes),
             "allTime": {
@@ -944,11 +2677,236 @@ class _UsageCacheEntry:
             "lastError": last_error,
             "daily30d": daily30d,
         }
+        self.outputs[tz.key] = (key, output)
+        return output
 
 
 _USAGE_CACHE_LOCK = threading.Lock()
 _USAGE_CACHE: dict[str, _UsageCacheEntry] = {}
 
+_USAGE_CHECKPOINT_VERSION = 3
+_DEFAULT_USAGE_CHECKPOINT_DIR = ROOT / "cache" / "usage"
+
+
+@dataclass
+class _UsageCheckpointSettings:
+    dir: Path | None = None  # None disables checkpoints
+    interval_s: float = 60.0
+
+
+_USAGE_CHECKPOINT = _UsageCheckpointSettings()
+
+
+def _configure_usage_checkpoints(cfg: dict[str, object]) -> None:
+    raw = cfg.get("usageCheckpoint")
+    if raw is None:
+        raw = {}
+    if not isinstance(raw, dict):
+        raise ValueError("config.usageCheckpoint must be an object")
+    enabled = raw.get("enabled", True)
+    dir_raw = str(raw.get("dir") or "").strip()
+    base = Path(dir_raw) if dir_raw else _DEFAULT_USAGE_CHECKPOINT_DIR
+    if not base.is_absolute():
+        base = (ROOT / base).resolve()
+    global _USAGE_CHECKPOINT
+    _USAGE_CHECKPOINT = _UsageCheckpointSettings(
+        dir=base if enabled else None,
+        interval_s=max(5.0, _safe_float(raw.get("intervalSeconds"), 60.0)),
+    )
+
+
+def _flush_usage_checkpoints() -> None:
+    with _USAGE_CACHE_LOCK:
+        entries = list(_USAGE_CACHE.values())
+    for entry in entries:
+        with entry.lock:
+            if entry.dirty:
+                entry.persist()
+
+
+@dataclass
+class _UsageHistorySettings:
+    dir: Path | None = None  # None disables the history store
+
+
+_USAGE_HISTORY = _UsageHistorySettings()
+_USAGE_HISTORY_STEP_RE = re.compile(r"^(\d+)([hd])$")
+_USAGE_HISTORY_MAX_POINTS = 10000
+
+
+def _configure_usage_history(cfg: dict[str, object]) -> None:
+    raw = cfg.get("usageHistory")
+    if raw is None:
+        raw = {}
+    if not isinstance(raw, dict):
+        raise ValueError("config.usageHistory must be an object")
+    dir_raw = str(raw.get("dir") or "").strip()
+    base = Path(dir_raw) if dir_raw else _DEFAULT_USAGE_CHECKPOINT_DIR
+    if not base.is_absolute():
+        base = (ROOT / base).resolve()
+    global _USAGE_HISTORY
+    _USAGE_HISTORY = _UsageHistorySettings(dir=base if raw.get("enabled", True) else None)
+
+
+class _UsageHistoryStore:
+    # Append-mostly SQLite rollups of usage per (session file, UTC hour, provider, model). The
+    # in-memory aggregates only reach back ~62 days; this keeps the long tail for trend queries.
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS files ("
+        " id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE, dev INTEGER, ino INTEGER, pos INTEGER)",
+        "CREATE TABLE IF NOT EXISTS usage_hourly ("
+        " file_id INTEGER NOT NULL, hour INTEGER NOT NULL, provider TEXT NOT NULL, model TEXT NOT NULL,"
+        " tokens REAL NOT NULL, cost REAL NOT NULL, requests REAL NOT NULL, errors REAL NOT NULL,"
+        " PRIMARY KEY (file_id, hour, provider, model)) WITHOUT ROWID",
+        "CREATE INDEX IF NOT EXISTS usage_hourly_hour ON usage_hourly (hour)",
+    )
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        con = sqlite3.connect(str(self.path), timeout=10)
+        con.execute("PRAGMA journal_mode=WAL")
+        for stmt in self._SCHEMA:
+            con.execute(stmt)
+        # Stores created before the per-file cursors were added.
+        have = {row[1] for row in con.execute("PRAGMA table_info(files)")}
+        for col in ("dev", "ino", "pos"):
+            if col not in have:
+                con.execute(f"ALTER TABLE files ADD COLUMN {col} INTEGER")
+        return con
+
+    def write(
+        self,
+        resets: set[str],
+        rows: dict[tuple[str, int, str, str], _UsageBucket],
+        cursors: dict[str, _SessionCursor],
+    ) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        con = self._connect()
+        try:
+            with con:
+                ids: dict[str, int] = {}
+
+                def _file_id(path: str) -> int:
+                    if path not in ids:
+                        con.execute("INSERT OR IGNORE INTO files (path) VALUES (?)", (path,))
+                        ids[path] = int(con.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()[0])
+                    return ids[path]
+
+                con.executemany("DELETE FROM usage_hourly WHERE file_id = ?", [(_file_id(p),) for p in resets])
+                con.executemany(
+                    "INSERT INTO usage_hourly (file_id, hour, provider, model, tokens, cost, requests, errors)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (file_id, hour, provider, model) DO UPDATE SET"
+                    " tokens = tokens + excluded.tokens, cost = cost + excluded.cost,"
+                    " requests = requests + excluded.requests, errors = errors + excluded.errors",
+                    [
+                        (_file_id(path), hour, provider, model, b.tokens, b.costUSD, b.requests, b.errors)
+                        for (path, hour, provider, model), b in rows.items()
+                    ],
+                )
+                con.executemany(
+                    "UPDATE files SET dev = ?, ino = ?, pos = ? WHERE id = ?",
+                    [(c.dev, c.ino, c.pos, _file_id(path)) for path, c in cursors.items()],
+                )
+        finally:
+            con.close()
+
+    def cursors(self) -> dict[str, _SessionCursor]:
+        if not self.path.exists():
+            return {}
+        con = self._connect()
+        try:
+            rows = con.execute("SELECT path, dev, ino, pos FROM files WHERE pos IS NOT NULL").fetchall()
+        finally:
+            con.close()
+        return {path: _SessionCursor(dev=int(dev), ino=int(ino), pos=int(pos)) for path, dev, ino, pos in rows}
+
+    def query(
+        self,
+        *,
+        start_hour: int,
+        end_hour: int,
+        step: str,
+        provider: str | None,
+        model: str | None,
+    ) -> tuple[list[dict[str, object]], list[dict[str, object]]]:
+        if not self.path.exists():
+            return [], []
+        where = "hour >= ? AND hour < ?"
+        args: list[object] = [start_hour, end_hour]
+        if provider:
+            where += " AND provider = ?"
+            args.append(provider)
+        if model:
+            where += " AND model = ?"
+            args.append(model)
+        if step == "month":
+            bucket = "strftime('%Y-%m-01T00:00:00Z', hour * 3600, 'unixepoch')"
+        else:
+            m = _USAGE_HISTORY_STEP_RE.match(step)
+            hours = int(m.group(1)) * (24 if m.group(2) == "d" else 1) if m else 24
+            bucket = f"strftime('%Y-%m-%dT%H:%M:%SZ', (hour / {hours}) * {hours} * 3600, 'unixepoch')"
+        sums = "SUM(tokens), SUM(cost), SUM(requests), SUM(errors)"
+        con = self._connect()
+        try:
+            series_rows = con.execute(
+                f"SELECT {bucket} AS t, {sums} FROM usage_hourly WHERE {where} GROUP BY t ORDER BY t", args
+            ).fetchall()
+            model_rows = con.execute(
+                f"SELECT provider, model, {sums} FROM usage_hourly WHERE {where}"
+                " GROUP BY provider, model ORDER BY SUM(cost) DESC",
+                args,
+            ).fetchall()
+        finally:
+            con.close()
+
+        def _totals(tokens: float, cost: float, requests: float, errors: float) -> dict[str, object]:
+            return {
+                "tokens": int(round(tokens or 0.0)),
+                "costUSD": float(cost or 0.0),
+                "requests": int(round(requests or 0.0)),
+                "errors": int(round(errors or 0.0)),
+            }
+
+        series = [{"t": t, **_totals(*vals)} for t, *vals in series_rows]
+        by_model = [{"provider": p, "model": mdl, **_totals(*vals)} for p, mdl, *vals in model_rows]
+        return series, by_model
+
+
+def _usage_history_store(state_dir: Path) -> _UsageHistoryStore | None:
+    base = _USAGE_HISTORY.dir
+    if base is None:
+        return None
+    digest = hashlib.blake2b(str(state_dir).encode("utf-8"), digest_size=8).hexdigest()
+    return _UsageHistoryStore(base / f"history-{digest}.sqlite")
+
+
+def _usage_history(
+    state_dir: Path, *, since: _dt.datetime, until: _dt.datetime, step: str, provider: str | None, model: str | None
+) -> dict[str, object]:
+    state_dir = state_dir.resolve()
+    store = _usage_history_store(state_dir)
+    if store is None:
+        raise ValueError("usage history is disabled")
+    series, by_model = store.query(
+        start_hour=int(since.timestamp() // 3600),
+        end_hour=int(-(-until.timestamp() // 3600)),
+        step=step,
+        provider=provider,
+        model=model,
+    )
+    return {
+        "from": since.isoformat().replace("+00:00", "Z"),
+        "to": until.isoformat().replace("+00:00", "Z"),
+        "step": step,
+        "provider": provider,
+        "model": model,
+        "series": series,
+        "byModel": by_model,
+    }
+
 
 def _load_config(path: Path) -> dict[str, object]:
     raw = json.loads(path.read_text(encoding="utf-8"))
@@ -1093,31 +3051,307 @@ def _parse_unit_specs(cfg: dict[str, object]) -> tuple[list[UnitSpec], dict[str,
     return specs, by_unit
 
 
+_STATUS_PROPS = [
+    "Id",
+    "Description",
+    "FragmentPath",
+    "LoadState",
+    "ActiveState",
+    "SubState",
+    "UnitFileState",
+    "MainPID",
+    "NRestarts",
+    "MemoryCurrent",
+    "CPUUsageNSec",
+    "ActiveEnterTimestamp",
+    "ActiveEnterTimestampMonotonic",
+]
+
+_DEFAULT_COLLECT_CONCURRENCY = 8
+_DEFAULT_COLLECT_UNIT_TIMEOUT_S = 20.0
+
+
+def _collector_settings(cfg: dict[str, object]) -> tuple[int, float]:
+    raw = cfg.get("collector")
+    if raw is None:
+        raw = {}
+    if not isinstance(raw, dict):
+        raise ValueError("config.collector must be an object")
+    concurrency = _safe_int(raw.get("concurrency"), _DEFAULT_COLLECT_CONCURRENCY)
+    timeout_s = _safe_float(raw.get("unitTimeoutSeconds"), _DEFAULT_COLLECT_UNIT_TIMEOUT_S)
+    return max(1, min(64, concurrency)), max(1.0, timeout_s)
+
+
+def _collect_bot(
+    spec: UnitSpec,
+    *,
+    tz: ZoneInfo,
+    bot_mappings: dict[str, dict[str, object]],
+    log_rules: _LogIssueMatcher,
+    boot_uptime: float,
+    now: _dt.datetime,
+    show: dict[str, str] | None = None,
+) -> dict[str, object]:
+    if show is None:
+        show = _systemctl_show(spec, _STATUS_PROPS)
+    botdef = _detect_bot_def(spec, show)
+    override = bot_mappings.get(spec.unit)
+    bot_docs = override.get("docs") if override else None
+    if override:
+        botdef = BotDef(
+            unit=botdef.unit,
+            display_name=str(override.get("displayName") or botdef.display_name),
+            telegram_handle=str(override.get("telegramHandle") or botdef.telegram_handle or "") or None,
+            bot_type=botdef.bot_type,
+            profile=botdef.profile,
+            gateway_port=botdef.gateway_port,
+            state_dir=botdef.state_dir,
+        )
+
+    active_state = (show.get("ActiveState") or "").strip()
+    sub_state = (show.get("SubState") or "").strip()
+
+    active_enter_mono_us = _safe_float(show.get("ActiveEnterTimestampMonotonic"), 0.0) / 1_000_000.0
+    uptime_seconds = 0.0
+    if active_state == "active" and active_enter_mono_us > 0 and boot_uptime > 0:
+        uptime_seconds = max(0.0, boot_uptime - active_enter_mono_us)
+
+    health_issues: list[dict[str, object]] = []
+    active_since: _dt.datetime | None = None
+    if active_state != "active":
+        health_issues.append(
+            {
+                "source": "systemd",
+                "key": "not_active",
+                "severity": "error",
+                "message": f"Service is not active ({active_state or 'unknown'})",
+                "hint": "Start the service",
+                "timestamp": None,
+            }
+        )
+    elif sub_state and sub_state != "running":
+        health_issues.append(
+            {
+                "source": "systemd",
+                "key": "not_running",
+                "severity": "warn",
+                "message": f"Service subState is {sub_state}",
+                "hint": "Check logs and restart if needed",
+                "timestamp": None,
+            }
+        )
+    if _safe_int(show.get("NRestarts"), 0) > 0:
+        health_issues.append(
+            {
+                "source": "systemd",
+                "key": "restarts",
+                "severity": "warn",
+                "message": "Service restarted recently",
+                "hint": "Check logs for repeated failures",
+                "timestamp": None,
+            }
+        )
+    if active_state == "active" and uptime_seconds > 0:
+        active_since = now - _dt.timedelta(seconds=uptime_seconds)
+    if active_state == "active":
+        invocation = show.get("ActiveEnterTimestampMonotonic") or ""
+        health_issues.extend(
+            _scan_recent_log_issues(spec, since=active_since, invocation=invocation, matcher=log_rules)
+        )
+
+    usage: dict[str, object] | None = None
+    if botdef.bot_type == "clawdbot" and botdef.state_dir and botdef.state_dir.exists():
+        usage = _scan_clawdbot_usage(botdef.state_dir, tz)
+
+    return {
+        "unit": spec.unit,
+        "scope": spec.scope,
+        "user": spec.user,
+        "displayName": botdef.display_name,
+        "telegramHandle": botdef.telegram_handle,
+        "docs": bot_docs,
+        "type": botdef.bot_type,
+        "profile": botdef.profile,
+        "gatewayPort": botdef.gateway_port,
+        "stateDir": str(botdef.state_dir) if botdef.state_dir else None,
+        "systemd": {
+            "loadState": show.get("LoadState") or "",
+            "activeState": active_state,
+            "subState": sub_state,
+            "unitFileState": show.get("UnitFileState") or "",
+            "mainPid": _safe_int(show.get("MainPID"), 0),
+            "nRestarts": _safe_int(show.get("NRestarts"), 0),
+            "memoryCurrentBytes": _safe_int(show.get("MemoryCurrent"), 0),
+            "cpuUsageNSec": _safe_int(show.get("CPUUsageNSec"), 0),
+            "activeEnterTimestamp": show.get("ActiveEnterTimestamp") or "",
+            "uptimeSeconds": uptime_seconds,
+        },
+        "health": {
+            "status": "issue" if health_issues else "ok",
+            "issues": health_issues,
+        },
+        "usage": usage,
+    }
+
+
+def _collect_failed_bot(
+    spec: UnitSpec,
+    bot_mappings: dict[str, dict[str, object]],
+    *,
+    key: str,
+    message: str,
+) -> dict[str, object]:
+    # Placeholder row so one stuck/broken unit doesn't take the whole payload down.
+    override = bot_mappings.get(spec.unit) or {}
+    return {
+        "unit": spec.unit,
+        "scope": spec.scope,
+        "user": spec.user,
+        "displayName": str(override.get("displayName") or spec.unit),
+        "telegramHandle": override.get("telegramHandle") or None,
+        "docs": override.get("docs") or None,
+        "type": "unknown",
+        "profile": None,
+        "gatewayPort": None,
+        "stateDir": None,
+        "systemd": {
+            "loadState": "",
+            "activeState": "unknown",
+            "subState": "",
+            "unitFileState": "",
+            "mainPid": 0,
+            "nRestarts": 0,
+            "memoryCurrentBytes": 0,
+            "cpuUsageNSec": 0,
+            "activeEnterTimestamp": "",
+            "uptimeSeconds": 0.0,
+        },
+        "health": {
+            "status": "issue",
+            "issues": [
+                {
+                    "source": "dashboard",
+                    "key": key,
+                    "severity": "error",
+                    "message": message,
+                    "hint": "Check systemctl/journalctl responsiveness for this unit",
+                    "timestamp": None,
+                }
+            ],
+        },
+        "usage": None,
+    }
+
+
+_COLLECT_INFLIGHT_LOCK = threading.Lock()
+_COLLECT_INFLIGHT: set[tuple[str, str, str]] = set()  # units whose collection worker is running
+_COLLECT_STILL_RUNNING = "previous collection still running"
+
+
+def _run_bounded(
+    items: list[UnitSpec],
+    fn: Callable[[UnitSpec], dict[str, object]],
+    *,
+    concurrency: int,
+    timeout_s: float,
+) -> list[tuple[dict[str, object] | None, str | None]]:
+    # Each item gets timeout_s from the moment a worker picks it up (queue time doesn't count).
+    # Items that overrun are reported as "timeout" and abandoned; their threads finish in the background.
+    results: list[tuple[dict[str, object] | None, str | None]] = [(None, None)] * len(items)
+    if not items:
+        return results
+
+    started: dict[int, float] = {}
+
+    def _task(i: int) -> dict[str, object]:
+        started[i] = time.monotonic()
+        return fn(items[i])
+
+    pool = ThreadPoolExecutor(max_workers=min(concurrency, len(items)), thread_name_prefix="collect")
+    try:
+        pending = {pool.submit(_task, i): i for i in range(len(items))}
+        while pending:
+            done, _ = wait(list(pending.keys()), timeout=0.05, return_when=FIRST_COMPLETED)
+            for fut in done:
+                i = pending.pop(fut)
+                try:
+                    results[i] = (fut.result(), None)
+                except Exception as e:  # noqa: BLE001
+                    results[i] = (None, str(e) or e.__class__.__name__)
+
+            now_mono = time.monotonic()
+            for fut, i in list(pending.items()):
+                t0 = started.get(i)
+                if t0 is not None and (now_mono - t0) > timeout_s:
+                    del pending[fut]
+                    results[i] = (None, "timeout")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
 def _build_payload(cfg: dict[str, object]) -> dict[str, object]:
     title = str(cfg.get("title") or "Bots Dashboard")
     timezone_name = str(cfg.get("timezone") or "America/New_York")
     tz = ZoneInfo(timezone_name)
     now = _utcnow()
     bot_mappings = _parse_bot_mappings(cfg)
+    log_rules = _log_issue_matcher(cfg)
     specs, _ = _parse_unit_specs(cfg)
-
-    props = [
-        "Id",
-        "Description",
-        "FragmentPath",
-        "LoadState",
-        "ActiveState",
-        "SubState",
-        "UnitFileState",
-        "MainPID",
-        "NRestarts",
-        "MemoryCurrent",
-        "CPUUsageNSec",
-        "ActiveEnterTimestamp",
-        "ActiveEnterTimestampMonotonic",
-    ]
+    concurrency, unit_timeout_s = _collector_settings(cfg)
     boot_uptime = _proc_uptime_seconds()
 
+    # One batched show per bus, each on its own thread. A unit waits for its bus's batch at most half
+    # its timeout; if that batch hangs or fails (or left the unit out), `_collect_bot` shows the unit
+    # on its own, so one stuck manager doesn't take down the rows of the others.
+    groups: dict[tuple[object, ...], list[UnitSpec]] = {}
+    for spec in specs:
+        try:
+            groups.setdefault(_bus_key(spec), []).append(spec)
+        except Exception:  # noqa: BLE001
+            continue  # surfaces as collect_failed from the unit's own show
+    shows: dict[tuple[str, str, str], Future[dict[tuple[str, str, str], dict[str, str]]]] = {}
+    if groups:
+        batch = ThreadPoolExecutor(max_workers=len(groups), thread_name_prefix="collect-show")
+        for group in groups.values():
+            fut = batch.submit(_systemctl_show_many, group, _STATUS_PROPS)
+            shows.update((_spec_key(spec), fut) for spec in group)
+        batch.shutdown(wait=False)
+    show_deadline = time.monotonic() + unit_timeout_s / 2
+
+    def _collect(spec: UnitSpec) -> dict[str, object]:
+        key = _spec_key(spec)
+        with _COLLECT_INFLIGHT_LOCK:
+            if key in _COLLECT_INFLIGHT:
+                # A worker abandoned by an earlier build is still stuck on this unit; don't pile up another.
+                raise RuntimeError(_COLLECT_STILL_RUNNING)
+            _COLLECT_INFLIGHT.add(key)
+        try:
+            return _collect_unit(spec, key)
+        finally:
+            with _COLLECT_INFLIGHT_LOCK:
+                _COLLECT_INFLIGHT.discard(key)
+
+    def _collect_unit(spec: UnitSpec, key: tuple[str, str, str]) -> dict[str, object]:
+        show = None
+        fut = shows.get(key)
+        if fut is not None:
+            try:
+                show = fut.result(timeout=max(0.0, show_deadline - time.monotonic())).get(key)
+            except Exception:  # noqa: BLE001
+                show = None
+        return _collect_bot(
+            spec,
+            tz=tz,
+            bot_mappings=bot_mappings,
+            log_rules=log_rules,
+            boot_uptime=boot_uptime,
+            now=now,
+            show=show,
+        )
+
+    collected = _run_bounded(specs, _collect, concurrency=concurrency, timeout_s=unit_timeout_s)
+
     bots: list[dict[str, object]] = []
     totals = {
         "botsTotal": 0,
@@ -1128,116 +3362,43 @@ def _build_payload(cfg: dict[str, object]) -> dict[str, object]:
         "errors24h": 0,
     }
 
-    for spec in specs:
-        u = spec.unit
-        totals["botsTotal"] += 1
-        show = _systemctl_show(spec, props)
-        botdef = _detect_bot_def(spec, show)
-        override = bot_mappings.get(spec.unit)
-        bot_docs = override.get("docs") if override else None
-        if override:
-            botdef = BotDef(
-                unit=botdef.unit,
-                display_name=str(override.get("displayName") or botdef.display_name),
-                telegram_handle=str(override.get("telegramHandle") or botdef.telegram_handle or "") or None,
-                bot_type=botdef.bot_type,
-                profile=botdef.profile,
-                gateway_port=botdef.gateway_port,
-                state_dir=botdef.state_dir,
-            )
+    for spec, (bot, err) in zip(specs, collected):
+        if bot is None:
+            if err == "timeout":
+                bot = _collect_failed_bot(
+                    spec,
+                    bot_mappings,
+                    key="collect_timeout",
+                    message=f"Status collection timed out after {unit_timeout_s:g}s",
+                )
+            elif err == _COLLECT_STILL_RUNNING:
+                bot = _collect_failed_bot(
+                    spec,
+                    bot_mappings,
+                    key="collect_timeout",
+                    message=f"Status collection timed out after {unit_timeout_s:g}s (still running)",
+                )
+            else:
+                bot = _collect_failed_bot(
+                    spec,
+                    bot_mappings,
+                    key="collect_failed",
+                    message=f"Status collection failed: {err or 'unknown error'}",
+                )
 
-        active_state = (show.get("ActiveState") or "").strip()
-        sub_state = (show.get("SubState") or "").strip()
-        if active_state == "active":
+        totals["botsTotal"] += 1
+        sd = bot.get("systemd")
+        if isinstance(sd, dict) and sd.get("activeState") == "active":
             totals["botsActive"] += 1
 
-        active_enter_mono_us = _safe_float(show.get("ActiveEnterTimestampMonotonic"), 0.0) / 1_000_000.0
-        uptime_seconds = 0.0
-        if active_state == "active" and active_enter_mono_us > 0 and boot_uptime > 0:
-            uptime_seconds = max(0.0, boot_uptime - active_enter_mono_us)
-
-        health_issues: list[dict[str, object]] = []
-        active_since: _dt.datetime | None = None
-        if active_state != "active":
-            health_issues.append(
-                {
-                    "source": "systemd",
-                    "key": "not_active",
-                    "severity": "error",
-                    "message": f"Service is not active ({active_state or 'unknown'})",
-                    "hint": "Start the service",
-                    "timestamp": None,
-                }
-            )
-        elif sub_state and sub_state != "running":
-            health_issues.append(
-                {
-                    "source": "systemd",
-                    "key": "not_running",
-                    "severity": "warn",
-                    "message": f"Service subState is {sub_state}",
-                    "hint": "Check logs and restart if needed",
-                    "timestamp": None,
-                }
-            )
-        if _safe_int(show.get("NRestarts"), 0) > 0:
-            health_issues.append(
-                {
-                    "source": "systemd",
-                    "key": "restarts",
-                    "severity": "warn",
-                    "message": "Service restarted recently",
-                    "hint": "Check logs for repeated failures",
-                    "timestamp": None,
-                }
-            )
-        if active_state == "active" and uptime_seconds > 0:
-            active_since = now - _dt.timedelta(seconds=uptime_seconds)
-        if active_state == "active":
-            logs = _collect_journal(spec, 200, since=active_since)
-            health_issues.extend(_scan_recent_log_issues(logs))
-
-        usage: dict[str, object] | None = None
-        if botdef.bot_type == "clawdbot" and botdef.state_dir and botdef.state_dir.exists():
-            usage = _scan_clawdbot_usage(botdef.state_dir, tz)
-
-        win24 = (usage or {}).get("windows", {}).get("24h", {}) if usage else {}
+        usage = bot.get("usage")
+        win24 = (usage or {}).get("windows", {}).get("24h", {}) if isinstance(usage, dict) else {}
         totals["tokens24h"] += _safe_int((win24 or {}).get("tokens"), 0)
         totals["cost24h"] += _safe_float((win24 or {}).get("costUSD"), 0.0)
         totals["requests24h"] += _safe_int((win24 or {}).get("requests"), 0)
         totals["errors24h"] += _safe_int((win24 or {}).get("errors"), 0)
 
-        bots.append(
-            {
-                "unit": u,
-                "scope": spec.scope,
-                "user": spec.user,
-                "displayName": botdef.display_name,
-                "telegramHandle": botdef.telegram_handle,
-                "docs": bot_docs,
-                "type": botdef.bot_type,
-                "profile": botdef.profile,
-                "gatewayPort": botdef.gateway_port,
-                "stateDir": str(botdef.state_dir) if botdef.state_dir else None,
-                "systemd": {
-                    "loadState": show.get("LoadState") or "",
-                    "activeState": active_state,
-                    "subState": sub_state,
-                    "unitFileState": show.get("UnitFileState") or "",
-                    "mainPid": _safe_int(show.get("MainPID"), 0),
-                    "nRestarts": _safe_int(show.get("NRestarts"), 0),
-                    "memoryCurrentBytes": _safe_int(show.get("MemoryCurrent"), 0),
-                    "cpuUsageNSec": _safe_int(show.get("CPUUsageNSec"), 0),
-                    "activeEnterTimestamp": show.get("ActiveEnterTimestamp") or "",
-                    "uptimeSeconds": uptime_seconds,
-                },
-                "health": {
-                    "status": "issue" if health_issues else "ok",
-                    "issues": health_issues,
-                },
-                "usage": usage,
-            }
-        )
+        bots.append(bot)
 
     return {
         "title": title,
@@ -1251,67 +3412,920 @@ def _build_payload(cfg: dict[str, object]) -> dict[str, object]:
 @dataclass
 class _BotsPayloadCache:
     lock: threading.Lock = field(default_factory=threading.Lock)
+    cond: threading.Condition = field(init=False)
     cfg_sig: _FileSig | None = None
     payload: dict[str, object] | None = None
+    body: bytes | None = None  # payload pre-serialized as UTF-8 JSON
+    etag: str | None = None
     built_mono: float = 0.0
+    # Bumped by every build that changed something; SSE streams wait on it and clients send it back
+    # as ?since=.
+    # Seeded from wall-clock ms so generations from a previous process are always "too old".
+    generation: int = 0
+    base_generation: int = 0
+    building: bool = False
+    error: str | None = None
+    refresher_running: bool = False
+    # Delta tracking: per-bot section signatures and the generation each section last changed in.
+    bot_order: list[str] = field(default_factory=list)
+    bot_sigs: dict[str, dict[str, str]] = field(default_factory=dict)
+    bot_gens: dict[str, dict[str, int]] = field(default_factory=dict)
+    bot_added_gen: dict[str, int] = field(default_factory=dict)
+    bot_removed_gen: dict[str, int] = field(default_factory=dict)
+    patch_body: bytes | None = None  # patch since generation - 1, shared by SSE streams
+    # Called (under `cond`) after every build, for waiters that can't block on the condition.
+    listeners: list[Callable[[], None]] = field(default_factory=list)
+    patch_etag: str | None = None
+
+    def __post_init__(self) -> None:
+        self.cond = threading.Condition(self.lock)
+        self.generation = self.base_generation = int(time.time() * 1000)
 
 
 _BOTS_PAYLOAD_CACHE = _BotsPayloadCache()
 
 
-def _get_bots_payload(config_path: Path) -> dict[str, object]:
+def _config_sig(config_path: Path) -> _FileSig:
+    st = config_path.stat()
+    return _FileSig(size=int(st.st_size), mtime_ns=int(st.st_mtime_ns))
+
+
+# Fields that drift on every build without the unit changing; clients extrapolate them instead.
+_DELTA_VOLATILE: dict[str, tuple[str, ...]] = {"systemd": ("uptimeSeconds",)}
+# Counters that move a little on every build of a running unit: only a step this big is a change.
+_DELTA_QUANTUM: dict[str, dict[str, int]] = {
+    "systemd": {"cpuUsageNSec": 10_000_000_000, "memoryCurrentBytes": 16 << 20},
+}
+
+
+def _bot_section_sigs(bot: dict[str, object]) -> dict[str, str]:
+    sigs: dict[str, str] = {}
+    for k, v in bot.items():
+        volatile = _DELTA_VOLATILE.get(k)
+        if volatile and isinstance(v, dict):
+            quantum = _DELTA_QUANTUM.get(k, {})
+            v = {
+                kk: _safe_int(vv, 0) // quantum[kk] if kk in quantum else vv
+                for kk, vv in v.items()
+                if kk not in volatile
+            }
+        sigs[k] = _json_dumps(v)
+    return sigs
+
+
+def _track_bot_changes(cache: _BotsPayloadCache, payload: dict[str, object], gen: int) -> bool:
+    # Caller holds cache.lock. Returns whether any bot was added, removed, reordered or changed.
+    bots = [b for b in (payload.get("bots") or []) if isinstance(b, dict)]
+    order = [str(b.get("unit") or "") for b in bots]
+    changed = order != cache.bot_order
+    for bot, unit in zip(bots, order):
+        sigs = _bot_section_sigs(bot)
+        old = cache.bot_sigs.get(unit)
+        if old is None:
+            cache.bot_added_gen[unit] = gen
+            cache.bot_gens[unit] = {k: gen for k in sigs}
+            cache.bot_removed_gen.pop(unit, None)
+            changed = True
+        else:
+            gens = cache.bot_gens.setdefault(unit, {})
+            for k, sig in sigs.items():
+                if old.get(k) != sig:
+                    gens[k] = gen
+                    changed = True
+            if old.keys() - sigs.keys():
+                changed = True
+        cache.bot_sigs[unit] = sigs
+    current = set(order)
+    for unit in [u for u in cache.bot_sigs if u not in current]:
+        del cache.bot_sigs[unit]
+        cache.bot_gens.pop(unit, None)
+        cache.bot_added_gen.pop(unit, None)
+        cache.bot_removed_gen[unit] = gen
+        changed = True
+    cache.bot_order = order
+    return changed
+
+
+def _bots_patch_locked(cache: _BotsPayloadCache, since: int) -> dict[str, object] | None:
+    # JSON-merge-patch style delta against the client's generation `since`: bots maps unit -> changed
+    # sections (whole bot if new, null if removed). None means the client needs the full payload.
+    payload = cache.payload
+    if payload is None or since <= cache.base_generation or since > cache.generation:
+        return None
+    by_unit = {str(b.get("unit") or ""): b for b in (payload.get("bots") or []) if isinstance(b, dict)}
+    bots: dict[str, object] = {}
+    for unit in cache.bot_order:
+        bot = by_unit.get(unit)
+        if bot is None:
+            continue
+        if cache.bot_added_gen.get(unit, 0) > since:
+            bots[unit] = bot
+            continue
+        changed = {k: bot.get(k) for k, g in cache.bot_gens.get(unit, {}).items() if g > since}
+        if changed:
+            bots[unit] = changed
+    for unit, g in cache.bot_removed_gen.items():
+        if g > since:
+            bots[unit] = None
+    return {
+        "patch": True,
+        "since": since,
+        "generation": cache.generation,
+        "title": payload.get("title"),
+        "timezone": payload.get("timezone"),
+        "generatedAt": payload.get("generatedAt"),
+        "totals": payload.get("totals"),
+        "order": list(cache.bot_order),
+        "bots": bots,
+    }
+
+
+def _etag_for(raw: bytes) -> str:
+    return '"' + hashlib.blake2b(raw, digest_size=16).hexdigest() + '"'
+
+
+def _generation_etag(*gens: int) -> str:
+    # Weak: bodies of one generation only differ in generatedAt and the volatile/quantized fields.
+    return 'W/"' + "-".join(f"{g:x}" for g in gens) + '"'
+
+
+_COMPRESS_MIN_BYTES = 512
+_COMPRESSED_CACHE_MAX = 64
+_COMPRESSED_CACHE_LOCK = threading.Lock()
+_COMPRESSED_CACHE: OrderedDict[tuple[str, str], bytes] = OrderedDict()  # (etag, encoding) -> body
+
+
+def _compress(raw: bytes, encoding: str) -> bytes:
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(raw, quality=5)
+    return gzip.compress(raw, compresslevel=6, mtime=0)
+
+
+def _compressed_variant(raw: bytes, etag: str, encoding: str) -> bytes:
+    # Keyed by the ETag the caller already has, so each payload generation (or details/logs body) is
+    # compressed once without rehashing it per request. Bodies under one weak ETag only differ in
+    # volatile fields, so whichever was compressed first stands in for the rest.
+    key = (etag, encoding)
+    with _COMPRESSED_CACHE_LOCK:
+        cached = _COMPRESSED_CACHE.get(key)
+        if cached is not None:
+            _COMPRESSED_CACHE.move_to_end(key)
+            return cached
+    out = _compress(raw, encoding)
+    with _COMPRESSED_CACHE_LOCK:
+        _COMPRESSED_CACHE[key] = out
+        while len(_COMPRESSED_CACHE) > _COMPRESSED_CACHE_MAX:
+            _COMPRESSED_CACHE.popitem(last=False)
+    return out
+
+
+def _pick_encoding(accept_encoding: str) -> str | None:
+    accepted: dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for p in params.split(";"):
+            k, _, v = p.strip().partition("=")
+            if k.strip() == "q":
+                q = _safe_float(v, 0.0)
+        accepted[name] = q
+    if brotli is not None and accepted.get("br", 0.0) > 0:
+        return "br"
+    if accepted.get("gzip", accepted.get("*", 0.0)) > 0:
+        return "gzip"
+    return None
+
+
+def _get_bots_patch_body(config_path: Path, since: int) -> tuple[bytes, str]:
+    _, full_body, full_etag = _get_bots_payload_entry(config_path)
+    cache = _BOTS_PAYLOAD_CACHE
+    with cache.cond:
+        if since == cache.generation - 1 and cache.patch_body is not None and cache.patch_etag:
+            return cache.patch_body, cache.patch_etag
+        patch = _bots_patch_locked(cache, since)
+    if patch is None:
+        return full_body, full_etag
+    raw = _json_dumps(patch).encode("utf-8")
+    return raw, _generation_etag(since, _safe_int(patch.get("generation"), 0))
+
+
+def _bots_stream_event_locked(cache: _BotsPayloadCache, sent_gen: int) -> tuple[int, bytes | None, str]:
+    # Next SSE event for a stream that last sent `sent_gen`: the full body first, then only what changed.
+    gen, body, event = cache.generation, cache.body, "bots"
+    if sent_gen >= 0 and gen != sent_gen:
+        if gen - 1 == sent_gen and cache.patch_body is not None:
+            body, event = cache.patch_body, "patch"
+        else:
+            patch = _bots_patch_locked(cache, sent_gen)
+            if patch is not None:
+                body, event = _json_dumps(patch).encode("utf-8"), "patch"
+    return gen, body, event
+
+
+def _refresh_bots_payload(config_path: Path) -> None:
+    # Single-flight: if a build is already running, wait for it instead of starting another one.
+    cache = _BOTS_PAYLOAD_CACHE
+    with cache.cond:
+        if cache.building:
+            while cache.building:
+                cache.cond.wait()
+            return
+        cache.building = True
+
     try:
-        st = config_path.stat()
-        sig = _FileSig(size=int(st.st_size), mtime_ns=int(st.st_mtime_ns))
-    except FileNotFoundError:
+        sig = _config_sig(config_path)
+        cfg = _load_config(config_path)
+        payload = _build_payload(cfg)
+        with cache.cond:
+            # Builds are single-flight, so nobody else touches the change tracking meanwhile. A build
+            # that changed nothing keeps the generation: streams stay quiet and ?since= stays valid.
+            prev = cache.payload
+            gen = cache.generation + 1
+            changed = _track_bot_changes(cache, payload, gen) or prev is None
+            changed = changed or any(payload.get(k) != prev.get(k) for k in ("title", "timezone", "totals"))
+            if not changed:
+                gen = cache.generation
+        payload["generation"] = gen
+        body = _json_dumps(payload).encode("utf-8")
+        etag = _generation_etag(gen)
+    except Exception as e:  # noqa: BLE001
+        with cache.cond:
+            cache.building = False
+            cache.error = str(e) or e.__class__.__name__
+            cache.cond.notify_all()
         raise
 
-    now_mono = time.monotonic()
-    with _BOTS_PAYLOAD_CACHE.lock:
-        if (
-            _BOTS_PAYLOAD_CACHE.payload is not None
-            and _BOTS_PAYLOAD_CACHE.cfg_sig == sig
-            and (now_mono - _BOTS_PAYLOAD_CACHE.built_mono) < 1.0
-        ):
-            return _BOTS_PAYLOAD_CACHE.payload
+    with cache.cond:
+        cache.cfg_sig = sig
+        cache.payload = payload
+        cache.body = body
+        cache.etag = etag
+        cache.built_mono = time.monotonic()
+        if changed:
+            cache.generation = gen
+            patch = _bots_patch_locked(cache, gen - 1)
+            cache.patch_body = _json_dumps(patch).encode("utf-8") if patch is not None else None
+            cache.patch_etag = _generation_etag(gen - 1, gen) if cache.patch_body is not None else None
+        cache.building = False
+        cache.error = None
+        cache.cond.notify_all()
+        if changed:
+            for cb in cache.listeners:
+                cb()
+
+
+def _get_bots_payload_entry(config_path: Path) -> tuple[dict[str, object], bytes, str]:
+    sig = _config_sig(config_path)
+    cache = _BOTS_PAYLOAD_CACHE
+    with cache.cond:
+        if cache.payload is not None and cache.body is not None and cache.etag and cache.cfg_sig == sig:
+            # With the refresher running the cached payload is always served as-is; otherwise keep
+            # the old 1s TTL so bursts of clients share one build.
+            if cache.refresher_running or (time.monotonic() - cache.built_mono) < 1.0:
+                return cache.payload, cache.body, cache.etag
+
+    _refresh_bots_payload(config_path)
+    with cache.cond:
+        if cache.payload is None or cache.body is None or not cache.etag:
+            raise RuntimeError(cache.error or "payload unavailable")
+        return cache.payload, cache.body, cache.etag
+
 
+def _get_bots_payload(config_path: Path) -> dict[str, object]:
+    return _get_bots_payload_entry(config_path)[0]
+
+
+class _BotsRefresher(threading.Thread):
+    def __init__(self, config_path: Path) -> None:
+        super().__init__(name="bots-refresher", daemon=True)
+        self.config_path = config_path
+        self.wake = threading.Event()
+
+    def _interval_s(self) -> float:
+        try:
+            return _refresher_interval_s(_load_config(self.config_path))
+        except Exception:  # noqa: BLE001
+            return _DEFAULT_REFRESH_INTERVAL_S
+
+    def run(self) -> None:
+        while True:
+            interval = self._interval_s()
+            with _BOTS_PAYLOAD_CACHE.cond:
+                _BOTS_PAYLOAD_CACHE.refresher_running = interval > 0
+            if interval <= 0:
+                # Disabled in config: requests build on demand; re-check the setting periodically.
+                self.wake.wait(5.0)
+                self.wake.clear()
+                continue
+            try:
+                _refresh_bots_payload(self.config_path)
+            except Exception:  # noqa: BLE001
+                pass  # error is kept on the cache and surfaced to clients that have nothing to serve
+            self.wake.wait(interval)
+            self.wake.clear()
+
+
+_DEFAULT_REFRESH_INTERVAL_S = 5.0
+_BOTS_REFRESHER: _BotsRefresher | None = None
+
+
+def _refresher_interval_s(cfg: dict[str, object]) -> float:
+    raw = cfg.get("refresher")
+    if raw is None:
+        raw = {}
+    if not isinstance(raw, dict):
+        raise ValueError("config.refresher must be an object")
+    interval = _safe_float(raw.get("intervalSeconds"), _DEFAULT_REFRESH_INTERVAL_S)
+    return 0.0 if interval <= 0 else max(1.0, interval)
+
+
+def _request_bots_refresh() -> None:
+    # Called after actions so the next read reflects the new unit state.
+    with _BOTS_PAYLOAD_CACHE.cond:
+        _BOTS_PAYLOAD_CACHE.built_mono = 0.0
+    if _BOTS_REFRESHER is not None:
+        _BOTS_REFRESHER.wake.set()
+
+
+_STREAM_HEARTBEAT_S = 15.0
+
+
+class _RequestError(Exception):
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+@dataclass
+class _LogsQuery:
+    unit: str
+    spec: UnitSpec
+    lines: int
+    since_raw: str
+    since_dt: _dt.datetime | None
+    structured: bool = False
+    before: str | None = None
+    after: str | None = None
+    grep: str | None = None
+    priority: str | None = None
+
+    def cmd(self) -> list[str]:
+        if not self.structured:
+            return _journal_text_cmd(self.spec, self.lines, since=self.since_dt)
+        return _journal_page_cmd(
+            self.spec,
+            self.lines,
+            before=self.before,
+            after=self.after,
+            since=self.since_dt,
+            grep=self.grep,
+            priority=self.priority,
+        )
+
+    def response(self, proc: subprocess.CompletedProcess[str]) -> tuple[int, dict[str, object], str | None]:
+        since_at = self.since_dt.isoformat().replace("+00:00", "Z") if self.since_dt else None
+        if not self.structured:
+            logs = _journal_text(proc)
+            # sinceResolvedAt drifts on every call for relative `since`; keep it out of the ETag.
+            etag = _etag_for(_json_dumps([self.unit, self.lines, self.since_raw, logs]).encode("utf-8"))
+            body = {
+                "unit": self.unit,
+                "lines": self.lines,
+                "since": self.since_raw or None,
+                "sinceResolvedAt": since_at,
+                "logs": logs,
+            }
+            return 200, body, etag
+
+        try:
+            entries, has_more = _journal_page(proc, self.lines, before=self.before, after=self.after)
+        except RuntimeError as e:
+            return 502, {"error": str(e)}, None
+        body = {
+            "unit": self.unit,
+            "format": "json",
+            "lines": self.lines,
+            "since": self.since_raw or None,
+            "sinceResolvedAt": since_at,
+            "before": self.before,
+            "after": self.after,
+            "grep": self.grep,
+            "priority": self.priority,
+            "entries": entries,
+            # Cursors of the oldest/newest entry in this page, for the next `before`/`after` request.
+            "firstCursor": entries[0].get("cursor") if entries else self.before,
+            "lastCursor": entries[-1].get("cursor") if entries else self.after,
+            "hasMore": has_more,
+        }
+        etag = _etag_for(_json_dumps({k: v for k, v in body.items() if k != "sinceResolvedAt"}).encode("utf-8"))
+        return 200, body, etag
+
+
+_UNIT_ACTION_PATH_RE = re.compile(r"^/api/units/([^/]+)/([^/]+)$")
+
+
+def _action_unit_spec(config_path: Path, unit: str, action: str) -> UnitSpec:
+    if action not in _UNIT_ACTIONS:
+        raise _RequestError(400, "invalid action")
     cfg = _load_config(config_path)
-    payload = _build_payload(cfg)
-    with _BOTS_PAYLOAD_CACHE.lock:
-        _BOTS_PAYLOAD_CACHE.cfg_sig = sig
-        _BOTS_PAYLOAD_CACHE.payload = payload
-        _BOTS_PAYLOAD_CACHE.built_mono = now_mono
-    return payload
+    _, by_unit = _parse_unit_specs(cfg)
+    if unit not in by_unit:
+        raise _RequestError(403, "unit not allowed")
+    return by_unit[unit]
+
+
+def _epoch_iso(ts: float | None) -> str | None:
+    if ts is None:
+        return None
+    return _dt.datetime.fromtimestamp(ts, tz=_dt.timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+@dataclass
+class _ActionJob:
+    id: str
+    spec: UnitSpec
+    action: str
+    state: str = "queued"  # queued | running | succeeded | failed
+    queued_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: dict[str, object] | None = None
+    status: dict[str, str] | None = None
+    error: str | None = None
+    bulk: _BulkJob | None = None  # set for the per-unit parts of a bulk action
+
+    @property
+    def done(self) -> bool:
+        return self.state in ("succeeded", "failed")
+
+    def to_json(self) -> dict[str, object]:
+        return {
+            "id": self.id,
+            "unit": self.spec.unit,
+            "action": self.action,
+            "state": self.state,
+            "ok": self.state == "succeeded" if self.done else None,
+            "queuedAt": _epoch_iso(self.queued_at),
+            "startedAt": _epoch_iso(self.started_at),
+            "finishedAt": _epoch_iso(self.finished_at),
+            "result": self.result,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+@dataclass
+class _BulkJob:
+    # One action over several units. Each unit runs as its own scheduled job; the unit status is
+    # read once for all of them (batched per bus) after the last one finishes.
+    id: str
+    action: str
+    jobs: list[_ActionJob] = field(default_factory=list)
+    queued_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    finalizing: bool = False
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def to_json(self) -> dict[str, object]:
+        units = [{k: v for k, v in job.to_json().items() if k not in ("id", "action")} for job in self.jobs]
+        if self.done:
+            state = "succeeded" if all(job.state == "succeeded" for job in self.jobs) else "failed"
+        elif any(job.state != "queued" for job in self.jobs):
+            state = "running"
+        else:
+            state = "queued"
+        return {
+            "id": self.id,
+            "kind": "bulk",
+            "action": self.action,
+            "state": state,
+            "ok": state == "succeeded" if self.done else None,
+            "queuedAt": _epoch_iso(self.queued_at),
+            "finishedAt": _epoch_iso(self.finished_at),
+            "units": units,
+        }
+
+
+@dataclass
+class _ActionSettings:
+    concurrency: int = 4  # systemctl actions running at once, across all units
+    retention_s: float = 3600.0  # finished jobs stay queryable this long
+    max_jobs: int = 1000
+
+
+_ACTION_SETTINGS = _ActionSettings()
+
+
+def _configure_actions(cfg: dict[str, object]) -> None:
+    raw = cfg.get("actions")
+    if raw is None:
+        raw = {}
+    if not isinstance(raw, dict):
+        raise ValueError("config.actions must be an object")
+    global _ACTION_SETTINGS, _ACTION_SCHEDULER
+    _ACTION_SETTINGS = _ActionSettings(
+        concurrency=max(1, _safe_int(raw.get("concurrency"), 4)),
+        retention_s=max(60.0, _safe_float(raw.get("jobRetentionSeconds"), 3600.0)),
+    )
+    _ACTION_SCHEDULER = _ActionScheduler(_ACTION_SETTINGS)
+
+
+class _ActionScheduler:
+    """Runs unit actions off the request threads as jobs.
+
+    Jobs for the same unit run one at a time in submission order (systemd would otherwise queue or
+    merge overlapping jobs unpredictably), at most `concurrency` run overall, and submitting the action
+    that is already last in a unit's queue returns that queued job instead of adding a duplicate.
+    """
+
+    def __init__(self, settings: _ActionSettings) -> None:
+        self.settings = settings
+        self.cond = threading.Condition()
+        self.jobs: OrderedDict[str, _ActionJob | _BulkJob] = OrderedDict()
+        self.pending: deque[_ActionJob] = deque()
+        self.busy_units: set[tuple[str, str, str]] = set()
+        self.running = 0
+        self.pool = ThreadPoolExecutor(max_workers=settings.concurrency, thread_name_prefix="unit-action")
+
+    def submit(self, spec: UnitSpec, action: str) -> _ActionJob:
+        key = _spec_key(spec)
+        with self.cond:
+            # Reusing a queued job is only order-preserving when nothing else is queued after it for
+            # this unit (restart, stop, restart must not collapse into restart, stop).
+            last = next((job for job in reversed(self.pending) if _spec_key(job.spec) == key), None)
+            if last is not None and last.bulk is None and last.action == action:
+                return last
+            job = _ActionJob(id=os.urandom(8).hex(), spec=spec, action=action)
+            self.jobs[job.id] = job
+            self.pending.append(job)
+            self._prune_locked()
+            self._dispatch_locked()
+        return job
+
+    def submit_bulk(self, specs: list[UnitSpec], action: str) -> _BulkJob:
+        bulk = _BulkJob(id=os.urandom(8).hex(), action=action)
+        with self.cond:
+            for spec in specs:
+                job = _ActionJob(id=os.urandom(8).hex(), spec=spec, action=action, bulk=bulk)
+                bulk.jobs.append(job)
+                self.pending.append(job)
+            self.jobs[bulk.id] = bulk
+            self._prune_locked()
+            self._dispatch_locked()
+        return bulk
+
+    def get(self, job_id: str) -> _ActionJob | _BulkJob | None:
+        with self.cond:
+            return self.jobs.get(job_id)
+
+    def _dispatch_locked(self) -> None:
+        if self.running >= self.settings.concurrency:
+            return
+        for job in list(self.pending):
+            key = _spec_key(job.spec)
+            if key in self.busy_units:
+                continue
+            self.pending.remove(job)
+            self.busy_units.add(key)
+            self.running += 1
+            job.state, job.started_at = "running", time.time()
+            self.pool.submit(self._run, job)
+            if self.running >= self.settings.concurrency:
+                return
+
+    def _run(self, job: _ActionJob) -> None:
+        state, result, status, error = "failed", None, None, None
+        try:
+            result = _systemctl_action(job.spec, job.action)
+            if job.bulk is None:
+                status = _systemctl_show(job.spec, _UNIT_STATUS_PROPS)
+            state = "succeeded" if int(result.get("exitCode") or 0) == 0 else "failed"
+        except Exception as e:  # noqa: BLE001
+            error = str(e) or e.__class__.__name__
+        bulk = job.bulk
+        with self.cond:
+            job.state, job.result, job.status, job.error = state, result, status, error
+            job.finished_at = time.time()
+            self.busy_units.discard(_spec_key(job.spec))
+            self.running -= 1
+            self._dispatch_locked()
+            if bulk is not None:
+                if bulk.finalizing or not all(j.done for j in bulk.jobs):
+                    bulk = None
+                else:
+                    bulk.finalizing = True
+            self.cond.notify_all()
+        if bulk is not None:
+            self._finish_bulk(bulk)
+        if job.bulk is None or bulk is not None:
+            _request_bots_refresh()  # once per bulk action, not once per unit
+
+    def _finish_bulk(self, bulk: _BulkJob) -> None:
+        try:
+            statuses = _systemctl_show_many([job.spec for job in bulk.jobs], _UNIT_STATUS_PROPS)
+        except Exception:  # noqa: BLE001
+            statuses = {}
+        with self.cond:
+            for job in bulk.jobs:
+                job.status = statuses.get(_spec_key(job.spec))
+            bulk.finished_at = time.time()
+            self.cond.notify_all()
+
+    def _prune_locked(self) -> None:
+        # Oldest first. Queued/running jobs are skipped, not a stopping point: a long-running job at
+        # the head must not keep the finished ones behind it around past their retention.
+        cutoff = time.time() - self.settings.retention_s
+        for job_id, job in list(self.jobs.items()):
+            if not job.done:
+                continue
+            if len(self.jobs) > self.settings.max_jobs or (job.finished_at or 0.0) < cutoff:
+                del self.jobs[job_id]
+
+    def shutdown(self) -> None:
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+_ACTION_SCHEDULER = _ActionScheduler(_ACTION_SETTINGS)
+
+
+_BULK_PATH = "/api/units/_bulk"
+_MAX_BODY_BYTES = 1024 * 1024
+
+
+def _bulk_request(config_path: Path, raw: bytes) -> tuple[list[UnitSpec], str]:
+    # Body: {"action": "restart", "units": ["a.service", ...]}. Config and unit specs are read once
+    # for the whole batch; duplicate units are dropped.
+    try:
+        body = json.loads(raw or b"null")
+    except ValueError:
+        raise _RequestError(400, "body must be JSON") from None
+    if not isinstance(body, dict):
+        raise _RequestError(400, "body must be an object with action and units")
+    action = str(body.get("action") or "")
+    if action not in _UNIT_ACTIONS:
+        raise _RequestError(400, "invalid action")
+    units = body.get("units")
+    if not isinstance(units, list) or not units or not all(isinstance(u, str) for u in units):
+        raise _RequestError(400, "units must be a non-empty list of unit names")
+    cfg = _load_config(config_path)
+    _, by_unit = _parse_unit_specs(cfg)
+    denied = [u for u in units if u not in by_unit]
+    if denied:
+        raise _RequestError(403, f"unit not allowed: {', '.join(denied)}")
+    return [by_unit[u] for u in dict.fromkeys(units)], action
+
+
+def _parse_logs_query(config_path: Path, unit: str, qs: dict[str, list[str]]) -> _LogsQuery:
+    def _arg(name: str) -> str:
+        return str((qs.get(name) or [""])[0] or "").strip()
+
+    cfg = _load_config(config_path)
+    _, by_unit = _parse_unit_specs(cfg)
+    if unit not in by_unit:
+        raise _RequestError(403, "unit not allowed")
+    spec = by_unit[unit]
+
+    structured = _arg("format").lower() == "json"
+    lines = _safe_int(_arg("lines") or "200", 200)
+    lines = max(1 if structured else 10, min(2000, lines))
+    since_raw = _arg("since")
+    since_dt: _dt.datetime | None = None
+    if since_raw:
+        if since_raw.lower() == "active":
+            since_dt = _active_since(spec)
+        else:
+            since_dt = _since_from_query(since_raw)
+    q = _LogsQuery(unit=unit, spec=spec, lines=lines, since_raw=since_raw, since_dt=since_dt)
+    if not structured:
+        return q
+
+    q.structured = True
+    q.before, q.after = _arg("before") or None, _arg("after") or None
+    if q.before and q.after:
+        raise _RequestError(400, "use either before or after")
+    for cur in (q.before, q.after):
+        if cur and not _JOURNAL_CURSOR_RE.match(cur):
+            raise _RequestError(400, "invalid cursor")
+    q.priority = _arg("priority").lower() or None
+    if q.priority and not _JOURNAL_PRIORITY_RE.match(q.priority):
+        raise _RequestError(400, "invalid priority")
+    q.grep = _arg("grep") or None
+    if q.grep:
+        if len(q.grep) > 256:
+            raise _RequestError(400, "grep pattern too long")
+        try:
+            re.compile(q.grep)
+        except re.error as e:
+            raise _RequestError(400, f"invalid grep pattern: {e}") from None
+    return q
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    etag = etag[2:] if etag.startswith("W/") else etag
+    for tok in if_none_match.split(","):
+        tok = tok.strip()
+        if tok.startswith("W/"):
+            tok = tok[2:]  # nginx weakens ETags when it gzips; weak comparison is fine for GET
+        for suffix in ('-gzip"', '-br"'):
+            if tok.endswith(suffix):
+                tok = tok[: -len(suffix)] + '"'  # any encoding of the same content
+        if tok == "*" or tok == etag:
+            return True
+    return False
+
+
+def _response_parts(
+    code: int,
+    raw: bytes,
+    content_type: str,
+    *,
+    etag: str | None,
+    if_none_match: str,
+    accept_encoding: str,
+) -> tuple[int, list[tuple[str, str]], bytes]:
+    # Status, headers and body for a complete response, shared by both server modes.
+    # Responses with an ETag may be stored but must be revalidated (If-None-Match -> 304).
+    # They're also the cacheable ones, so they get compressed once per ETag.
+    encoding = None
+    if etag and code == 200 and len(raw) >= _COMPRESS_MIN_BYTES:
+        encoding = _pick_encoding(accept_encoding)
+    rep_etag = f'{etag[:-1]}-{encoding}"' if etag and encoding else etag
+    if etag and code == 200 and _etag_matches(if_none_match, etag):
+        headers = [("ETag", rep_etag or etag), ("Cache-Control", "no-cache"), ("Vary", "Accept-Encoding")]
+        return 304, headers, b""
+    if etag and encoding:
+        raw = _compressed_variant(raw, etag, encoding)
+    headers = [("Content-Type", f"{content_type}; charset=utf-8"), ("Content-Length", str(len(raw)))]
+    if encoding:
+        headers.append(("Content-Encoding", encoding))
+    if etag and code == 200:
+        headers += [("ETag", rep_etag or etag), ("Vary", "Accept-Encoding"), ("Cache-Control", "no-cache")]
+    else:
+        headers.append(("Cache-Control", "no-store"))
+    return code, headers, raw
 
 
 class Handler(BaseHTTPRequestHandler):
     server_version = "bots-dashboard/1.0"
 
     def _send(self, code: int, body: str, content_type: str = "application/json") -> None:
-        raw = body.encode("utf-8")
+        self._send_bytes(code, body.encode("utf-8"), content_type)
+
+    def _send_bytes(
+        self,
+        code: int,
+        raw: bytes,
+        content_type: str = "application/json",
+        *,
+        etag: str | None = None,
+    ) -> None:
+        code, headers, raw = _response_parts(
+            code,
+            raw,
+            content_type,
+            etag=etag,
+            if_none_match=self.headers.get("If-None-Match") or "",
+            accept_encoding=self.headers.get("Accept-Encoding") or "",
+        )
         self.send_response(code)
-        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
-        self.send_header("Content-Length", str(len(raw)))
-        self.send_header("Cache-Control", "no-store")
+        for name, value in headers:
+            self.send_header(name, value)
         self.end_headers()
-        if self.command != "HEAD":
+        if self.command != "HEAD" and raw:
             self.wfile.write(raw)
 
-    def _send_json(self, code: int, obj: object) -> None:
-        self._send(code, _json_dumps(obj), "application/json")
+    def _send_json(self, code: int, obj: object, *, revalidate: bool = False) -> None:
+        raw = _json_dumps(obj).encode("utf-8")
+        self._send_bytes(code, raw, "application/json", etag=_etag_for(raw) if revalidate else None)
+
+    def _stream_bots(self) -> None:
+        # Server-Sent Events: a full snapshot first, then one patch per payload build. Bodies are
+        # serialized once per build and shared by every open dashboard.
+        config_path: Path = self.server.config_path  # type: ignore[attr-defined]
+        try:
+            _get_bots_payload_entry(config_path)
+        except Exception as e:  # noqa: BLE001
+            return self._send_json(500, {"error": str(e)})
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("X-Accel-Buffering", "no")
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+
+        cache = _BOTS_PAYLOAD_CACHE
+        sent_gen = -1
+        try:
+            self.wfile.write(b"retry: 5000\n\n")
+            self.wfile.flush()
+            while True:
+                with cache.cond:
+                    # Builds notify the condition even when they change nothing; only a new
+                    # generation (or the heartbeat) is worth writing for.
+                    cache.cond.wait_for(lambda: cache.generation != sent_gen, _STREAM_HEARTBEAT_S)
+                    gen, body, event = _bots_stream_event_locked(cache, sent_gen)
+                    refresher_running = cache.refresher_running
+
+                if gen == sent_gen or body is None:
+                    if not refresher_running:
+                        # Nobody rebuilds in the background; let this stream drive on-demand builds.
+                        try:
+                            _get_bots_payload_entry(config_path)
+                        except Exception:  # noqa: BLE001
+                            pass
+                    self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+                    continue
+
+                self.wfile.write(f"id: {gen}\nevent: {event}\ndata: ".encode("utf-8") + body + b"\n\n")
+                self.wfile.flush()
+                sent_gen = gen
+        except (BrokenPipeError, ConnectionResetError, TimeoutError, OSError):
+            return
+
+    def _stream_logs(self, spec: UnitSpec, lines: int) -> None:
+        # SSE follow mode for one unit: the last `lines` entries, then new ones as journald gets them.
+        # Event ids are "<follower epoch>:<seq>" so an EventSource reconnect resumes without repeats.
+        if self.command == "HEAD":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("X-Accel-Buffering", "no")
+            self.end_headers()
+            return
+        follower = _subscribe_journal(spec)
+        if follower is None:
+            return self._send_json(429, {"error": "too many log streams"})
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("X-Accel-Buffering", "no")
+            self.end_headers()
+
+            with follower.cond:
+                follower.cond.wait_for(lambda: follower.primed, timeout=5.0)
+                sent = follower.start_seq_locked(lines, str(self.headers.get("Last-Event-ID") or ""))
+
+            self.wfile.write(b"retry: 5000\n\n")
+            self.wfile.flush()
+            while True:
+                with follower.cond:
+                    if follower.seq == sent and not follower.closed:
+                        follower.cond.wait(_STREAM_HEARTBEAT_S)
+                    out, sent = follower.sse_since_locked(sent)
+                    closed = follower.closed
+                if out:
+                    self.wfile.write(out)
+                elif closed:
+                    self.wfile.write(b"event: end\ndata: {}\n\n")
+                    self.wfile.flush()
+                    return
+                else:
+                    self.wfile.write(b": keepalive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, TimeoutError, OSError):
+            return
+        finally:
+            _unsubscribe_journal(follower)
 
     def do_GET(self) -> None:  # noqa: N802
         parsed = urlparse(self.path)
         if parsed.path == "/healthz":
             return self._send_json(200, {"ok": True})
 
+        if parsed.path == "/api/stream":
+            return self._stream_bots()
+
         if parsed.path == "/api/bots":
             try:
-                payload = _get_bots_payload(self.server.config_path)  # type: ignore[attr-defined]
-                return self._send_json(200, payload)
+                since_raw = str((parse_qs(parsed.query).get("since") or [""])[0] or "").strip()
+                if since_raw:
+                    body, etag = _get_bots_patch_body(self.server.config_path, _safe_int(since_raw, 0))  # type: ignore[attr-defined]
+                else:
+                    _, body, etag = _get_bots_payload_entry(self.server.config_path)  # type: ignore[attr-defined]
+                return self._send_bytes(200, body, etag=etag)
             except Exception as e:  # noqa: BLE001
                 return self._send_json(500, {"error": str(e)})
 
+        if parsed.path == "/api/usage/history":
+            return self._usage_history(parse_qs(parsed.query))
+
+        m = re.match(r"^/api/jobs/([0-9a-f]{1,32})$", parsed.path)
+        if m:
+            job = _ACTION_SCHEDULER.get(m.group(1))
+            if job is None:
+                return self._send_json(404, {"error": "unknown job"})
+            return self._send_json(200, job.to_json())
+
         m = re.match(r"^/api/units/([^/]+)/details$", parsed.path)
         if m:
             unit = unquote(m.group(1))
@@ -1351,41 +4365,85 @@ class Handler(BaseHTTPRequestHandler):
                     },
                     "unitFile": unit_file,
                 },
+                revalidate=True,
             )
 
-        m = re.match(r"^/api/units/([^/]+)/logs$", parsed.path)
+        m = re.match(r"^/api/units/([^/]+)/logs/stream$", parsed.path)
         if m:
             unit = unquote(m.group(1))
-            qs = parse_qs(parsed.query)
-            lines = _safe_int((qs.get("lines") or ["200"])[0], 200)
-            lines = max(10, min(2000, lines))
-            since_raw = str((qs.get("since") or [""])[0] or "").strip()
+            lines = _safe_int((parse_qs(parsed.query).get("lines") or ["200"])[0], 200)
+            lines = max(0, min(_LOG_FOLLOW_BUFFER, lines))
             cfg = _load_config(self.server.config_path)  # type: ignore[attr-defined]
             _, by_unit = _parse_unit_specs(cfg)
             if unit not in by_unit:
                 return self._send_json(403, {"error": "unit not allowed"})
+            return self._stream_logs(by_unit[unit], lines)
 
-            since_dt: _dt.datetime | None = None
-            if since_raw:
-                if since_raw.lower() == "active":
-                    since_dt = _active_since(by_unit[unit])
-                else:
-                    since_dt = _since_from_query(since_raw)
-
-            logs = _collect_journal(by_unit[unit], lines, since=since_dt)
-            return self._send_json(
-                200,
-                {
-                    "unit": unit,
-                    "lines": lines,
-                    "since": since_raw or None,
-                    "sinceResolvedAt": since_dt.isoformat().replace("+00:00", "Z") if since_dt else None,
-                    "logs": logs,
-                },
-            )
+        m = re.match(r"^/api/units/([^/]+)/logs$", parsed.path)
+        if m:
+            try:
+                q = _parse_logs_query(self.server.config_path, unquote(m.group(1)), parse_qs(parsed.query))  # type: ignore[attr-defined]
+            except _RequestError as e:
+                return self._send_json(e.code, {"error": str(e)})
+            code, body, etag = q.response(_run(q.cmd(), timeout_s=30))
+            return self._send_bytes(code, _json_dumps(body).encode("utf-8"), etag=etag)
 
         return self._send_json(404, {"error": "not found"})
 
+    def _usage_history(self, qs: dict[str, list[str]]) -> None:
+        def _arg(name: str) -> str:
+            return str((qs.get(name) or [""])[0] or "").strip()
+
+        unit = _arg("unit")
+        cfg = _load_config(self.server.config_path)  # type: ignore[attr-defined]
+        _, by_unit = _parse_unit_specs(cfg)
+        if unit not in by_unit:
+            return self._send_json(403, {"error": "unit not allowed"})
+
+        now = _utcnow()
+
+        def _when(raw: str, default: _dt.datetime) -> _dt.datetime | None:
+            # ISO timestamps, epoch seconds, or a relative age like "30d" (= that long ago).
+            if not raw:
+                return default
+            return _parse_iso(raw) or _since_from_query(raw)
+
+        since = _when(_arg("from"), now - _dt.timedelta(days=365))
+        until = _when(_arg("to"), now)
+        if since is None or until is None or since >= until:
+            return self._send_json(400, {"error": "invalid from/to"})
+        step = (_arg("step") or "1d").lower()
+        m = _USAGE_HISTORY_STEP_RE.match(step)
+        if step != "month" and (not m or int(m.group(1)) <= 0):
+            return self._send_json(400, {"error": "step must be like 1h, 6h, 1d, 7d or month"})
+        if m:
+            step_s = int(m.group(1)) * (86400 if m.group(2) == "d" else 3600)
+            if (until - since).total_seconds() / step_s > _USAGE_HISTORY_MAX_POINTS:
+                return self._send_json(400, {"error": "too many points; use a larger step"})
+
+        try:
+            state_dir = _detect_bot_def(by_unit[unit], _systemctl_show(by_unit[unit], ["FragmentPath"])).state_dir
+        except Exception as e:  # noqa: BLE001
+            return self._send_json(500, {"error": str(e)})
+        if state_dir is None:
+            return self._send_json(404, {"error": "unit has no usage state"})
+
+        try:
+            body = _usage_history(
+                state_dir,
+                since=since,
+                until=until,
+                step=step,
+                provider=_arg("provider") or None,
+                model=_arg("model") or None,
+            )
+        except ValueError as e:
+            return self._send_json(404, {"error": str(e)})
+        except sqlite3.Error as e:
+            return self._send_json(500, {"error": str(e)})
+        body["unit"] = unit
+        return self._send_json(200, body)
+
     def do_HEAD(self) -> None:  # noqa: N802
         return self.do_GET()
 
@@ -1408,63 +4466,476 @@ class Handler(BaseHTTPRequestHandler):
                 },
             )
 
-        m = re.match(r"^/api/units/([^/]+)/([^/]+)$", parsed.path)
+        if parsed.path == _BULK_PATH:
+            length = _safe_int(self.headers.get("Content-Length"), 0)
+            if length < 0 or length > _MAX_BODY_BYTES:
+                return self._send_json(413, {"error": "body too large"})
+            try:
+                specs, action = _bulk_request(self.server.config_path, self.rfile.read(length))  # type: ignore[attr-defined]
+            except _RequestError as e:
+                return self._send_json(e.code, {"error": str(e)})
+            bulk = _ACTION_SCHEDULER.submit_bulk(specs, action)
+            return self._send_json(202, {"ok": True, "jobId": bulk.id, "job": bulk.to_json()})
+
+        m = _UNIT_ACTION_PATH_RE.match(parsed.path)
         if not m:
             return self._send_json(404, {"error": "not found"})
 
-        unit = unquote(m.group(1))
-        action = unquote(m.group(2))
-        if action not in {"start", "stop", "restart", "enable", "disable"}:
-            return self._send_json(400, {"error": "invalid action"})
-
-        cfg = _load_config(self.server.config_path)  # type: ignore[attr-defined]
-        _, by_unit = _parse_unit_specs(cfg)
-        if unit not in by_unit:
-            return self._send_json(403, {"error": "unit not allowed"})
-
+        unit, action = unquote(m.group(1)), unquote(m.group(2))
         try:
-            spec = by_unit[unit]
-            result = _systemctl_action(spec, action)
-            show = _systemctl_show(spec, ["LoadState", "ActiveState", "SubState", "UnitFileState", "MainPID"])
-            ok = int(result.get("exitCode") or 0) == 0
-            return self._send_json(
-                200 if ok else 500,
-                {
-                    "ok": ok,
-                    "unit": unit,
-                    "action": action,
-                    "result": result,
-                    "status": show,
-                },
-            )
-        except Exception as e:  # noqa: BLE001
-            return self._send_json(500, {"error": str(e)})
+            spec = _action_unit_spec(self.server.config_path, unit, action)  # type: ignore[attr-defined]
+        except _RequestError as e:
+            return self._send_json(e.code, {"error": str(e)})
+
+        job = _ACTION_SCHEDULER.submit(spec, action)
+        return self._send_json(202, {"ok": True, "jobId": job.id, "job": job.to_json()})
 
     def log_message(self, fmt: str, *args: object) -> None:
         # Keep journald noise low.
         return
 
 
+@dataclass
+class _ServerSettings:
+    mode: str = "threading"  # "threading" (thread per connection) | "asyncio"
+    workers: int = 16  # asyncio: threads for blocking/CPU-bound routes (payload builds, usage, D-Bus)
+    keep_alive_s: float = 15.0  # asyncio: idle time before a keep-alive connection is closed
+    max_connections: int = 512  # asyncio: further connections get 503
+
+
+_SERVER_MODES = ("threading", "asyncio")
+_ASYNC_MAX_HEADER_BYTES = 64 * 1024
+
+
+def _server_settings(cfg: dict[str, object]) -> _ServerSettings:
+    raw = cfg.get("server")
+    if raw is None:
+        raw = {}
+    if not isinstance(raw, dict):
+        raise ValueError("config.server must be an object")
+    mode = str(raw.get("mode") or "threading").strip().lower()
+    if mode not in _SERVER_MODES:
+        raise ValueError(f"config.server.mode must be one of {', '.join(_SERVER_MODES)}")
+    return _ServerSettings(
+        mode=mode,
+        workers=max(1, _safe_int(raw.get("workers"), 16)),
+        keep_alive_s=max(1.0, _safe_float(raw.get("keepAliveSeconds"), 15.0)),
+        max_connections=max(1, _safe_int(raw.get("maxConnections"), 512)),
+    )
+
+
+@dataclass
+class _AsyncRequest:
+    method: str
+    target: str
+    version: str
+    headers: http.client.HTTPMessage
+    raw: bytes  # head + body as received, replayed into Handler for executor-served routes
+    keep_alive: bool
+
+
+class _BufferedConnection:
+    # Socket stand-in that lets Handler serve one fully-read request with the response kept in memory.
+    def __init__(self, request: bytes) -> None:
+        self._request = request
+        self.response = bytearray()
+
+    def makefile(self, mode: str, *args: object) -> io.BytesIO:
+        return io.BytesIO(self._request)
+
+    def sendall(self, data: bytes) -> None:
+        self.response += data
+
+
+class _BufferedHandler(Handler):
+    # Keep-alive is decided by the asyncio front end; the body (if any) has already been read.
+    protocol_version = "HTTP/1.1"
+
+    def handle_expect_100(self) -> bool:
+        return True
+
+
+class _AsyncHTTPServer:
+    """asyncio front end with the same routes and JSON as `Handler`.
+
+    Connections, keep-alive and the SSE streams live on the event loop, journalctl for logs runs via
+    `asyncio.create_subprocess_exec`, and actions are handed to the action scheduler. Everything else (payload builds with
+    usage parsing, details, history) runs the regular Handler in a bounded thread pool, so an idle
+    dashboard costs a socket rather than a thread and a burst of requests can't spawn unbounded work.
+    """
+
+    def __init__(self, config_path: Path, settings: _ServerSettings) -> None:
+        self.config_path = config_path
+        self.settings = settings
+        self.pool = ThreadPoolExecutor(max_workers=settings.workers, thread_name_prefix="http-worker")
+        self.connections = 0
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.bots_changed: asyncio.Event | None = None
+        self.clients: set[asyncio.Task[Any]] = set()
+        self.stopping = False
+
+    async def serve(self, host: str, port: int) -> None:
+        # Returns once SIGTERM/SIGINT arrives and every connection (SSE streams included) has been
+        # cancelled and has run its cleanup; main() then flushes checkpoints as usual.
+        self.loop = asyncio.get_running_loop()
+        self.bots_changed = asyncio.Event()
+        with _BOTS_PAYLOAD_CACHE.cond:
+            _BOTS_PAYLOAD_CACHE.listeners.append(self._on_bots_built)
+        stop = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            self.loop.add_signal_handler(sig, stop.set)
+        server = await asyncio.start_server(self._client, host, port, limit=_ASYNC_MAX_HEADER_BYTES)
+        async with server:
+            await stop.wait()
+            server.close()
+            self.stopping = True
+            for task in list(self.clients):
+                task.cancel()
+            await asyncio.gather(*self.clients, return_exceptions=True)
+
+    def close(self) -> None:
+        with _BOTS_PAYLOAD_CACHE.cond:
+            if self._on_bots_built in _BOTS_PAYLOAD_CACHE.listeners:
+                _BOTS_PAYLOAD_CACHE.listeners.remove(self._on_bots_built)
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _on_bots_built(self) -> None:
+        # Builder thread, under the cache lock: hand the wakeup to the loop.
+        loop = self.loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._wake_bots_streams)
+            except RuntimeError:
+                pass  # closed between the check and the call
+
+    def _wake_bots_streams(self) -> None:
+        changed, self.bots_changed = self.bots_changed, asyncio.Event()
+        if changed is not None:
+            changed.set()
+
+    async def _call(self, fn: Callable[..., Any], *args: object) -> Any:
+        assert self.loop is not None
+        return await self.loop.run_in_executor(self.pool, fn, *args)
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self.connections >= self.settings.max_connections:
+            writer.write(self._head(503, [("Content-Length", "0")], keep_alive=False))
+            writer.close()
+            return
+        self.connections += 1
+        task = asyncio.current_task()
+        if task is not None:
+            self.clients.add(task)
+        try:
+            while True:
+                req = await self._read_request(reader, writer)
+                if req is None:
+                    break
+                try:
+                    keep_alive = await self._dispatch(req, writer, writer.get_extra_info("peername"))
+                except (ConnectionError, asyncio.CancelledError):
+                    raise
+                except Exception as e:  # noqa: BLE001
+                    req.keep_alive = False
+                    await self._send_json(writer, req, 500, {"error": str(e)})
+                    break
+                if not (keep_alive and req.keep_alive):
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            pass
+        except asyncio.CancelledError:
+            if not self.stopping:
+                raise
+            # Shutdown cancelled this connection; ending normally keeps asyncio from logging it.
+        finally:
+            self.connections -= 1
+            if task is not None:
+                self.clients.discard(task)
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> _AsyncRequest | None:
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.settings.keep_alive_s)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+            return None  # client closed or went idle
+        except (asyncio.LimitOverrunError, ValueError):
+            writer.write(self._head(431, [("Content-Length", "0")], keep_alive=False))
+            return None
+        request_line, _, rest = head.partition(b"\r\n")
+        parts = request_line.decode("latin-1").split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            writer.write(self._head(400, [("Content-Length", "0")], keep_alive=False))
+            return None
+        method, target, version = parts
+        headers = http.client.parse_headers(io.BytesIO(rest))
+        if headers.get("Transfer-Encoding"):
+            writer.write(self._head(501, [("Content-Length", "0")], keep_alive=False))
+            return None
+        length = _safe_int(headers.get("Content-Length"), 0)
+        if length < 0 or length > _MAX_BODY_BYTES:
+            writer.write(self._head(413, [("Content-Length", "0")], keep_alive=False))
+            return None
+        body = b""
+        if length:
+            if (headers.get("Expect") or "").lower() == "100-continue":
+                writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+            body = await asyncio.wait_for(reader.readexactly(length), self.settings.keep_alive_s)
+        conn = (headers.get("Connection") or "").lower()
+        # HTTP/1.0 clients (and nginx's default upstream connections) get one request per connection.
+        keep_alive = version == "HTTP/1.1" and "close" not in conn
+        return _AsyncRequest(method, target, version, headers, head + body, keep_alive)
+
+    async def _dispatch(self, req: _AsyncRequest, writer: asyncio.StreamWriter, peer: Any) -> bool:
+        # Returns whether the connection can serve another request.
+        parsed = urlparse(req.target)
+        if req.method in ("GET", "HEAD"):
+            if parsed.path == "/api/stream":
+                await self._stream_bots(req, writer)
+                return False
+            m = re.match(r"^/api/units/([^/]+)/logs/stream$", parsed.path)
+            if m:
+                await self._stream_logs(req, writer, unquote(m.group(1)), parse_qs(parsed.query))
+                return False
+            m = re.match(r"^/api/units/([^/]+)/logs$", parsed.path)
+            if m:
+                await self._logs(req, writer, unquote(m.group(1)), parse_qs(parsed.query))
+                return True
+        elif req.method == "POST":
+            m = _UNIT_ACTION_PATH_RE.match(parsed.path)
+            if m:
+                await self._action(req, writer, unquote(m.group(1)), unquote(m.group(2)))
+                return True
+
+        raw = await self._call(self._handle_buffered, req.raw, peer)
+        writer.write(raw)
+        await writer.drain()
+        head = raw.partition(b"\r\n\r\n")[0]
+        return re.search(rb"\r\nconnection:[ \t]*close", head, re.IGNORECASE) is None
+
+    def _handle_buffered(self, raw: bytes, peer: Any) -> bytes:
+        conn = _BufferedConnection(raw)
+        _BufferedHandler(conn, peer if isinstance(peer, tuple) else ("", 0), self)  # type: ignore[arg-type]
+        return bytes(conn.response)
+
+    def _head(self, code: int, headers: list[tuple[str, str]], *, keep_alive: bool) -> bytes:
+        lines = [
+            f"HTTP/1.1 {code} {HTTPStatus(code).phrase}",
+            f"Server: {Handler.server_version}",
+            f"Date: {email.utils.formatdate(usegmt=True)}",
+            *(f"{k}: {v}" for k, v in headers),
+        ]
+        if not keep_alive:
+            lines.append("Connection: close")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _send_bytes(
+        self, writer: asyncio.StreamWriter, req: _AsyncRequest, code: int, raw: bytes, *, etag: str | None = None
+    ) -> None:
+        code, headers, raw = _response_parts(
+            code,
+            raw,
+            "application/json",
+            etag=etag,
+            if_none_match=req.headers.get("If-None-Match") or "",
+            accept_encoding=req.headers.get("Accept-Encoding") or "",
+        )
+        writer.write(self._head(code, headers, keep_alive=req.keep_alive))
+        if req.method != "HEAD" and raw:
+            writer.write(raw)
+        await writer.drain()
+
+    async def _send_json(self, writer: asyncio.StreamWriter, req: _AsyncRequest, code: int, obj: object) -> None:
+        await self._send_bytes(writer, req, code, _json_dumps(obj).encode("utf-8"))
+
+    def _stream_head(self) -> bytes:
+        headers = [
+            ("Content-Type", "text/event-stream; charset=utf-8"),
+            ("Cache-Control", "no-store"),
+            ("X-Accel-Buffering", "no"),
+        ]
+        return self._head(200, headers, keep_alive=False)
+
+    async def _logs(self, req: _AsyncRequest, writer: asyncio.StreamWriter, unit: str, qs: dict[str, list[str]]) -> None:
+        try:
+            q: _LogsQuery = await self._call(_parse_logs_query, self.config_path, unit, qs)
+        except _RequestError as e:
+            return await self._send_json(writer, req, e.code, {"error": str(e)})
+        code, body, etag = q.response(await _run_async(q.cmd(), timeout_s=30))
+        await self._send_bytes(writer, req, code, _json_dumps(body).encode("utf-8"), etag=etag)
+
+    async def _action(self, req: _AsyncRequest, writer: asyncio.StreamWriter, unit: str, action: str) -> None:
+        try:
+            spec: UnitSpec = await self._call(_action_unit_spec, self.config_path, unit, action)
+        except _RequestError as e:
+            return await self._send_json(writer, req, e.code, {"error": str(e)})
+        job = _ACTION_SCHEDULER.submit(spec, action)
+        await self._send_json(writer, req, 202, {"ok": True, "jobId": job.id, "job": job.to_json()})
+
+    async def _stream_bots(self, req: _AsyncRequest, writer: asyncio.StreamWriter) -> None:
+        # Same events as Handler._stream_bots; waits on the loop instead of in a thread.
+        try:
+            await self._call(_get_bots_payload_entry, self.config_path)
+        except Exception as e:  # noqa: BLE001
+            req.keep_alive = False
+            return await self._send_json(writer, req, 500, {"error": str(e)})
+
+        writer.write(self._stream_head())
+        if req.method == "HEAD":
+            return await writer.drain()
+
+        cache = _BOTS_PAYLOAD_CACHE
+        sent_gen = -1
+        writer.write(b"retry: 5000\n\n")
+        while True:
+            changed = self.bots_changed
+            assert changed is not None
+            with cache.cond:
+                gen, body, event = _bots_stream_event_locked(cache, sent_gen)
+                refresher_running = cache.refresher_running
+            if gen != sent_gen and body is not None:
+                writer.write(f"id: {gen}\nevent: {event}\ndata: ".encode("utf-8") + body + b"\n\n")
+                await writer.drain()
+                sent_gen = gen
+                continue
+
+            await writer.drain()
+            try:
+                await asyncio.wait_for(changed.wait(), _STREAM_HEARTBEAT_S)
+                continue
+            except asyncio.TimeoutError:
+                pass
+            if not refresher_running:
+                # Nobody rebuilds in the background; let this stream drive on-demand builds.
+                try:
+                    await self._call(_get_bots_payload_entry, self.config_path)
+                except Exception:  # noqa: BLE001
+                    pass
+            writer.write(b": keepalive\n\n")
+
+    async def _stream_logs(
+        self, req: _AsyncRequest, writer: asyncio.StreamWriter, unit: str, qs: dict[str, list[str]]
+    ) -> None:
+        # Same events as Handler._stream_logs, from the same shared per-unit follower.
+        lines = max(0, min(_LOG_FOLLOW_BUFFER, _safe_int((qs.get("lines") or ["200"])[0], 200)))
+        cfg = await self._call(_load_config, self.config_path)
+        _, by_unit = _parse_unit_specs(cfg)
+        req.keep_alive = False
+        if unit not in by_unit:
+            return await self._send_json(writer, req, 403, {"error": "unit not allowed"})
+        if req.method == "HEAD":
+            writer.write(self._stream_head())
+            return await writer.drain()
+        follower: _JournalFollower | None = await self._call(_subscribe_journal, by_unit[unit])
+        if follower is None:
+            return await self._send_json(writer, req, 429, {"error": "too many log streams"})
+
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+
+        def _wake() -> None:
+            # Follower reader thread. The loop may already be closed (shutdown, or this stream ended
+            # between the notify and the discard below); there is nobody left to wake then.
+            try:
+                loop.call_soon_threadsafe(changed.set)
+            except RuntimeError:
+                pass
+
+        try:
+            with follower.cond:
+                follower.listeners.add(_wake)
+            writer.write(self._stream_head())
+            last_event_id = str(req.headers.get("Last-Event-ID") or "")
+            deadline = loop.time() + 5.0
+            while True:
+                changed.clear()
+                with follower.cond:
+                    primed = follower.primed
+                    sent = follower.start_seq_locked(lines, last_event_id)
+                if primed or loop.time() >= deadline:
+                    break
+                try:
+                    await asyncio.wait_for(changed.wait(), max(0.0, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    pass
+
+            writer.write(b"retry: 5000\n\n")
+            while True:
+                changed.clear()
+                with follower.cond:
+                    out, sent = follower.sse_since_locked(sent)
+                    closed = follower.closed
+                if out:
+                    writer.write(out)
+                elif closed:
+                    writer.write(b"event: end\ndata: {}\n\n")
+                    return await writer.drain()
+                else:
+                    await writer.drain()
+                    try:
+                        await asyncio.wait_for(changed.wait(), _STREAM_HEARTBEAT_S)
+                        continue
+                    except asyncio.TimeoutError:
+                        writer.write(b": keepalive\n\n")
+                await writer.drain()
+        finally:
+            with follower.cond:
+                follower.listeners.discard(_wake)
+            await self._call(_unsubscribe_journal, follower)
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="Bots Dashboard API")
     ap.add_argument("--host", default="127.0.0.1")
     ap.add_argument("--port", type=int, default=8124)
     ap.add_argument("--config", type=Path, default=DEFAULT_CONFIG_PATH)
+    ap.add_argument("--mode", choices=_SERVER_MODES, help="server core (default: config.server.mode)")
     args = ap.parse_args()
 
     cfg_path = args.config.resolve()
     if not cfg_path.exists():
         raise SystemExit(f"Config not found: {cfg_path}")
 
-    httpd = ThreadingHTTPServer((args.host, args.port), Handler)
-    httpd.config_path = cfg_path  # type: ignore[attr-defined]
-    print(f"bots-dashboard listening on http://{args.host}:{args.port} (config {cfg_path})", flush=True)
+    cfg = _load_config(cfg_path)
+    _configure_systemd_backend(cfg)
+    _configure_usage_checkpoints(cfg)
+    _configure_usage_scan(cfg)
+    _configure_usage_history(cfg)
+    _configure_actions(cfg)
+
+    global _BOTS_REFRESHER
+    _BOTS_REFRESHER = _BotsRefresher(cfg_path)
+    _BOTS_REFRESHER.start()
+
+    settings = _server_settings(cfg)
+    if args.mode:
+        settings.mode = args.mode
+    serve: Callable[[], object]
+    close: Callable[[], None]
+    if settings.mode == "asyncio":
+        aserver = _AsyncHTTPServer(cfg_path, settings)
+        serve = lambda: asyncio.run(aserver.serve(args.host, args.port))  # noqa: E731
+        close = aserver.close
+    else:
+        httpd = ThreadingHTTPServer((args.host, args.port), Handler)
+        httpd.config_path = cfg_path  # type: ignore[attr-defined]
+        serve, close = httpd.serve_forever, httpd.server_close
+    # systemd stops us with SIGTERM; unwind through the finally below so checkpoints get flushed.
+    # The asyncio core installs its own handlers and returns from serve() instead.
+    if settings.mode != "asyncio":
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(
+        f"bots-dashboard listening on http://{args.host}:{args.port} (config {cfg_path}, {settings.mode})",
+        flush=True,
+    )
     try:
-        httpd.serve_forever()
+        serve()
     except KeyboardInterrupt:
         return 0
     finally:
-        httpd.server_close()
+        close()
+        _ACTION_SCHEDULER.shutdown()
+        _stop_journal_followers()
+        _flush_usage_checkpoints()
     return 0
 
 
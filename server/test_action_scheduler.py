@@ -0,0 +1,142 @@
+"""Unit action scheduling: per-unit serialization, coalescing, the concurrency cap, bulk jobs, pruning.
+
+systemctl is faked; every action blocks until the test releases it. Run with `python -m unittest`
+(or pytest) from this directory.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+from typing import Callable
+
+import server as S
+
+
+class ActionSchedulerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.started: list[tuple[str, str]] = []
+        self.gates: dict[tuple[str, str], threading.Event] = {}
+        self.lock = threading.Lock()
+        self.refreshes = 0
+        self.show_many_calls = 0
+        self.closed = False  # set at cleanup: nothing blocks any more
+
+        def action(spec: S.UnitSpec, action: str) -> dict[str, object]:
+            with self.lock:
+                self.started.append((spec.unit, action))
+                gate = self.gates.setdefault((spec.unit, action), threading.Event())
+                if self.closed:
+                    gate.set()
+            gate.wait(10)
+            return {"exitCode": 0, "stdout": "", "stderr": ""}
+
+        def show_many(specs: list[S.UnitSpec], props: list[str]) -> dict[tuple[str, str, str], dict[str, str]]:
+            self.show_many_calls += 1
+            return {S._spec_key(s): {"ActiveState": "active"} for s in specs}
+
+        def refresh() -> None:
+            self.refreshes += 1
+
+        saved = S._systemctl_action, S._systemctl_show, S._systemctl_show_many, S._request_bots_refresh
+        self.addCleanup(self._restore, saved)
+        S._systemctl_action = action
+        S._systemctl_show = lambda spec, props: {"ActiveState": "active"}
+        S._systemctl_show_many = show_many
+        S._request_bots_refresh = refresh
+        self.sched = S._ActionScheduler(S._ActionSettings(concurrency=2, retention_s=3600.0, max_jobs=1000))
+        self.addCleanup(self.sched.pool.shutdown, wait=True)
+        self.addCleanup(self._release_all)
+
+    def _restore(self, saved: tuple[object, ...]) -> None:
+        S._systemctl_action, S._systemctl_show, S._systemctl_show_many, S._request_bots_refresh = saved
+
+    def _release(self, unit: str, action: str) -> None:
+        with self.lock:
+            self.gates.setdefault((unit, action), threading.Event()).set()
+
+    def _release_all(self) -> None:
+        with self.lock:
+            self.closed = True
+            for gate in self.gates.values():
+                gate.set()
+
+    def _wait(self, pred: Callable[[], bool], timeout: float = 5.0) -> None:
+        deadline = time.monotonic() + timeout
+        while not pred():
+            if time.monotonic() > deadline:
+                self.fail("timed out")
+            time.sleep(0.01)
+
+    def test_one_unit_runs_its_jobs_in_order(self) -> None:
+        a = S.UnitSpec(unit="a.service")
+        first = self.sched.submit(a, "restart")
+        second = self.sched.submit(a, "stop")
+        third = self.sched.submit(a, "start")
+        self._wait(lambda: first.state == "running")
+        self.assertEqual((second.state, third.state), ("queued", "queued"))
+        for action in ("restart", "stop", "start"):
+            self._release("a.service", action)
+        self._wait(lambda: third.done)
+        self.assertEqual(self.started, [("a.service", "restart"), ("a.service", "stop"), ("a.service", "start")])
+        self._wait(lambda: self.refreshes == 3)
+
+    def test_only_the_last_queued_job_of_a_unit_is_reused(self) -> None:
+        a = S.UnitSpec(unit="a.service")
+        running = self.sched.submit(a, "restart")
+        self._wait(lambda: running.state == "running")
+        queued = self.sched.submit(a, "restart")
+        self.assertIsNot(queued, running)  # running jobs aren't reused
+        self.assertIs(self.sched.submit(a, "restart"), queued)
+        stop = self.sched.submit(a, "stop")
+        self.assertIs(self.sched.submit(a, "stop"), stop)
+        # restart, stop, restart must not collapse into restart, stop
+        self.assertIsNot(self.sched.submit(a, "restart"), queued)
+        self.assertEqual([job.action for job in self.sched.pending], ["restart", "stop", "restart"])
+
+    def test_concurrency_cap_across_units(self) -> None:
+        jobs = [self.sched.submit(S.UnitSpec(unit=f"{u}.service"), "restart") for u in "abc"]
+        self._wait(lambda: self.sched.running == 2)
+        time.sleep(0.05)
+        self.assertEqual([j.state for j in jobs], ["running", "running", "queued"])
+        self._release("a.service", "restart")
+        self._wait(lambda: jobs[2].state == "running")
+
+    def test_bulk_reads_status_once_and_refreshes_once(self) -> None:
+        specs = [S.UnitSpec(unit=f"{u}.service") for u in "abc"]
+        bulk = self.sched.submit_bulk(specs, "stop")
+        for spec in specs:
+            self._release(spec.unit, "stop")
+        self._wait(lambda: bulk.done)
+        self.assertEqual(self.show_many_calls, 1)
+        self._wait(lambda: self.refreshes == 1)
+        time.sleep(0.05)
+        self.assertEqual(self.refreshes, 1)
+        body = bulk.to_json()
+        self.assertEqual((body["state"], body["ok"]), ("succeeded", True))
+        self.assertEqual([u["status"] for u in body["units"]], [{"ActiveState": "active"}] * 3)
+
+    def test_pruning_skips_unfinished_jobs(self) -> None:
+        self.sched.settings = S._ActionSettings(concurrency=2, retention_s=3600.0, max_jobs=3)
+        stuck = self.sched.submit(S.UnitSpec(unit="stuck.service"), "restart")
+        self._wait(lambda: stuck.state == "running")
+        done = []
+        for i in range(5):
+            job = self.sched.submit(S.UnitSpec(unit=f"u{i}.service"), "start")
+            self._release(f"u{i}.service", "start")
+            self._wait(lambda job=job: job.done)
+            done.append(job)
+        self.sched.submit(S.UnitSpec(unit="last.service"), "start")
+        self.assertIn(stuck.id, self.sched.jobs)
+        self.assertLessEqual(len(self.sched.jobs), 3)
+        self.assertNotIn(done[0].id, self.sched.jobs)
+
+        for job in done:
+            job.finished_at = time.time() - 7200  # past retention
+        self.sched.submit(S.UnitSpec(unit="later.service"), "start")
+        self.assertFalse([job for job in done if job.id in self.sched.jobs])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""/api/bots payload cache: generations, per-bot deltas, patches, ETags and compressed variants.
+
+Builds are faked (no systemd needed). Run with `python -m unittest` (or pytest) from this directory.
+"""
+
+from __future__ import annotations
+
+import copy
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import server as S
+
+
+def _bot(unit: str, *, uptime: int = 100, cpu: int = 0, mem: int = 100 << 20, tokens: int = 0) -> dict[str, object]:
+    return {
+        "unit": unit,
+        "displayName": unit.split(".")[0],
+        "systemd": {
+            "activeState": "active",
+            "uptimeSeconds": uptime,
+            "cpuUsageNSec": cpu,
+            "memoryCurrentBytes": mem,
+        },
+        "usage": {"allTime": {"tokens": tokens}},
+    }
+
+
+class BotsPayloadCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.NamedTemporaryFile(suffix=".json", delete=False)
+        tmp.close()
+        self.config = Path(tmp.name)
+        self.addCleanup(self.config.unlink)
+        self.bots: list[dict[str, object]] = [_bot("a.service"), _bot("b.service")]
+
+        saved = S._BOTS_PAYLOAD_CACHE, S._build_payload, S._load_config
+        self.addCleanup(setattr, S, "_load_config", saved[2])
+        self.addCleanup(setattr, S, "_build_payload", saved[1])
+        self.addCleanup(setattr, S, "_BOTS_PAYLOAD_CACHE", saved[0])
+        S._BOTS_PAYLOAD_CACHE = self.cache = S._BotsPayloadCache()
+        S._load_config = lambda path: {}
+        S._build_payload = lambda cfg: {"title": "t", "timezone": "UTC", "totals": {}, "bots": copy.deepcopy(self.bots)}
+
+    def _build(self) -> int:
+        S._refresh_bots_payload(self.config)
+        return self.cache.generation
+
+    def test_unchanged_build_keeps_generation(self) -> None:
+        first = self._build()
+        self.assertEqual(self._build(), first)
+        self.assertEqual(self.cache.payload["generation"], first)
+        self.assertEqual(self.cache.etag, S._generation_etag(first))
+
+    def test_volatile_and_quantized_fields_are_not_changes(self) -> None:
+        first = self._build()
+        self.bots[0] = _bot("a.service", uptime=160, cpu=9_000_000_000, mem=(100 << 20) + (1 << 20))
+        self.assertEqual(self._build(), first)
+
+        self.bots[0] = _bot("a.service", uptime=170, cpu=9_000_000_000, mem=120 << 20)
+        second = self._build()
+        self.assertEqual(second, first + 1)
+        patch = S._bots_patch_locked(self.cache, first)
+        self.assertEqual(list(patch["bots"]), ["a.service"])
+        self.assertEqual(list(patch["bots"]["a.service"]), ["systemd"])
+        self.assertEqual(patch["bots"]["a.service"]["systemd"]["memoryCurrentBytes"], 120 << 20)
+
+    def test_patch_covers_added_removed_and_changed_bots(self) -> None:
+        first = self._build()
+        self.bots = [_bot("b.service", tokens=5), _bot("c.service")]
+        second = self._build()
+        patch = S._bots_patch_locked(self.cache, first)
+        self.assertEqual(patch["order"], ["b.service", "c.service"])
+        self.assertEqual(patch["bots"]["a.service"], None)
+        self.assertEqual(patch["bots"]["b.service"], {"usage": {"allTime": {"tokens": 5}}})
+        self.assertEqual(patch["bots"]["c.service"]["unit"], "c.service")
+        self.assertEqual(self.cache.patch_body, S._json_dumps(S._bots_patch_locked(self.cache, second - 1)).encode())
+
+    def test_patch_against_unknown_generation_needs_full_payload(self) -> None:
+        first = self._build()
+        self.assertIsNone(S._bots_patch_locked(self.cache, first + 1))
+        self.assertIsNone(S._bots_patch_locked(self.cache, self.cache.base_generation))
+
+    def test_etag_survives_unchanged_rebuilds(self) -> None:
+        first = self._build()
+        etag = self.cache.etag
+        self.bots[0] = _bot("a.service", uptime=500)
+        self._build()
+        code, headers, body = S._response_parts(
+            200, self.cache.body, "application/json", etag=self.cache.etag, if_none_match=etag, accept_encoding=""
+        )
+        self.assertEqual((code, body), (304, b""))
+        self.assertIn(("ETag", S._generation_etag(first)), headers)
+        # nginx-weakened, encoding-suffixed variants of the same generation still match
+        self.assertTrue(S._etag_matches(f'W/"{first:x}-gzip"', self.cache.etag))
+
+        self.bots[1] = _bot("b.service", tokens=1)
+        second = self._build()
+        self.assertFalse(S._etag_matches(etag, self.cache.etag))
+        raw, patch_etag = S._get_bots_patch_body(self.config, first)
+        self.assertEqual(patch_etag, S._generation_etag(first, second))
+        self.assertEqual(list(json.loads(raw)["bots"]), ["b.service"])
+
+
+class CompressedVariantTest(unittest.TestCase):
+    def setUp(self) -> None:
+        saved = dict(S._COMPRESSED_CACHE)
+        S._COMPRESSED_CACHE.clear()
+        self.addCleanup(S._COMPRESSED_CACHE.update, saved)
+        self.addCleanup(S._COMPRESSED_CACHE.clear)
+
+    def test_compressed_once_per_etag_and_encoding(self) -> None:
+        raw = b'{"bots": []}' * 100
+        first = S._compressed_variant(raw, 'W/"1"', "gzip")
+        self.assertEqual(gzip.decompress(first), raw)
+        # Same generation, other volatile values: the cached variant stands in without recompressing.
+        self.assertIs(S._compressed_variant(raw.replace(b"[]", b"{}"), 'W/"1"', "gzip"), first)
+        self.assertEqual(gzip.decompress(S._compressed_variant(raw[:-1], 'W/"2"', "gzip")), raw[:-1])
+
+    def test_cache_is_bounded(self) -> None:
+        for i in range(S._COMPRESSED_CACHE_MAX + 5):
+            S._compressed_variant(b"x" * 600, f'"{i}"', "gzip")
+        self.assertEqual(len(S._COMPRESSED_CACHE), S._COMPRESSED_CACHE_MAX)
+        self.assertNotIn(('"0"', "gzip"), S._COMPRESSED_CACHE)
+
+    def test_response_is_compressed_under_an_encoding_etag(self) -> None:
+        raw = b"y" * 2000
+        code, headers, body = S._response_parts(
+            200, raw, "application/json", etag='W/"7"', if_none_match="", accept_encoding="gzip"
+        )
+        self.assertEqual(code, 200)
+        self.assertEqual(gzip.decompress(body), raw)
+        self.assertIn(("ETag", 'W/"7-gzip"'), headers)
+        self.assertIn(("Content-Encoding", "gzip"), headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Status collection: per-unit timeouts, units still being collected, and usage scans it doesn't wait for.
+
+systemd is faked. Run with `python -m unittest` (or pytest) from this directory.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import server as S
+
+
+class CollectTimeoutTest(unittest.TestCase):
+    def test_stuck_unit_is_not_collected_again_until_its_worker_finishes(self) -> None:
+        release = threading.Event()
+        self.addCleanup(release.set)
+        calls: list[str] = []
+
+        def collect_bot(spec: S.UnitSpec, **kw: object) -> dict[str, object]:
+            calls.append(spec.unit)
+            if spec.unit == "stuck.service":
+                release.wait(10)
+            return {"unit": spec.unit, "systemd": {"activeState": "active"}, "health": {"issues": []}}
+
+        saved = S._systemctl_show_many, S._collect_bot
+        self.addCleanup(setattr, S, "_collect_bot", saved[1])
+        self.addCleanup(setattr, S, "_systemctl_show_many", saved[0])
+        S._systemctl_show_many = lambda specs, props: {}
+        S._collect_bot = collect_bot
+        cfg = {"timezone": "UTC", "units": [{"unit": "stuck.service"}, {"unit": "ok.service"}], "collector": {"unitTimeoutSeconds": 1}}
+
+        def issues(payload: dict[str, object]) -> list[list[str]]:
+            return [[str(i["message"]) for i in b["health"]["issues"]] for b in payload["bots"]]
+
+        self.assertEqual(issues(S._build_payload(cfg)), [["Status collection timed out after 1s"], []])
+        t0 = time.monotonic()
+        self.assertEqual(issues(S._build_payload(cfg)), [["Status collection timed out after 1s (still running)"], []])
+        self.assertLess(time.monotonic() - t0, 0.5)
+        self.assertEqual(calls.count("stuck.service"), 1)
+
+        release.set()
+        deadline = time.monotonic() + 5
+        while S._spec_key(S.UnitSpec(unit="stuck.service")) in S._COLLECT_INFLIGHT and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(issues(S._build_payload(cfg)), [[], []])
+
+
+class UsageNoWaitTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp, True)
+        self.root = (tmp / "state").resolve()
+        sessions = self.root / "agents" / "a" / "sessions"
+        sessions.mkdir(parents=True)
+        line = {
+            "type": "message",
+            "timestamp": S._utcnow().isoformat().replace("+00:00", "Z"),
+            "message": {"role": "assistant", "provider": "p", "model": "m", "usage": {"totalTokens": 7, "cost": {"total": 1.0}}},
+        }
+        (sessions / "1.jsonl").write_text(json.dumps(line) + "\n", encoding="utf-8")
+
+        saved = S._USAGE_CHECKPOINT, S._USAGE_SCAN
+        self.addCleanup(setattr, S, "_USAGE_SCAN", saved[1])
+        self.addCleanup(setattr, S, "_USAGE_CHECKPOINT", saved[0])
+        S._configure_usage_checkpoints({"usageCheckpoint": {"enabled": False}})
+        S._configure_usage_scan({"usageScan": {"workers": 1, "inotify": False}})
+
+        self.gate = threading.Event()
+        self.addCleanup(self.gate.set)
+        refresh = S._UsageCacheEntry._incremental_refresh
+
+        def slow_refresh(entry: S._UsageCacheEntry) -> None:
+            self.gate.wait(10)
+            refresh(entry)
+
+        self.addCleanup(setattr, S._UsageCacheEntry, "_incremental_refresh", refresh)
+        S._UsageCacheEntry._incremental_refresh = slow_refresh
+
+    def test_first_scan_runs_in_the_background(self) -> None:
+        entry = S._UsageCacheEntry(state_dir=self.root)
+        tz = S.ZoneInfo("UTC")
+        self.assertIsNone(entry.get_usage_nowait(tz))
+        self.assertTrue(entry.scanning)
+        self.assertIsNone(entry.get_usage_nowait(tz))  # still scanning: no second scan, no waiting
+
+        self.gate.set()
+        deadline = time.monotonic() + 5
+        while entry.scanning and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(entry.get_usage_nowait(tz)["allTime"]["tokens"], 7)
+
+    def test_last_output_while_a_refresh_holds_the_lock(self) -> None:
+        entry = S._UsageCacheEntry(state_dir=self.root)
+        tz = S.ZoneInfo("UTC")
+        self.gate.set()
+        first = entry.get_usage(tz)
+        self.gate.clear()
+        entry.last_refresh_mono = 0.0
+        worker = threading.Thread(target=entry.get_usage, args=(tz,))
+        worker.start()
+        self.addCleanup(worker.join)
+        self.addCleanup(self.gate.set)
+        while not entry.lock.locked():
+            time.sleep(0.01)
+        t0 = time.monotonic()
+        self.assertIs(entry.get_usage_nowait(tz), first)
+        self.assertLess(time.monotonic() - t0, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Health-issue journal scanning: cursor tails, the match window and restarts.
+
+journalctl is faked through _run over an in-memory journal. Run with `python -m unittest` (or pytest)
+from this directory.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import unittest
+
+import server as S
+
+
+class JournalTailTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.journal: list[str] = []
+        self.vacuumed_before = 0  # cursors older than this no longer resolve
+        self.calls: list[list[str]] = []
+
+        def run(cmd: list[str], timeout_s: int = 30) -> subprocess.CompletedProcess[str]:
+            self.calls.append(cmd)
+            after = next((a.split("=", 1)[1] for a in cmd if a.startswith("--after-cursor=")), None)
+            if after is not None:
+                pos = int(after[1:])
+                if pos < self.vacuumed_before:
+                    return subprocess.CompletedProcess(cmd, 1, stdout="", stderr="Failed to seek to cursor")
+                start = pos + 1
+            else:
+                n = int(cmd[cmd.index("-n") + 1])
+                start = max(0, len(self.journal) - n)
+            out = [f"2026-10-18T10:00:00+0000 host bot[1]: {ln}" for ln in self.journal[start:]]
+            if self.journal:
+                out.append(f"-- cursor: c{len(self.journal) - 1}")
+            return subprocess.CompletedProcess(cmd, 0, stdout="\n".join(out) + "\n", stderr="")
+
+        saved = S._run
+        self.addCleanup(setattr, S, "_run", saved)
+        S._run = run
+        S._JOURNAL_TAILS.clear()
+        self.addCleanup(S._JOURNAL_TAILS.clear)
+        self.spec = S.UnitSpec(unit="bot.service")
+        self.matcher = S._log_issue_matcher({})
+
+    def _scan(self, invocation: str = "inv1", matcher: S._LogIssueMatcher | None = None) -> list[str]:
+        issues = S._scan_recent_log_issues(self.spec, since=None, invocation=invocation, matcher=matcher or self.matcher)
+        return [str(i["key"]) for i in issues]
+
+    def _log(self, *lines: str) -> None:
+        self.journal.extend(lines)
+
+    def test_only_new_entries_are_read(self) -> None:
+        self._log("starting", "Error: listen EADDRINUSE")
+        self.assertEqual(self._scan(), ["addr_in_use"])
+        self.assertIn("-n", self.calls[-1])
+
+        self._log("fine")
+        self.assertEqual(self._scan(), ["addr_in_use"])  # still within the window
+        self.assertIn("--after-cursor=c1", self.calls[-1])
+        self.assertNotIn("-n", self.calls[-1])
+
+    def test_matches_expire_after_the_window(self) -> None:
+        self._log("EADDRINUSE")
+        self.assertEqual(self._scan(), ["addr_in_use"])
+        self._log(*(["ok"] * (S._LOG_ISSUE_WINDOW_LINES - 1)))
+        self.assertEqual(self._scan(), ["addr_in_use"])
+        self._log("ok")
+        self.assertEqual(self._scan(), [])
+
+    def test_new_invocation_or_rules_start_over(self) -> None:
+        self._log("EADDRINUSE")
+        self._scan()
+        self._log("ok after restart")
+        self.assertEqual(self._scan(invocation="inv2"), ["addr_in_use"])  # re-read the window, not the cursor
+        self.assertIn("-n", self.calls[-1])
+
+        matcher = S._log_issue_matcher({"logIssueRules": [{"key": "addr_in_use", "enabled": False}]})
+        self.assertEqual(self._scan(invocation="inv2", matcher=matcher), [])
+        self.assertIn("-n", self.calls[-1])
+
+    def test_vacuumed_cursor_falls_back_to_the_window(self) -> None:
+        self._log("EADDRINUSE")
+        self._scan()
+        self._log("Backend binary unavailable")
+        self.vacuumed_before = 5
+        self.assertEqual(sorted(self._scan()), ["addr_in_use", "backend_binary_unavailable"])
+        self.assertIn("--after-cursor=c0", self.calls[-2])
+        self.assertIn("-n", self.calls[-1])
+        tail = S._JOURNAL_TAILS[S._spec_key(self.spec)]
+        self.assertEqual((tail.cursor, tail.lines_seen), ("c1", 2))  # not counted twice
+
+
+if __name__ == "__main__":
+    unittest.main()
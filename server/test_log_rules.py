@@ -0,0 +1,82 @@
+"""Log issue rules: the combined-regex matcher against rule-by-rule matching.
+
+Run with `python -m unittest` (or pytest) from this directory.
+"""
+
+from __future__ import annotations
+
+import unittest
+
+import server as S
+
+_LINES = [
+    "",
+    "all good",
+    "Error: listen EADDRINUSE: address already in use :::18789",
+    "oauth TOKEN refresh failed for Anthropic",
+    "dup dup word",
+    "request id=42 failed after id=42",
+    "Timeout waiting for Gateway",
+    "timeout waiting for gateway",
+    "Backend binary unavailable; EADDRINUSE too",
+]
+
+_CONFIG_RULES = [
+    {"key": "dup_word", "pattern": r"\b(\w+) \1\b"},  # numbered backreference
+    {"key": "same_id", "pattern": r"id=(?P<id>\d+).*id=(?P=id)"},  # named group + backreference
+    {"key": "global_flag", "pattern": r"(?i)GATEWAY", "ignoreCase": False},  # global inline flag
+    {"key": "case_sensitive", "pattern": r"Timeout waiting", "ignoreCase": False},
+    {"key": "named_only", "pattern": r"(?P<what>listen) EADDRINUSE"},
+]
+
+
+def _naive(matcher: S._LogIssueMatcher, line: str) -> list[str]:
+    return [str(r["key"]) for r in matcher.rules if r["pattern"].search(line)]
+
+
+class LogIssueMatcherTest(unittest.TestCase):
+    def setUp(self) -> None:
+        S._LOG_ISSUE_MATCHERS.clear()
+
+    def test_matches_rule_by_rule_results(self) -> None:
+        matcher = S._log_issue_matcher({"logIssueRules": _CONFIG_RULES})
+        self.assertIsNotNone(matcher.combined)
+        for line in _LINES:
+            self.assertEqual([str(r["key"]) for r in matcher.classify(line)], _naive(matcher, line), msg=line)
+
+    def test_rules_that_cannot_be_spliced_run_on_their_own(self) -> None:
+        matcher = S._log_issue_matcher({"logIssueRules": _CONFIG_RULES})
+        standalone = {str(r["key"]) for r, alone in zip(matcher.rules, matcher._standalone) if alone}
+        self.assertEqual(standalone, {"dup_word", "same_id", "global_flag", "named_only"})
+        self.assertEqual([r["key"] for r in matcher.classify("dup dup")], ["dup_word"])
+        self.assertEqual([r["key"] for r in matcher.classify("the GaTeWaY")], ["global_flag"])
+
+    def test_case_sensitivity_is_kept_per_rule(self) -> None:
+        matcher = S._log_issue_matcher({"logIssueRules": _CONFIG_RULES})
+        self.assertIn("case_sensitive", [r["key"] for r in matcher.classify("Timeout waiting")])
+        self.assertNotIn("case_sensitive", [r["key"] for r in matcher.classify("timeout waiting")])
+        self.assertIn("addr_in_use", [r["key"] for r in matcher.classify("eaddrinuse")])  # built-in, ignoreCase
+
+    def test_config_overrides_and_disables_builtins(self) -> None:
+        cfg = {
+            "logIssueRules": [
+                {"key": "addr_in_use", "pattern": "port clash", "severity": "warn"},
+                {"key": "backend_binary_unavailable", "enabled": False},
+            ]
+        }
+        matcher = S._log_issue_matcher(cfg)
+        keys = [str(r["key"]) for r in matcher.rules]
+        self.assertNotIn("backend_binary_unavailable", keys)
+        self.assertEqual(matcher.classify("EADDRINUSE"), [])
+        self.assertEqual([r["severity"] for r in matcher.classify("Port Clash")], ["warn"])
+        self.assertIs(S._log_issue_matcher(cfg), matcher)  # compiled once per rule set
+
+    def test_bad_patterns_are_config_errors(self) -> None:
+        with self.assertRaises(ValueError):
+            S._log_issue_matcher({"logIssueRules": [{"key": "x", "pattern": "(unclosed"}]})
+        with self.assertRaises(ValueError):
+            S._log_issue_matcher({"logIssueRules": [{"key": "x", "pattern": ""}]})
+
+
+if __name__ == "__main__":
+    unittest.main()
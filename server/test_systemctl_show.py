@@ -0,0 +1,89 @@
+"""Batched `systemctl show`: block parsing, per-bus attribution and the per-bus wait in _build_payload.
+
+systemctl is faked through _run. Run with `python -m unittest` (or pytest) from this directory.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import threading
+import time
+import unittest
+
+import server as S
+
+
+def _proc(stdout: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.CompletedProcess([], 0, stdout=stdout, stderr="")
+
+
+class ShowBlocksTest(unittest.TestCase):
+    def test_split_show_blocks(self) -> None:
+        out = S._split_show_blocks("A=1\nExecStart={ path=/x ; argv[]=/x a=b }\n\nA=2\n\n\nA=3\n")
+        self.assertEqual(out, [{"A": "1", "ExecStart": "{ path=/x ; argv[]=/x a=b }"}, {"A": "2"}, {"A": "3"}])
+
+
+class ShowManyTest(unittest.TestCase):
+    def setUp(self) -> None:
+        saved = S._run
+        self.addCleanup(setattr, S, "_run", saved)
+        self.calls: list[list[str]] = []
+        self.outputs: dict[str, str] = {}
+
+        def run(cmd: list[str], timeout_s: int = 30) -> subprocess.CompletedProcess[str]:
+            self.calls.append(cmd)
+            units = [a for a in cmd if a.endswith(".service")]
+            return _proc("\n\n".join(self.outputs[u] for u in units if u in self.outputs))
+
+        S._run = run
+
+    def test_one_show_per_bus(self) -> None:
+        self.outputs = {"a.service": "ActiveState=active", "b.service": "ActiveState=failed"}
+        specs = [S.UnitSpec(unit="a.service"), S.UnitSpec(unit="b.service")]
+        out = S._systemctl_show_many(specs, ["ActiveState"])
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(out[S._spec_key(specs[0])], {"ActiveState": "active"})
+        self.assertEqual(out[S._spec_key(specs[1])], {"ActiveState": "failed"})
+
+    def test_unattributable_units_are_left_out(self) -> None:
+        self.outputs = {"a.service": "ActiveState=active"}  # b's block is missing: the batch can't be trusted
+        specs = [S.UnitSpec(unit="a.service"), S.UnitSpec(unit="b.service")]
+        self.assertEqual(S._systemctl_show_many(specs, ["ActiveState"]), {})
+        bad_user = S.UnitSpec(unit="c.service", scope="user")  # neither user nor uid
+        self.assertEqual(S._systemctl_show_many([bad_user], ["ActiveState"]), {})
+
+
+class BuildPayloadShowTest(unittest.TestCase):
+    def test_hung_bus_only_delays_its_own_units(self) -> None:
+        release = threading.Event()
+        self.addCleanup(release.set)
+        shown: dict[str, bool] = {}
+
+        def show_many(specs: list[S.UnitSpec], props: list[str]) -> dict[tuple[str, str, str], dict[str, str]]:
+            if specs[0].scope == "system":
+                release.wait(10)
+            return {S._spec_key(s): {"ActiveState": "active"} for s in specs}
+
+        def collect_bot(spec: S.UnitSpec, **kw: object) -> dict[str, object]:
+            shown[spec.unit] = kw["show"] is not None
+            return {"unit": spec.unit, "systemd": {"activeState": "active"}}
+
+        saved = S._systemctl_show_many, S._collect_bot
+        self.addCleanup(setattr, S, "_collect_bot", saved[1])
+        self.addCleanup(setattr, S, "_systemctl_show_many", saved[0])
+        S._systemctl_show_many, S._collect_bot = show_many, collect_bot
+        cfg = {
+            "timezone": "UTC",
+            "units": [{"unit": "a.service"}, {"unit": "u.service", "scope": "user", "user": "root", "uid": 0}],
+            "collector": {"unitTimeoutSeconds": 1},
+        }
+        t0 = time.monotonic()
+        payload = S._build_payload(cfg)
+        self.assertLess(time.monotonic() - t0, 1.0)
+        # a.service gave up on the hung system batch (and shows itself); the user bus wasn't held up.
+        self.assertEqual(shown, {"a.service": False, "u.service": True})
+        self.assertEqual([b["systemd"]["activeState"] for b in payload["bots"]], ["active", "active"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+"""Native systemd status reads against a private dbus-daemon.
+
+A fake org.freedesktop.systemd1 (LoadUnit + Properties.GetAll) is served on a throwaway bus, so
+this runs without systemd. Run with `python -m unittest` (or pytest) from this directory.
+"""
+
+from __future__ import annotations
+
+import shutil
+import struct
+import subprocess
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from typing import Any
+
+import server as S
+
+_UNITS: dict[str, dict[str, dict[str, tuple[str, Any]]]] = {
+    "bot.service": {
+        S._SYSTEMD_UNIT_IFACE: {
+            "LoadState": ("s", "loaded"),
+            "ActiveState": ("s", "active"),
+            "SubState": ("s", "running"),
+            "ActiveEnterTimestampMonotonic": ("t", 123456789),
+            "Triggers": ("as", []),
+        },
+        S._SYSTEMD_SERVICE_IFACE: {
+            "MainPID": ("u", 4242),
+            "NRestarts": ("u", 3),
+            "MemoryCurrent": ("t", 2**64 - 1),
+            "ExecStart": ("a(sasbttttuii)", [("/bin/bot", ["/bin/bot", "--x"], False, 0, 0, 0, 0, 0, 0, 0)]),
+        },
+    },
+    "bot.timer": {
+        S._SYSTEMD_UNIT_IFACE: {"LoadState": ("s", "loaded"), "ActiveState": ("s", "active")},
+    },
+}
+
+
+class _FakeSystemd(threading.Thread):
+    # Owns org.freedesktop.systemd1 on the bus and answers method calls from _UNITS.
+    def __init__(self, address: str) -> None:
+        super().__init__(name="fake-systemd", daemon=True)
+        self.conn = S._DBusConnection(address, bus=True)
+        self.conn.call(
+            "org.freedesktop.DBus", "/org/freedesktop/DBus", "org.freedesktop.DBus", "RequestName", "su",
+            (S._SYSTEMD_DEST, 4),
+        )
+        self.calls: list[tuple[str, tuple[Any, ...]]] = []
+        self.serial = 1000
+
+    def _recv(self) -> tuple[int, int, dict[int, Any], list[Any]]:
+        head = self.conn._recv_exact(16)
+        little = head[0:1] == b"l"
+        body_len, serial, fields_len = struct.unpack_from(("<" if little else ">") + "III", head, 4)
+        header_len = 16 + fields_len
+        header_len += -header_len % 8
+        data = head + self.conn._recv_exact(header_len - 16 + body_len)
+        reader = S._DBusReader(data, 12, little)
+        fields = {code: val for code, (_, val) in reader.read("a(yv)")}
+        reader.pos = header_len
+        sig = str(fields.get(S._DBUS_FIELD_SIGNATURE) or "")
+        return head[1], serial, fields, [reader.read(t) for t in S._dbus_split_sig(sig)]
+
+    def _send(self, msg_type: int, reply_to: int, dest: str, sig: str, args: tuple[Any, ...], error: str = "") -> None:
+        self.serial += 1
+        body = bytearray()
+        for t, v in zip(S._dbus_split_sig(sig), args):
+            S._dbus_marshal(body, t, v)
+        fields: list[tuple[int, tuple[str, Any]]] = [
+            (S._DBUS_FIELD_REPLY_SERIAL, ("u", reply_to)),
+            (S._DBUS_FIELD_DESTINATION, ("s", dest)),
+            (S._DBUS_FIELD_SIGNATURE, ("g", sig)),
+        ]
+        if error:
+            fields.append((S._DBUS_FIELD_ERROR_NAME, ("s", error)))
+        msg = bytearray(b"l")
+        msg.extend(struct.pack("<BBBII", msg_type, 0, 1, len(body), self.serial))
+        S._dbus_marshal(msg, "a(yv)", fields)
+        S._dbus_pad(msg, 8)
+        msg.extend(body)
+        self.conn._sock.sendall(bytes(msg))
+
+    def run(self) -> None:
+        self.conn._sock.settimeout(None)
+        while True:
+            try:
+                msg_type, serial, fields, body = self._recv()
+            except (ConnectionError, OSError):
+                return
+            if msg_type != S._DBUS_METHOD_CALL:
+                continue
+            member, sender, path = fields.get(S._DBUS_FIELD_MEMBER), fields.get(7), fields.get(S._DBUS_FIELD_PATH)
+            self.calls.append((str(member), tuple(body)))
+            unit = next((u for u in _UNITS if path == f"/unit/{u.replace('.', '_2e')}"), None)
+            if member == "LoadUnit" and body[0] in _UNITS:
+                self._send(S._DBUS_METHOD_RETURN, serial, sender, "o", (f"/unit/{body[0].replace('.', '_2e')}",))
+            elif member == "GetAll" and unit and body[0] in _UNITS[unit]:
+                self._send(S._DBUS_METHOD_RETURN, serial, sender, "a{sv}", (_UNITS[unit][body[0]],))
+            else:
+                self._send(S._DBUS_ERROR, serial, sender, "s", ("nope",), "org.freedesktop.DBus.Error.UnknownInterface")
+
+
+@unittest.skipUnless(shutil.which("dbus-daemon"), "dbus-daemon not installed")
+class SystemdDBusShowTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.mkdtemp()
+        config = Path(self.tmp) / "bus.conf"
+        config.write_text(
+            "<!DOCTYPE busconfig PUBLIC \"-//freedesktop//DTD D-Bus Bus Configuration 1.0//EN\"\n"
+            " \"http://www.freedesktop.org/standards/dbus/1.0/busconfig.dtd\">\n"
+            f"<busconfig><type>session</type><listen>unix:path={self.tmp}/bus</listen>"
+            "<auth>EXTERNAL</auth><policy context=\"default\"><allow send_destination=\"*\"/>"
+            "<allow receive_sender=\"*\"/><allow own=\"*\"/></policy></busconfig>\n",
+            encoding="utf-8",
+        )
+        self.daemon = subprocess.Popen(
+            ["dbus-daemon", "--nofork", "--print-address", f"--config-file={config}"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        self.addCleanup(self._stop_daemon)
+        self.address = (self.daemon.stdout.readline() if self.daemon.stdout else "").strip()
+        self.fake = _FakeSystemd(self.address)
+        self.addCleanup(self.fake.conn.close)
+        self.fake.start()
+        self.backend = S._SystemdDBusBackend(mode="auto", system_address=self.address)
+
+    def tearDown(self) -> None:
+        for conn in self.backend.conns.values():
+            conn.close()
+
+    def _stop_daemon(self) -> None:
+        self.daemon.terminate()
+        self.daemon.wait(timeout=5)
+        if self.daemon.stdout:
+            self.daemon.stdout.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_show_reads_each_interface_once(self) -> None:
+        props = ["LoadState", "ActiveState", "SubState", "ActiveEnterTimestampMonotonic", "MainPID", "NRestarts",
+                 "MemoryCurrent", "UnitFileState"]
+        out = self.backend.show(S.UnitSpec(unit="bot.service"), props)
+        self.assertEqual(
+            out,
+            {
+                "LoadState": "loaded",
+                "ActiveState": "active",
+                "SubState": "running",
+                "ActiveEnterTimestampMonotonic": "123456789",
+                "MainPID": "4242",
+                "NRestarts": "3",
+                "MemoryCurrent": "[not set]",
+            },
+        )
+        self.assertEqual(sorted(m for m, _ in self.fake.calls), ["GetAll", "GetAll", "LoadUnit"])
+
+        self.fake.calls.clear()
+        self.backend.show(S.UnitSpec(unit="bot.service"), props)
+        self.assertEqual([m for m, _ in self.fake.calls], ["GetAll", "GetAll"])  # unit path is cached
+
+    def test_missing_interface_leaves_its_properties_out(self) -> None:
+        out = self.backend.show(S.UnitSpec(unit="bot.timer"), ["ActiveState", "MainPID"])
+        self.assertEqual(out, {"ActiveState": "active"})
+
+    def test_unknown_unit_falls_back(self) -> None:
+        self.assertIsNone(self.backend.show(S.UnitSpec(unit="missing.service"), ["ActiveState"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
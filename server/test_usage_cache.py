@@ -0,0 +1,221 @@
+"""Usage cache: per-file retraction, checkpoints and the history store, against real transcripts.
+
+Run with `python -m unittest` (or pytest) from this directory.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import server as S
+
+_UTC = S.ZoneInfo("UTC")
+
+
+def _line(ts: _dt.datetime, tokens: int, model: str = "m") -> str:
+    return json.dumps(
+        {
+            "type": "message",
+            "timestamp": ts.isoformat().replace("+00:00", "Z"),
+            "message": {"role": "assistant", "provider": "p", "model": model, "usage": {"totalTokens": tokens, "cost": {"total": 1.0}}},
+        }
+    ) + "\n"
+
+
+class _UsageTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+        self.root = (self.tmp / "state").resolve()
+        self.sessions = self.root / "agents" / "a" / "sessions"
+        self.sessions.mkdir(parents=True)
+        self.now = S._utcnow()
+
+        saved = S._USAGE_CHECKPOINT, S._USAGE_SCAN, S._USAGE_HISTORY
+        self.addCleanup(setattr, S, "_USAGE_HISTORY", saved[2])
+        self.addCleanup(setattr, S, "_USAGE_SCAN", saved[1])
+        self.addCleanup(setattr, S, "_USAGE_CHECKPOINT", saved[0])
+        S._configure_usage_checkpoints({"usageCheckpoint": {"enabled": False}})
+        S._configure_usage_scan({"usageScan": {"workers": 1, "inotify": False}})
+        S._configure_usage_history({})
+
+        self.reads: list[tuple[str, int]] = []
+        ingest = S._ingest_session_file
+
+        def counting_ingest(fp: Path, start_pos: int, out: S._FileUsage, end_pos: int | None = None) -> int:
+            self.reads.append((fp.name, start_pos))
+            return ingest(fp, start_pos, out, end_pos)
+
+        self.addCleanup(setattr, S, "_ingest_session_file", ingest)
+        S._ingest_session_file = counting_ingest
+
+    def _write(self, name: str, *tokens: int, ago_min: int = 5, model: str = "m") -> Path:
+        fp = self.sessions / name
+        fp.write_text("".join(_line(self.now - _dt.timedelta(minutes=ago_min), n, model) for n in tokens), encoding="utf-8")
+        return fp
+
+    def _append(self, fp: Path, tokens: int, ago_min: int = 1) -> None:
+        with fp.open("a", encoding="utf-8") as f:
+            f.write(_line(self.now - _dt.timedelta(minutes=ago_min), tokens))
+
+    def _usage(self, entry: S._UsageCacheEntry) -> dict[str, object]:
+        entry.last_refresh_mono = 0.0  # skip the 1s burst guard
+        return entry.get_usage(_UTC)
+
+
+class FileRetractionTest(_UsageTestCase):
+    def test_deleted_session_is_retracted_without_rescanning_others(self) -> None:
+        self._write("1.jsonl", 10, 20)
+        f2 = self._write("2.jsonl", 5)
+        entry = S._UsageCacheEntry(state_dir=self.root)
+        self.assertEqual(self._usage(entry)["allTime"]["tokens"], 35)
+
+        self.reads.clear()
+        os.unlink(f2)
+        out = self._usage(entry)
+        self.assertEqual(self.reads, [])
+        self.assertEqual(out["allTime"]["tokens"], 30)
+        self.assertEqual(out["windows"]["1h"]["tokens"], 30)
+        self.assertEqual(len(entry.files), 1)
+
+    def test_truncated_session_is_reread_from_the_start(self) -> None:
+        self._write("1.jsonl", 10)
+        f2 = self._write("2.jsonl", 5, 6, 7)
+        entry = S._UsageCacheEntry(state_dir=self.root)
+        self.assertEqual(self._usage(entry)["allTime"]["tokens"], 28)
+
+        self.reads.clear()
+        f2.write_text(_line(self.now, 2), encoding="utf-8")
+        self.assertEqual(self._usage(entry)["allTime"]["tokens"], 12)
+        self.assertEqual(self.reads, [("2.jsonl", 0)])
+
+    def test_appended_lines_are_read_from_the_cursor(self) -> None:
+        f1 = self._write("1.jsonl", 10)
+        entry = S._UsageCacheEntry(state_dir=self.root)
+        self._usage(entry)
+        size = f1.stat().st_size
+        self.reads.clear()
+        self._append(f1, 3)
+        self.assertEqual(self._usage(entry)["allTime"]["tokens"], 13)
+        self.assertEqual(self.reads, [("1.jsonl", size)])
+
+    def test_retraction_leaves_no_residue_in_windows(self) -> None:
+        f1 = self._write("1.jsonl", 10, ago_min=30)
+        entry = S._UsageCacheEntry(state_dir=self.root)
+        self._usage(entry)
+        os.unlink(f1)
+        out = self._usage(entry)
+        self.assertEqual(out["allTime"], {"tokens": 0, "costUSD": 0.0, "requests": 0, "errors": 0})
+        self.assertEqual(out["windows"]["24h"]["requests"], 0)
+        self.assertEqual(len(entry.agg.perMinuteUTC), 1)  # the slot stays, zeroed
+        self.assertEqual(entry.agg.perMinuteUTC.rolling(61, int(self.now.timestamp() // 60)).requests, 0)
+
+
+class CheckpointTest(_UsageTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        S._configure_usage_checkpoints({"usageCheckpoint": {"dir": str(self.tmp / "ck")}})
+
+    def _checkpointed(self) -> None:
+        entry = S._UsageCacheEntry(state_dir=self.root)
+        self._usage(entry)
+        entry.persist()
+        self.reads.clear()
+
+    def test_restart_resumes_from_the_checkpoint(self) -> None:
+        f1 = self._write("1.jsonl", 10)
+        self._write("2.jsonl", 5)
+        self._checkpointed()
+        self._append(f1, 1)
+
+        entry = S._UsageCacheEntry(state_dir=self.root)
+        self.assertEqual(self._usage(entry)["allTime"]["tokens"], 16)
+        self.assertEqual([name for name, pos in self.reads], ["1.jsonl"])
+        self.assertGreater(self.reads[0][1], 0)
+
+    def test_replaced_or_shrunk_files_are_rescanned(self) -> None:
+        f1 = self._write("1.jsonl", 10, 11)
+        f2 = self._write("2.jsonl", 5)
+        self._checkpointed()
+        f1.write_text(_line(self.now, 1), encoding="utf-8")  # shrunk
+        tmp = self.sessions / "2.jsonl.new"
+        tmp.write_text(_line(self.now, 7), encoding="utf-8")
+        os.replace(tmp, f2)  # new inode, same name
+
+        entry = S._UsageCacheEntry(state_dir=self.root)
+        self.assertEqual(self._usage(entry)["allTime"]["tokens"], 8)
+        self.assertEqual(sorted(self.reads), [("1.jsonl", 0), ("2.jsonl", 0)])
+
+    def test_other_versions_are_ignored(self) -> None:
+        self._write("1.jsonl", 10)
+        self._checkpointed()
+        entry = S._UsageCacheEntry(state_dir=self.root)
+        path = entry._checkpoint_path()
+        raw = json.loads(gzip.decompress(path.read_bytes()))
+        raw["v"] = S._USAGE_CHECKPOINT_VERSION + 1
+        path.write_bytes(gzip.compress(json.dumps(raw).encode()))
+        self.assertEqual(self._usage(entry)["allTime"]["tokens"], 10)
+        self.assertEqual(self.reads, [("1.jsonl", 0)])
+
+    def test_file_bins_round_trip(self) -> None:
+        usage = S._FileUsage()
+        for minutes, tokens in ((90, 1), (3, 2), (3, 4), (40, 8)):
+            usage.add_event(
+                self.now - _dt.timedelta(minutes=minutes), tokens=tokens, cost_usd=0.5, is_error=tokens == 8,
+                provider="p", model="m", error_text="boom",
+            )
+        back = S._FileUsage.from_state(json.loads(json.dumps(usage.to_state())))
+        self.assertEqual(list(back.minutes.rows()), list(usage.minutes.rows()))
+        self.assertEqual(list(back.quarters.rows()), list(usage.quarters.rows()))
+        self.assertEqual(list(back.minutes.keys), sorted(back.minutes.keys))
+        self.assertEqual((back.lastErrorAt, back.lastErrorMsg), (usage.lastErrorAt, "boom"))
+
+
+class UsageHistoryTest(_UsageTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        S._configure_usage_history({"usageHistory": {"dir": str(self.tmp / "hist")}})
+
+    def _history(self) -> list[tuple[str, int]]:
+        out = S._usage_history(
+            self.root, since=self.now - _dt.timedelta(days=3), until=self.now, step="1d", provider=None, model=None
+        )
+        return [(row["model"], row["tokens"]) for row in out["byModel"]]
+
+    def test_rows_of_deleted_sessions_are_kept(self) -> None:
+        self._write("1.jsonl", 10)
+        f2 = self._write("2.jsonl", 5, model="m2")
+        entry = S._UsageCacheEntry(state_dir=self.root)
+        self._usage(entry)
+        entry.persist()
+        os.unlink(f2)
+        self._usage(entry)
+        entry.persist()
+        self.assertEqual(sorted(self._history()), [("m", 10), ("m2", 5)])
+
+    def test_file_read_from_offset_zero_replaces_its_rows(self) -> None:
+        f1 = self._write("1.jsonl", 10, 20)
+        entry = S._UsageCacheEntry(state_dir=self.root)
+        self._usage(entry)
+        entry.persist()
+        f1.write_text(_line(self.now, 2), encoding="utf-8")  # truncated and rewritten
+        self._usage(entry)
+        entry.persist()
+        self.assertEqual(self._history(), [("m", 2)])
+
+        # A restart without a checkpoint re-reads everything from 0: still no double count.
+        entry = S._UsageCacheEntry(state_dir=self.root)
+        self._usage(entry)
+        entry.persist()
+        self.assertEqual(self._history(), [("m", 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
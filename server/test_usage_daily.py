@@ -0,0 +1,83 @@
+"""Per-timezone daily usage, derived at read time from the shared UTC quarter-hour bins.
+
+Run with `python -m unittest` (or pytest) from this directory.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import random
+import unittest
+from pathlib import Path
+
+import server as S
+
+_NOW = _dt.datetime(2026, 11, 3, 6, 20, tzinfo=_dt.timezone.utc)  # two days after the US DST change
+_ZONES = ["UTC", "America/New_York", "Asia/Kolkata", "Asia/Kathmandu", "Pacific/Chatham", "America/St_Johns"]
+
+
+class DailyUsageTest(unittest.TestCase):
+    def setUp(self) -> None:
+        saved = S._utcnow
+        self.addCleanup(setattr, S, "_utcnow", saved)
+        S._utcnow = lambda: _NOW
+        self.entry = S._UsageCacheEntry(state_dir=Path("/nonexistent"))
+        self.events: list[tuple[_dt.datetime, int]] = []
+
+    def _add(self, ts: _dt.datetime, tokens: int) -> None:
+        usage = S._FileUsage()
+        usage.add_event(ts, tokens=tokens, cost_usd=0.25, is_error=False, provider="p", model="m", error_text="")
+        self.entry.agg.add_file(usage)
+        self.events.append((ts, tokens))
+
+    def _daily(self, tz_name: str) -> dict[str, int]:
+        out = self.entry._build_output(S.ZoneInfo(tz_name))
+        return {row["date"]: row["tokens"] for row in out["daily30d"]}
+
+    def _expected(self, tz_name: str) -> dict[str, int]:
+        tz = S.ZoneInfo(tz_name)
+        days = S._dates_last_n(tz, 30)
+        want = dict.fromkeys(days, 0)
+        for ts, tokens in self.events:
+            d = ts.astimezone(tz).date().isoformat()
+            if d in want:
+                want[d] += tokens
+        return want
+
+    def test_every_zone_from_one_set_of_bins(self) -> None:
+        rng = random.Random(5)
+        for _ in range(2000):
+            self._add(_NOW - _dt.timedelta(seconds=rng.randint(0, 33 * 86400)), rng.randint(1, 50))
+        for tz_name in _ZONES:
+            self.assertEqual(self._daily(tz_name), self._expected(tz_name), msg=tz_name)
+
+    def test_events_around_local_midnight_in_offset_zones(self) -> None:
+        # +5:30, +5:45 and +12:45 midnights fall on :30/:45/:15 UTC: one second either side is another day.
+        for tz_name in ("Asia/Kolkata", "Asia/Kathmandu", "Pacific/Chatham"):
+            tz = S.ZoneInfo(tz_name)
+            midnight = _dt.datetime.combine(_NOW.astimezone(tz).date() - _dt.timedelta(days=2), _dt.time(), tzinfo=tz)
+            self._add(midnight.astimezone(_dt.timezone.utc) - _dt.timedelta(seconds=1), 1)
+            self._add(midnight.astimezone(_dt.timezone.utc), 100)
+        for tz_name in ("Asia/Kolkata", "Asia/Kathmandu", "Pacific/Chatham", "UTC"):
+            self.assertEqual(self._daily(tz_name), self._expected(tz_name), msg=tz_name)
+
+    def test_dst_day_lengths(self) -> None:
+        # 2026-11-01 is 25 hours long in New York; its last hour must not spill into the next day.
+        tz = S.ZoneInfo("America/New_York")
+        self._add(_dt.datetime(2026, 11, 1, 23, 30, tzinfo=tz).astimezone(_dt.timezone.utc), 7)
+        self._add(_dt.datetime(2026, 11, 1, 1, 30, fold=1, tzinfo=tz).astimezone(_dt.timezone.utc), 3)
+        daily = self._daily("America/New_York")
+        self.assertEqual(daily["2026-11-01"], 10)
+        self.assertEqual(daily["2026-11-02"], 0)
+
+    def test_each_zone_keeps_its_own_output(self) -> None:
+        self._add(_NOW - _dt.timedelta(hours=1), 5)
+        kolkata = self.entry._build_output(S.ZoneInfo("Asia/Kolkata"))
+        la = self.entry._build_output(S.ZoneInfo("America/Los_Angeles"))
+        self.assertIs(self.entry._build_output(S.ZoneInfo("Asia/Kolkata")), kolkata)
+        self.assertEqual(kolkata["windows"], la["windows"])
+        self.assertEqual((kolkata["daily30d"][-1]["date"], la["daily30d"][-1]["date"]), ("2026-11-03", "2026-11-02"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+"""Usage rings (_UsageRing), the rolling dashboard windows, and the memory they cost.
+
+Run with `python -m unittest` (or pytest) from this directory.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import json
+import random
+import shutil
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+
+import server as S
+
+_NOW = _dt.datetime(2026, 10, 18, 12, 0, tzinfo=_dt.timezone.utc)
+
+
+def _line(ts: _dt.datetime, tokens: int) -> str:
+    return json.dumps(
+        {
+            "type": "message",
+            "timestamp": ts.isoformat().replace("+00:00", "Z"),
+            "message": {"role": "assistant", "provider": "p", "model": "m", "usage": {"totalTokens": tokens, "cost": {"total": 0.01}}},
+        }
+    ) + "\n"
+
+
+class UsageRingTest(unittest.TestCase):
+    def _replay(self, seed: int, step_choices: list[int]) -> bool:
+        # Random adds and retractions, all within retention, against a plain dict.
+        rng = random.Random(seed)
+        ring = S._UsageRing(1500)
+        naive: dict[int, float] = {}
+        end = 100000
+        went_dense = False
+        for step in range(2000):
+            end += rng.choice(step_choices)
+            for _ in range(rng.randint(0, 3)):
+                key = end - rng.randint(0, 1400)
+                tokens = rng.randint(1, 100)
+                ring.add(key, tokens, 0.5, 1.0, 0.0)
+                naive[key] = naive.get(key, 0) + tokens
+                if rng.random() < 0.1:
+                    ring.add(key, -tokens, -0.5, -1.0, 0.0)
+                    naive[key] -= tokens
+            went_dense |= ring.sparse is None
+            for span in (61, 301, 1441):
+                want = sum(naive.get(k, 0) for k in range(end - span + 1, end + 1))
+                self.assertAlmostEqual(ring.rolling(span, end).tokens, want, places=6, msg=(seed, step, span))
+            if step % 100 == 0:
+                ranges = [(end - i * 96 - 95, end - i * 96) for i in range(10)]
+                for (lo, hi), got in zip(ranges, ring.sums(ranges)):
+                    want = sum(naive.get(k, 0) for k in range(max(lo, end - 1499), hi + 1))
+                    self.assertAlmostEqual(got.tokens, want, places=6)
+        return went_dense
+
+    def test_sparse_ring_matches_naive_sums(self) -> None:
+        self.assertFalse(self._replay(1, [0, 0, 1, 1, 2, 37, 90]))
+
+    def test_dense_ring_matches_naive_sums(self) -> None:
+        self.assertTrue(self._replay(2, [0, 0, 1, 1, 2, 3]))
+
+    def test_sparse_ring_drops_periods_past_retention(self) -> None:
+        ring = S._UsageRing(10)
+        ring.add(100, 1.0, 0.0, 1.0, 0.0)
+        ring.add(105, 2.0, 0.0, 1.0, 0.0)
+        ring.add(95, 4.0, 0.0, 1.0, 0.0)  # past retention of the newest period
+        self.assertEqual([k for k, _ in ring.items()], [100, 105])
+        ring.add(111, 8.0, 0.0, 1.0, 0.0)
+        self.assertEqual([k for k, _ in ring.items()], [105, 111])
+        self.assertEqual(ring.rolling(10, 111).tokens, 10.0)
+
+
+class RollingWindowTest(unittest.TestCase):
+    def test_windows_follow_the_clock_and_new_events(self) -> None:
+        # Dashboard windows from _build_output, minute by minute over a day and a half, against
+        # sums over the raw events.
+        rng = random.Random(3)
+        clock = [_NOW]
+        saved = S._utcnow
+        self.addCleanup(setattr, S, "_utcnow", saved)
+        S._utcnow = lambda: clock[0]
+        entry = S._UsageCacheEntry(state_dir=Path("/nonexistent"))
+        events: list[tuple[_dt.datetime, int]] = []
+
+        def add(ts: _dt.datetime, tokens: int) -> None:
+            usage = S._FileUsage()
+            usage.add_event(ts, tokens=tokens, cost_usd=0.0, is_error=False, provider="p", model="m", error_text="")
+            entry.agg.add_file(usage)
+            events.append((ts, tokens))
+
+        for _ in range(300):
+            add(_NOW - _dt.timedelta(minutes=rng.randint(0, 40 * 24 * 60)), rng.randint(1, 9))
+        for step in range(0, 36 * 60, 7):
+            clock[0] = _NOW + _dt.timedelta(minutes=step)
+            if rng.random() < 0.5:
+                add(clock[0] - _dt.timedelta(seconds=rng.randint(0, 600)), rng.randint(1, 9))
+            now_min = int(clock[0].timestamp() // 60)
+            now_hr = now_min // 60
+            want = {
+                "1h": sum(t for ts, t in events if now_min - 60 <= ts.timestamp() // 60 <= now_min),
+                "24h": sum(t for ts, t in events if now_min - 24 * 60 <= ts.timestamp() // 60 <= now_min),
+                "7d": sum(t for ts, t in events if now_hr - 7 * 24 <= ts.timestamp() // 3600 <= now_hr),
+                "30d": sum(t for ts, t in events if now_hr - 30 * 24 <= ts.timestamp() // 3600 <= now_hr),
+            }
+            windows = entry._build_output(S.ZoneInfo("UTC"))["windows"]
+            self.assertEqual({k: windows[k]["tokens"] for k in want}, want, msg=step)
+
+    def test_rolling_slides_and_jumps(self) -> None:
+        ring = S._UsageRing(100)
+        for k in range(1000, 1090):
+            ring.add(k, float(k % 7), 0.0, 1.0, 0.0)
+        for end in (1050, 1051, 1060, 1089, 1200):
+            want = sum(float(k % 7) for k in range(max(1000, end - 29), min(end, 1089) + 1))
+            self.assertEqual(ring.rolling(30, end).tokens, want)
+        self.assertEqual(ring.rolling(30, 1040).tokens, sum(float(k % 7) for k in range(1011, 1041)))  # backwards
+
+
+class UsageMemoryTest(unittest.TestCase):
+    def test_sparse_bot_costs_a_fraction_of_full_rings(self) -> None:
+        tracemalloc.start()
+        try:
+            agg = S._UsageAgg()
+            usage = S._FileUsage()
+            for i in range(40):
+                usage.add_event(
+                    _NOW - _dt.timedelta(hours=7 * i), tokens=5, cost_usd=0.1, is_error=False, provider="p", model="m", error_text=""
+                )
+            agg.add_file(usage)
+            used, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        full_rings = (S._MINUTE_SLOTS + S._QUARTER_SLOTS) * 5 * 8
+        self.assertLess(used, full_rings / 10)
+
+    def test_cache_entry_for_a_month_of_sessions(self) -> None:
+        # 50 sessions x 400 events spread over 30 days. Per-file dicts of buckets plus full rings took
+        # ~2 MiB here, the original per-timezone cache ~0.8 MiB.
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp, True)
+        sessions = tmp / "state" / "agents" / "a" / "sessions"
+        sessions.mkdir(parents=True)
+        rng = random.Random(0)
+        now = S._utcnow()
+        for i in range(50):
+            start = now - _dt.timedelta(days=rng.uniform(0, 30))
+            events = [start + _dt.timedelta(minutes=2 * j) for j in range(400)]
+            (sessions / f"{i}.jsonl").write_text("".join(_line(ts, 10) for ts in events if ts <= now), encoding="utf-8")
+
+        saved = S._USAGE_CHECKPOINT, S._USAGE_SCAN
+        self.addCleanup(setattr, S, "_USAGE_SCAN", saved[1])
+        self.addCleanup(setattr, S, "_USAGE_CHECKPOINT", saved[0])
+        S._configure_usage_checkpoints({"usageCheckpoint": {"enabled": False}})
+        S._configure_usage_scan({"usageScan": {"workers": 1, "inotify": False}})
+
+        tracemalloc.start()
+        try:
+            entry = S._UsageCacheEntry(state_dir=(tmp / "state").resolve())
+            out = entry.get_usage(S.ZoneInfo("UTC"))
+            used, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertGreater(out["allTime"]["requests"], 10000)
+        self.assertLess(used, 640 * 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()